@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+EPS Backend Web - Deck Build Cache
+Content-addressed on-disk cache shared by the presentation generator tools.
+
+Entries live under references/.deck_cache/<namespace>/<key[:2]>/<key><suffix>
+(override the location with the EPS_DECK_CACHE environment variable).
+
+Set EPS_DECK_CACHE_URL to share entries between machines (trainers' laptops,
+CI runners) through a remote store speaking plain HTTP:
+- GET <url>/<namespace>/<key><suffix> returns an entry with its SHA-256 in
+  an X-Content-SHA256 header; PUT stores one and must carry the header
+- Local misses are fetched from the store, checked against the digest and
+  kept locally; new entries are uploaded in the background
+- Builds prefetch the keys they need concurrently (cache_prefetch)
+- If the store cannot be reached the tools warn once and carry on with
+  the local cache
+- Namespaces in LOCAL_NAMESPACES (parsed specs, which are loaded with
+  marshal) are never fetched from or uploaded to the store
+- The digest header only catches corruption in transit, not tampering:
+  anyone who can PUT can re-point an entry. The stand-in store listens on
+  loopback by default; set EPS_DECK_CACHE_TOKEN on the store and every
+  client to require a shared token (Authorization: Bearer) on PUT before
+  exposing it to other machines
+
+Usage:
+    python deck_cache.py serve [--port 8767] [--root /srv/deck-cache]              # stand-in store on loopback
+    EPS_DECK_CACHE_TOKEN=... python deck_cache.py serve --host 0.0.0.0            # shared, PUT needs the token
+"""
+
+import argparse
+import atexit
+import hashlib
+import hmac
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+
+CACHE_DIR = os.environ.get(
+    "EPS_DECK_CACHE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".deck_cache"),
+)
+REMOTE_URL = os.environ.get("EPS_DECK_CACHE_URL", "").rstrip("/")
+REMOTE_TIMEOUT = float(os.environ.get("EPS_DECK_CACHE_TIMEOUT", "3"))
+REMOTE_TOKEN = os.environ.get("EPS_DECK_CACHE_TOKEN", "")
+REMOTE_THREADS = 8
+LOCAL_NAMESPACES = frozenset({"specs"})
+LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1")
+DIGEST_HEADER = "X-Content-SHA256"
+ENTRY_NAME = re.compile(r"^[a-z0-9_-]+/[0-9a-f]{16,64}(\.[a-z0-9]+)?$")
+
+def digest(data):
+    """Return the hex SHA-256 digest of bytes or text"""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+def cache_key(*parts):
+    """Build a stable cache key from JSON-serialisable parts"""
+    return digest(json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str))
+
+def cache_path(namespace, key, suffix=""):
+    """Return the on-disk path of a cache entry"""
+    return os.path.join(CACHE_DIR, namespace, key[:2], key + suffix)
+
+def _read_local(namespace, key, suffix):
+    """Return local cached bytes, or None"""
+    try:
+        with open(cache_path(namespace, key, suffix), "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+def _write_local(namespace, key, data, suffix):
+    """Store bytes in the local cache atomically and return the entry path"""
+    path = cache_path(namespace, key, suffix)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return path
+
+def cache_get(namespace, key, suffix=""):
+    """Return cached bytes, or None on a miss"""
+    data = _read_local(namespace, key, suffix)
+    if data is None and REMOTE_URL and namespace not in LOCAL_NAMESPACES:
+        data = _remote.fetch(namespace, key, suffix)
+    return data
+
+def cache_put(namespace, key, data, suffix=""):
+    """Store bytes atomically and return the entry path"""
+    path = _write_local(namespace, key, data, suffix)
+    if REMOTE_URL and namespace not in LOCAL_NAMESPACES:
+        _remote.upload(namespace, key, data, suffix)
+    return path
+
+def cache_prefetch(namespace, keys, suffix=""):
+    """Fetch entries missing locally from the remote store concurrently; return how many arrived"""
+    if not REMOTE_URL or namespace in LOCAL_NAMESPACES:
+        return 0
+    missing = [key for key in dict.fromkeys(keys) if not os.path.exists(cache_path(namespace, key, suffix))]
+    if not missing:
+        return 0
+    pool = _remote.pool()
+    return sum(1 for data in pool.map(lambda key: _remote.fetch(namespace, key, suffix), missing) if data)
+
+def flush_remote():
+    """Wait for background uploads to finish"""
+    _remote.flush()
+
+# ============ REMOTE STORE CLIENT ============
+
+class RemoteCache:
+    """HTTP client for the shared store; disables itself when the store is unreachable"""
+
+    def __init__(self, url, token=""):
+        self.url = url
+        self.token = token
+        self.down = False
+        self.fetched = self.uploaded = self.rejected = 0
+        self._pool = None
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def pool(self):
+        """Return the thread pool used for prefetches and uploads"""
+        with self._lock:
+            if self._pool is None:
+                from concurrent.futures import ThreadPoolExecutor
+
+                self._pool = ThreadPoolExecutor(max_workers=REMOTE_THREADS, thread_name_prefix="deck-cache")
+                atexit.register(self.flush)
+            return self._pool
+
+    def _unreachable(self, error):
+        """Stop talking to the store for the rest of this process"""
+        if not self.down:
+            self.down = True
+            print(f"Warning: build cache store {self.url} unreachable ({error}); using the local cache only",
+                  file=sys.stderr)
+
+    def _request(self, method, name, data=None, headers=None):
+        """Send one request; return (status, headers, body) or None if the store is down"""
+        import urllib.error
+        import urllib.request
+
+        if self.down:
+            return None
+        request = urllib.request.Request(f"{self.url}/{name}", data=data, method=method, headers=headers or {})
+        try:
+            with urllib.request.urlopen(request, timeout=REMOTE_TIMEOUT) as response:
+                return response.status, response.headers, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.headers, b""
+        except (urllib.error.URLError, OSError) as e:
+            self._unreachable(getattr(e, "reason", e))
+            return None
+
+    def fetch(self, namespace, key, suffix):
+        """Return a verified entry from the store (and keep it locally), or None"""
+        result = self._request("GET", f"{namespace}/{key}{suffix}")
+        if result is None or result[0] != 200:
+            return None
+        _, headers, data = result
+        if headers.get(DIGEST_HEADER) != digest(data):
+            self.rejected += 1
+            print(f"Warning: discarded corrupt {namespace}/{key}{suffix} from the build cache store",
+                  file=sys.stderr)
+            return None
+        _write_local(namespace, key, data, suffix)
+        self.fetched += 1
+        return data
+
+    def _put(self, namespace, key, data, suffix):
+        """Upload one entry"""
+        headers = {DIGEST_HEADER: digest(data), "Content-Type": "application/octet-stream"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        result = self._request("PUT", f"{namespace}/{key}{suffix}", data, headers)
+        if result is not None and result[0] in (200, 201, 204):
+            self.uploaded += 1
+
+    def upload(self, namespace, key, data, suffix):
+        """Queue an upload in the background"""
+        if self.down:
+            return
+        future = self.pool().submit(self._put, namespace, key, data, suffix)
+        with self._lock:
+            self._pending = [f for f in self._pending if not f.done()]
+            self._pending.append(future)
+
+    def flush(self):
+        """Wait for queued uploads"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+
+_remote = RemoteCache(REMOTE_URL, REMOTE_TOKEN)
+
+# ============ STAND-IN STORE ============
+
+def make_store(root, host, port, token=""):
+    """Return an HTTP server for a content-addressed store: refs map entry names to SHA-256 named objects"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    if host not in LOOPBACK_HOSTS and not token:
+        raise ValueError(f"Refusing to serve the cache store on {host} without EPS_DECK_CACHE_TOKEN")
+
+    def object_path(sha):
+        """Return the path of an object by its digest"""
+        return os.path.join(root, "objects", sha[:2], sha)
+
+    def ref_path(name):
+        """Return the path of the ref naming an entry"""
+        return os.path.join(root, "refs", *name.split("/"))
+
+    def atomic_write(path, data):
+        """Write a file via a temporary name"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    class StoreHandler(BaseHTTPRequestHandler):
+        """GET/HEAD/PUT of entries by name"""
+
+        protocol_version = "HTTP/1.1"
+
+        def _name(self):
+            """Return the requested entry name, or None after answering 400"""
+            name = self.path.lstrip("/")
+            if not ENTRY_NAME.match(name) or name.split("/")[0] in LOCAL_NAMESPACES:
+                self._reply(400, b"Bad entry name\n")
+                return None
+            return name
+
+        def _reply(self, status, body=b"", headers=()):
+            """Send a complete response"""
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in headers:
+                self.send_header(name, value)
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(body)
+
+        def do_GET(self):
+            """Return an entry with its digest"""
+            name = self._name()
+            if name is None:
+                return
+            try:
+                with open(ref_path(name), encoding="ascii") as f:
+                    sha = f.read().strip()
+                with open(object_path(sha), "rb") as f:
+                    data = f.read()
+            except OSError:
+                return self._reply(404, b"Not found\n")
+            if digest(data) != sha:     # bit rot: drop the object rather than serve it
+                os.remove(object_path(sha))
+                return self._reply(404, b"Not found\n")
+            self._reply(200, data, [(DIGEST_HEADER, sha), ("Content-Type", "application/octet-stream")])
+
+        do_HEAD = do_GET
+
+        def do_PUT(self):
+            """Store an entry whose body matches its digest header"""
+            name = self._name()
+            if name is None:
+                return
+            data = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if token and not hmac.compare_digest(self.headers.get("Authorization", ""), f"Bearer {token}"):
+                return self._reply(403, b"Forbidden\n")
+            sha = digest(data)
+            if self.headers.get(DIGEST_HEADER) != sha:
+                return self._reply(400, b"Digest mismatch\n")
+            if not os.path.exists(object_path(sha)):
+                atomic_write(object_path(sha), data)
+            atomic_write(ref_path(name), sha.encode("ascii"))
+            self._reply(201)
+
+        def log_message(self, format, *args):
+            """Keep the console quiet"""
+
+    return ThreadingHTTPServer((host, port), StoreHandler)
+
+def serve_store(root, host, port, token=""):
+    """Run the stand-in store until interrupted"""
+    server = make_store(root, host, port, token)
+    print(f"✓ Build cache store at http://{host}:{port}/ (root {root})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Deck build cache tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("serve", help="Run a stand-in remote cache store")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8767)
+    p.add_argument("--root", default=os.path.join(CACHE_DIR, "store"), help="Store directory")
+    args = parser.parse_args()
+
+    try:
+        serve_store(os.path.abspath(args.root), args.host, args.port, REMOTE_TOKEN)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+EPS Backend Web - Deck Delta Packages
+Ships deck updates as small patches instead of full .pptx downloads:
+- manifest: per-part SHA-256 digests plus slide list, written next to every build
+- diff:     patch archive holding only changed/added parts (slides, rels, media);
+            parts whose content the old deck already has under any name (e.g.
+            slides renumbered by an insertion) are copied from it, not shipped
+- apply:    rebuilds the new deck from the old deck + patch, verified by digest
+
+Usage:
+    python deck_delta.py manifest deck.pptx
+    python deck_delta.py diff old.pptx|old.manifest.json new.pptx -o update.pptxpatch
+    python deck_delta.py apply old.pptx update.pptxpatch -o new.pptx
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import zipfile
+
+from deck_package import open_package, rels_part_name, slide_part_names
+
+MANIFEST_SUFFIX = ".manifest.json"
+PATCH_FORMAT = 2
+PATCH_INDEX = "patch.json"
+PATCH_PARTS = "parts/"
+
+def deck_digest(parts):
+    """Return the content digest of a deck from its {part: sha256} table"""
+    h = hashlib.sha256()
+    for name in sorted(parts):
+        h.update(f"{name}\0{parts[name]}\n".encode("utf-8"))
+    return h.hexdigest()
+
+def build_manifest(path):
+    """Return the slide-level manifest of a .pptx file"""
+    parts = {}
+    sizes = {}
+    with open_package(path) as zf:
+        order = zf.namelist()
+        for name in order:
+            h = hashlib.sha256()
+            with zf.open(name) as f:
+                for chunk in iter(lambda: f.read(1 << 16), b""):
+                    h.update(chunk)
+            parts[name] = h.hexdigest()
+            sizes[name] = zf.getinfo(name).file_size
+        slides = [
+            {
+                "index": i,
+                "part": part,
+                "sha256": parts[part],
+                "rels_sha256": parts.get(rels_part_name(part)),
+            }
+            for i, part in enumerate(slide_part_names(zf), start=1)
+        ]
+    return {
+        "deck": os.path.basename(path),
+        "digest": deck_digest(parts),
+        "order": order,
+        "parts": {name: {"sha256": parts[name], "size": sizes[name]} for name in order},
+        "slides": slides,
+    }
+
+def write_manifest(path):
+    """Write the manifest next to a built deck and return its path"""
+    manifest_path = path + MANIFEST_SUFFIX
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(build_manifest(path), f, indent=1)
+    return manifest_path
+
+def load_manifest(path):
+    """Load a manifest from a .manifest.json file or compute it from a .pptx"""
+    if path.endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    return build_manifest(path)
+
+def _part_digests(manifest):
+    """Return {part: sha256} from a manifest"""
+    return {name: info["sha256"] for name, info in manifest["parts"].items()}
+
+def make_patch(base, new_path, patch_path):
+    """Write a patch that turns the base deck (or its manifest) into new_path"""
+    old = load_manifest(base)
+    new = build_manifest(new_path)
+    old_parts = _part_digests(old)
+    new_parts = _part_digests(new)
+
+    by_digest = {}
+    for name in old["order"]:
+        by_digest.setdefault(old_parts[name], name)
+    changed = []
+    copied = {}     # new part -> old part with the same content
+    for name in new["order"]:
+        if old_parts.get(name) == new_parts[name]:
+            continue
+        if new_parts[name] in by_digest:
+            copied[name] = by_digest[new_parts[name]]
+        else:
+            changed.append(name)
+    removed = [name for name in old["order"] if name not in new_parts]
+    old_slides = {s["sha256"] for s in old["slides"]}
+    index = {
+        "format": PATCH_FORMAT,
+        "base_digest": old["digest"],
+        "target_digest": new["digest"],
+        "deck": new["deck"],
+        "order": new["order"],
+        "parts": new_parts,
+        "changed": changed,
+        "copied": copied,
+        "removed": removed,
+        "slides": new["slides"],
+        "changed_slides": [s["index"] for s in new["slides"] if s["sha256"] not in old_slides],
+    }
+
+    with open_package(new_path) as src, zipfile.ZipFile(patch_path, "w", zipfile.ZIP_DEFLATED, compresslevel=9) as out:
+        out.writestr(PATCH_INDEX, json.dumps(index, indent=1))
+        for name in changed:
+            out.writestr(PATCH_PARTS + name, src.read(name))
+    return index
+
+def apply_patch(old_path, patch_path, out_path):
+    """Rebuild the new deck from the old deck plus a patch, verifying every digest"""
+    with zipfile.ZipFile(patch_path) as patch:
+        index = json.loads(patch.read(PATCH_INDEX))
+        if index.get("format") != PATCH_FORMAT:
+            raise ValueError(f"Unsupported patch format: {index.get('format')}")
+        old = build_manifest(old_path)
+        if old["digest"] != index["base_digest"]:
+            raise ValueError(f"Patch does not apply to {old_path}: base digest mismatch")
+
+        changed = set(index["changed"])
+        copied = index["copied"]
+        expected = index["parts"]
+        written = {}
+        tmp_path = out_path + ".tmp"
+        try:
+            with open_package(old_path) as base, zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as out:
+                for name in index["order"]:
+                    if name in changed:
+                        source, member = patch, PATCH_PARTS + name
+                    else:
+                        source, member = base, copied.get(name, name)
+                    h = hashlib.sha256()
+                    with source.open(member) as src, out.open(name, "w") as dst:
+                        for chunk in iter(lambda: src.read(1 << 16), b""):
+                            h.update(chunk)
+                            dst.write(chunk)
+                    written[name] = h.hexdigest()
+                    if written[name] != expected[name]:
+                        raise ValueError(f"Digest mismatch for part {name}")
+            if deck_digest(written) != index["target_digest"]:
+                raise ValueError("Rebuilt deck digest does not match the patch target")
+            os.replace(tmp_path, out_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    return index
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Deck manifests and delta patches")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("manifest", help="Write deck.pptx.manifest.json")
+    p.add_argument("deck")
+
+    p = sub.add_parser("diff", help="Create a patch from an old deck (or manifest) to a new deck")
+    p.add_argument("base")
+    p.add_argument("new")
+    p.add_argument("-o", "--output", required=True)
+
+    p = sub.add_parser("apply", help="Apply a patch to an old deck")
+    p.add_argument("old")
+    p.add_argument("patch")
+    p.add_argument("-o", "--output", required=True)
+
+    args = parser.parse_args()
+    if args.command == "manifest":
+        print(f"✓ Manifest written: {write_manifest(args.deck)}")
+    elif args.command == "diff":
+        index = make_patch(args.base, args.new, args.output)
+        print(f"✓ Patch created: {args.output} ({os.path.getsize(args.output):,} bytes)")
+        print(f"✓ Changed parts: {len(index['changed'])}, moved parts: {len(index['copied'])}, "
+              f"removed parts: {len(index['removed'])}, "
+              f"changed slides: {index['changed_slides']}")
+    else:
+        try:
+            index = apply_patch(args.old, args.patch, args.output)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print(f"✓ Deck rebuilt: {args.output}")
+        print(f"✓ Digest verified: {index['target_digest']}")
+
+if __name__ == "__main__":
+    main()
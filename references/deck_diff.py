@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+EPS Backend Web - Structural Deck Diff
+Compares two .pptx decks slide by slide without opening PowerPoint:
+- Streams each slide part with iterparse (no python-pptx load)
+- Normalizes shape ids, generated names, relationship ids, date fields and
+  p14:creationId; slide links are compared by the position of their target
+- Hashes every slide and every shape, then aligns the two slide sequences
+- Reports added / removed / modified slides with text-level diffs
+
+Usage: python deck_diff.py old.pptx new.pptx [--json] [--context N] [--jobs N]
+Exit status is 0 when the decks match and 1 when they differ.
+"""
+
+import argparse
+import difflib
+import hashlib
+import json
+import os
+import re
+import sys
+import xml.etree.ElementTree as ET
+
+from deck_package import (
+    NS_A, NS_P, NS_P14, NS_R, RT_SLIDE, SHAPE_TAGS, notes_text, open_package, paragraph_texts, read_rels,
+    slide_part_names,
+)
+
+# Attributes that change on every save without changing what the slide shows
+VOLATILE_ATTRS = {"id", f"{{{NS_P14}}}creationId"}
+VOLATILE_TAGS = {f"{{{NS_P14}}}creationId"}
+# Extension wrappers that are dropped when they only hold volatile elements
+EXTENSION_TAGS = {f"{{{NS_P}}}extLst", f"{{{NS_P}}}ext"}
+GENERATED_NAME = re.compile(r"\s+\d+$")
+
+# Decks smaller than this are fingerprinted in-process
+PARALLEL_THRESHOLD = 200
+
+class SlideFingerprint:
+    """Normalized digests and text of one slide"""
+
+    __slots__ = ("index", "part", "digest", "shapes", "title")
+
+    def __init__(self, index, part, digest, shapes, title):
+        self.index = index
+        self.part = part
+        self.digest = digest
+        self.shapes = shapes  # [(name, digest, [paragraph text])]
+        self.title = title
+
+    def text_lines(self):
+        """Return the slide text, one paragraph per line"""
+        return [line for _, _, texts in self.shapes for line in texts]
+
+def _is_volatile(elem):
+    """Return True for a volatile element or an extension holding nothing else"""
+    if elem.tag in VOLATILE_TAGS:
+        return True
+    return elem.tag in EXTENSION_TAGS and all(_is_volatile(child) for child in elem)
+
+def _canonical(elem, rel_keys, out):
+    """Append a normalized serialization of elem to the out list"""
+    if _is_volatile(elem):
+        return
+    out.append("<" + elem.tag)
+    for key in sorted(elem.attrib):
+        value = elem.attrib[key]
+        if key in VOLATILE_ATTRS:
+            continue
+        if key.startswith(f"{{{NS_R}}}"):
+            value = rel_keys.get(value, value)
+        elif key == "name" and elem.tag == f"{{{NS_P}}}cNvPr":
+            value = GENERATED_NAME.sub("", value)
+        out.append(f" {key}={value!r}")
+    out.append(">")
+    is_date_field = elem.tag == f"{{{NS_A}}}fld" and elem.get("type", "").startswith("datetime")
+    if elem.text and not is_date_field:
+        out.append(elem.text)
+    for child in elem:
+        if is_date_field and child.tag == f"{{{NS_A}}}t":
+            continue
+        _canonical(child, rel_keys, out)
+    if elem.tail and elem.tail.strip():
+        out.append(elem.tail)
+    out.append("</>")
+
+def _hash_elem(elem, rel_keys):
+    """Return the hex digest of an element's normalized form"""
+    out = []
+    _canonical(elem, rel_keys, out)
+    return hashlib.sha1("".join(out).encode("utf-8")).hexdigest()
+
+def _relationship_keys(zf, part_name, rels, part_digests, slide_numbers):
+    """Map each rId to a stable key based on what the relationship points at"""
+    keys = {}
+    for rid, (rel_type, target, mode) in rels.items():
+        kind = rel_type.rsplit("/", 1)[-1]
+        if mode == "External":
+            keys[rid] = f"{kind}:{target}"
+        elif rel_type == RT_SLIDE:
+            # Slide jumps (agenda entries): the slide position the link lands on
+            keys[rid] = f"{kind}:{slide_numbers.get(target, target)}"
+        elif target.startswith("ppt/media/") or target.startswith("ppt/embeddings/"):
+            if target not in part_digests:
+                part_digests[target] = hashlib.sha1(zf.read(target)).hexdigest()
+            keys[rid] = f"{kind}:{part_digests[target]}"
+        else:
+            keys[rid] = kind
+    return keys
+
+def fingerprint_slide(zf, index, part_name, part_digests, slide_numbers):
+    """Stream one slide part and return its SlideFingerprint"""
+    rels = read_rels(zf, part_name)
+    rel_keys = _relationship_keys(zf, part_name, rels, part_digests, slide_numbers)
+    shapes = []
+    root = None
+    depth = 0
+    tree_depth = None
+    for event, elem in ET.iterparse(zf.open(part_name), events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = elem
+            depth += 1
+            if elem.tag == f"{{{NS_P}}}spTree":
+                tree_depth = depth
+            continue
+        if tree_depth is not None and depth == tree_depth + 1 and elem.tag in SHAPE_TAGS:
+            name = ""
+            c_nv_pr = elem.find(f".//{{{NS_P}}}cNvPr")
+            if c_nv_pr is not None:
+                name = GENERATED_NAME.sub("", c_nv_pr.get("name", ""))
+            shapes.append((name, _hash_elem(elem, rel_keys), paragraph_texts(elem)))
+            elem.clear()
+        depth -= 1
+
+    notes = notes_text(zf, rels)
+    if notes:
+        shapes.append(("Notes", hashlib.sha1("\n".join(notes).encode("utf-8")).hexdigest(), notes))
+
+    # Everything outside the shape tree (background, transitions, timing)
+    for sp_tree in root.iter(f"{{{NS_P}}}spTree"):
+        sp_tree.clear()
+    slide_hash = hashlib.sha1(_hash_elem(root, rel_keys).encode("ascii"))
+    for _, shape_digest, _ in shapes:
+        slide_hash.update(shape_digest.encode("ascii"))
+
+    title = next((t for _, _, texts in shapes for t in texts if t.strip()), "")
+    return SlideFingerprint(index, part_name, slide_hash.hexdigest(), shapes, title)
+
+def _fingerprint_chunk(path, chunk):
+    """Fingerprint a list of (index, part name) pairs from one deck"""
+    part_digests = {}
+    with open_package(path) as zf:
+        slide_numbers = {part: i for i, part in enumerate(slide_part_names(zf), start=1)}
+        return [fingerprint_slide(zf, i, part, part_digests, slide_numbers) for i, part in chunk]
+
+def fingerprint_deck(path, jobs=1):
+    """Return the SlideFingerprint of every slide in a deck, in order"""
+    with open_package(path) as zf:
+        slides = list(enumerate(slide_part_names(zf), start=1))
+    if jobs <= 1 or len(slides) < PARALLEL_THRESHOLD:
+        return _fingerprint_chunk(path, slides)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    size = -(-len(slides) // jobs)
+    chunks = [slides[i:i + size] for i in range(0, len(slides), size)]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return [fp for result in pool.map(_fingerprint_chunk, [path] * len(chunks), chunks) for fp in result]
+
+def _pair_blocks(old, new):
+    """Yield (tag, old slide or None, new slide or None) aligned by digest"""
+    matcher = difflib.SequenceMatcher(None, [s.digest for s in old], [s.digest for s in new], autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            for a, b in zip(old[i1:i2], new[j1:j2]):
+                yield "unchanged", a, b
+            continue
+        olds, news = old[i1:i2], new[j1:j2]
+        paired = min(len(olds), len(news))
+        for a, b in zip(olds[:paired], news[:paired]):
+            yield "modified", a, b
+        for a in olds[paired:]:
+            yield "removed", a, None
+        for b in news[paired:]:
+            yield "added", None, b
+
+def _shape_changes(old_slide, new_slide):
+    """Count shapes added, removed and modified between two versions of a slide"""
+    counts = {"added": 0, "removed": 0, "modified": 0}
+    matcher = difflib.SequenceMatcher(
+        None, [d for _, d, _ in old_slide.shapes], [d for _, d, _ in new_slide.shapes], autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        paired = min(i2 - i1, j2 - j1)
+        counts["modified"] += paired
+        counts["removed"] += (i2 - i1) - paired
+        counts["added"] += (j2 - j1) - paired
+    return counts
+
+def diff_decks(old_path, new_path, context=1, jobs=1):
+    """Compare two decks and return a JSON-serialisable report"""
+    old = fingerprint_deck(old_path, jobs)
+    new = fingerprint_deck(new_path, jobs)
+    changes = []
+    summary = {"added": 0, "removed": 0, "modified": 0, "unchanged": 0}
+    for status, a, b in _pair_blocks(old, new):
+        summary[status] += 1
+        if status == "unchanged":
+            continue
+        change = {
+            "status": status,
+            "old_index": a.index if a else None,
+            "new_index": b.index if b else None,
+            "title": (b or a).title,
+        }
+        if status == "modified":
+            change["shapes"] = _shape_changes(a, b)
+            change["text_diff"] = list(difflib.unified_diff(
+                a.text_lines(), b.text_lines(), lineterm="", n=context))[2:]
+        changes.append(change)
+    return {
+        "old": {"path": old_path, "slides": len(old)},
+        "new": {"path": new_path, "slides": len(new)},
+        "summary": summary,
+        "changes": changes,
+    }
+
+def format_report(report):
+    """Render a diff report as human-readable text"""
+    lines = [
+        f"--- {report['old']['path']} ({report['old']['slides']} slides)",
+        f"+++ {report['new']['path']} ({report['new']['slides']} slides)",
+    ]
+    for change in report["changes"]:
+        if change["status"] == "added":
+            lines.append(f"+ slide {change['new_index']}: {change['title']!r}")
+        elif change["status"] == "removed":
+            lines.append(f"- slide {change['old_index']}: {change['title']!r}")
+        else:
+            shapes = change["shapes"]
+            detail = ", ".join(f"{n} {k}" for k, n in shapes.items() if n) or "layout only"
+            lines.append(f"~ slide {change['old_index']} -> {change['new_index']}: "
+                         f"{change['title']!r} (shapes: {detail})")
+            lines.extend("    " + line for line in change["text_diff"])
+    s = report["summary"]
+    lines.append(f"Summary: {s['added']} added, {s['removed']} removed, "
+                 f"{s['modified']} modified, {s['unchanged']} unchanged")
+    return "\n".join(lines)
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Compare two .pptx decks slide by slide")
+    parser.add_argument("old", help="Original deck")
+    parser.add_argument("new", help="Updated deck")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--context", type=int, default=1, help="Context lines in text diffs")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes for large decks")
+    args = parser.parse_args()
+
+    report = diff_decks(args.old, args.new, args.context, args.jobs)
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print(format_report(report))
+    s = report["summary"]
+    sys.exit(1 if s["added"] or s["removed"] or s["modified"] else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+EPS Backend Web - Companion Documents
+Keeps the parts of the markdown companions that describe deck contents
+(CODE_SAMPLES_IN_PRESENTATION.md, QUICK_INDEX.md, PRESENTATION_README.md)
+in step with the slide model. Generated blocks sit between markers:
+
+    <!-- eps-decks:slide-index EPS_TOT_Training_2Days digest= -->
+    <!-- /eps-decks:slide-index -->
+
+- summary:      file name, slide and code sample counts, section ranges
+- slide-index:  every slide title under its section, with slide numbers
+- code-samples: each code slide's snippet, slide number and guide section
+- code-table:   one row per code slide
+Every block is re-rendered on each run and compared with the file's copy;
+a document is rewritten only when one of its blocks differs. The marker
+records a digest of the rendered body, so a hand edit inside a block (or a
+renderer change) is reported by --check and overwritten by an update.
+Prose outside the markers stays hand-written.
+
+Usage:
+    python deck_docs.py [specs ...]            # update the companion documents
+    python deck_docs.py --check                # exit 1 when a block is stale
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+
+from deck_cache import cache_key
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+COMPANION_DOCS = ("CODE_SAMPLES_IN_PRESENTATION.md", "QUICK_INDEX.md", "PRESENTATION_README.md")
+COMPANION_FORMAT = 2
+CODE_LANGUAGE = "php"
+
+BLOCK = re.compile(r"<!-- eps-decks:(?P<kind>[a-z-]+) (?P<deck>\S+) digest=(?P<digest>[0-9a-f]*) -->\n"
+                   r"(?P<body>.*?)<!-- /eps-decks:(?P=kind) -->", re.DOTALL)
+
+def strip_generated(text):
+    """Return markdown with the body of every generated block blanked, keeping line numbers"""
+    def blank(match):
+        """Return a block's markers around empty lines"""
+        body = match.group("body")
+        return match.group(0).replace(body, "\n" * body.count("\n"), 1)
+
+    return BLOCK.sub(blank, text)
+
+def default_specs():
+    """Return the deck specs shipped in references/decks"""
+    return sorted(glob.glob(os.path.join(HERE, "decks", "*.yaml")))
+
+def _slide_range(slides):
+    """Return "Slide 4" or "Slides 4-9" for consecutive slides"""
+    first, last = slides[0].index, slides[-1].index
+    return f"Slide {first}" if first == last else f"Slides {first}-{last}"
+
+def _code_slides(spec):
+    """Return the code sample slides of a deck"""
+    return [slide for slide in spec.slides if slide.kind == "code"]
+
+def _guide_link(spec, slide, doc_dir):
+    """Return a markdown link to a slide's speaker notes section, relative to the document"""
+    path, _, anchor = slide.notes.partition("#")
+    target = os.path.relpath(os.path.join(spec.base_dir, path), doc_dir).replace(os.sep, "/")
+    return f"[{os.path.basename(path)}#{anchor}]({target}#{anchor})"
+
+# ============ BLOCKS ============
+# Each kind returns the lines of its block body
+
+def summary_block(spec, doc_dir):
+    """Deck file, slide counts and section ranges"""
+    code = len(_code_slides(spec))
+    notes = sum(1 for slide in spec.slides if slide.notes)
+    lines = [f"-   **File:** {spec.deck}.pptx",
+             f"-   **Total Slides:** {len(spec)} ({len(spec) - code} content + {code} code samples)",
+             f"-   **Speaker Notes:** {notes} slides",
+             "-   **Sections:**"]
+    for section, slides in spec.sections():
+        lines.append(f"    -   {section or '(no section)'} ({_slide_range(slides)})")
+    return lines
+
+def slide_index_block(spec, doc_dir):
+    """Every slide title grouped by section"""
+    lines = []
+    for section, slides in spec.sections():
+        lines.extend([f"#### {section or '(no section)'} ({_slide_range(slides)})", ""])
+        for slide in slides:
+            suffix = " - code sample" if slide.kind == "code" else ""
+            lines.append(f"{slide.index}. **{slide.title or '(untitled)'}**{suffix}")
+        lines.append("")
+    return lines[:-1]
+
+def code_samples_block(spec, doc_dir):
+    """Each code slide with its snippet"""
+    lines = []
+    for number, slide in enumerate(_code_slides(spec), start=1):
+        details = [f"**Section:** {slide.section or '(no section)'}"]
+        if slide.notes:
+            details.append(f"**Guide:** {_guide_link(spec, slide, doc_dir)}")
+        lines.extend([f"### {number}. **Slide {slide.index} - {slide.title}**", "", "  \n".join(details), "",
+                      f"```{CODE_LANGUAGE}", slide.fields["code_snippet"].rstrip("\n"), "```", ""])
+    return lines[:-1]
+
+def code_table_block(spec, doc_dir):
+    """One table row per code slide"""
+    lines = ["| Slide # | Topic | Section | Lines |", "| ------- | ----- | ------- | ----- |"]
+    for slide in _code_slides(spec):
+        title = slide.title.replace("|", "\\|")
+        lines.append(f"| {slide.index} | {title} | {slide.section or '-'} | "
+                     f"{len(slide.fields['code_snippet'].splitlines())} |")
+    return lines
+
+BLOCKS = {
+    "summary": summary_block,
+    "slide-index": slide_index_block,
+    "code-samples": code_samples_block,
+    "code-table": code_table_block,
+}
+
+# ============ DOCUMENTS ============
+
+def update_document(path, specs):
+    """Re-render the stale blocks of one document; return (new text or None when unchanged, [stale blocks])"""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    doc_dir = os.path.dirname(os.path.abspath(path))
+    stale = []
+
+    def replace(match):
+        """Return a block, re-rendered when the file's copy differs from its slides"""
+        kind, deck = match.group("kind"), match.group("deck")
+        if kind not in BLOCKS:
+            raise ValueError(f"{path}: unknown companion block {kind!r}")
+        if deck not in specs:
+            return match.group(0)
+        body = "\n".join(BLOCKS[kind](specs[deck], doc_dir)) + "\n"
+        digest = cache_key("companion", COMPANION_FORMAT, kind, body)[:16]
+        if digest == match.group("digest") and body == match.group("body"):
+            return match.group(0)
+        stale.append(f"{kind} {deck}")
+        return f"<!-- eps-decks:{kind} {deck} digest={digest} -->\n{body}<!-- /eps-decks:{kind} -->"
+
+    updated = BLOCK.sub(replace, text)
+    return (updated if stale else None), stale
+
+def update_companions(specs, docs=COMPANION_DOCS, check=False):
+    """Refresh the blocks of DeckSpecs in the companion documents; return {path: [stale blocks]}"""
+    by_deck = {spec.deck: spec for spec in specs}
+    report = {}
+    for name in docs:
+        path = name if os.path.isabs(name) else os.path.join(HERE, name)
+        text, stale = update_document(path, by_deck)
+        report[path] = stale
+        if text is not None and not check:
+            tmp = path + ".tmp"
+            with open(tmp, "w", encoding="utf-8", newline="\n") as f:
+                f.write(text)
+            os.replace(tmp, path)
+    return report
+
+def main():
+    """Main execution"""
+    from deck_spec import SpecError, load_deck_spec
+
+    parser = argparse.ArgumentParser(description="Regenerate the deck sections of the companion documents")
+    parser.add_argument("specs", nargs="*", help="Deck specs (default: decks/*.yaml)")
+    parser.add_argument("--doc", action="append", metavar="PATH",
+                        help=f"Document to update (repeatable, default: {', '.join(COMPANION_DOCS)})")
+    parser.add_argument("--check", action="store_true", help="Only report stale blocks, exit 1 if any")
+    args = parser.parse_args()
+
+    try:
+        specs = [load_deck_spec(path) for path in args.specs or default_specs()]
+        report = update_companions(specs, [os.path.abspath(doc) for doc in args.doc or ()] or COMPANION_DOCS, check=args.check)
+    except (OSError, SpecError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    for path, stale in report.items():
+        state = ("stale: " if args.check else "updated: ") + ", ".join(stale) if stale else "up to date"
+        print(f"{'✗' if stale and args.check else '✓'} {os.path.relpath(path)}: {state}")
+    sys.exit(1 if args.check and any(report.values()) else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+EPS Backend Web - Near-Duplicate Slide Detection
+Finds material restated across decks and guides ("Architecture Layers",
+"Technology Stack", caching advice, ...):
+- Every spec slide (the add_*_slide arguments), built deck slide and
+  markdown guide section becomes a document of word shingles; the blocks
+  deck_docs.py generates from the slides are left out of the guides
+- Each document gets a MinHash signature, cached by text digest, so only
+  new or edited slides and sections are hashed again
+- Locality-sensitive hashing over signature bands proposes candidate
+  pairs without comparing every document with every other; candidates are
+  confirmed by exact shingle Jaccard similarity and grouped into clusters
+
+Usage:
+    python deck_dupes.py [specs, decks or guides ...] [--threshold 0.5] [--shingle 3] [--json]
+"""
+
+import argparse
+import functools
+import glob
+import json
+import marshal
+import os
+import random
+import re
+import sys
+import time
+import zlib
+
+from deck_cache import CACHE_DIR, digest
+from deck_index import extract_deck, tokenize
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SIGNATURES_PATH = os.path.join(CACHE_DIR, "minhash_signatures.bin")
+SIGNATURES_FORMAT = 1
+
+NUM_PERM = 128
+SHINGLE_WORDS = 3
+MIN_SHINGLES = 5
+DEFAULT_THRESHOLD = 0.5
+RECALL_MARGIN = 0.8
+HASH_PRIME = (1 << 32) + 15     # above every crc32 value; a * x + b stays below 2**64
+PERMUTATIONS = [(random.Random(seed).randrange(1, 1 << 31), random.Random(-seed).randrange(1 << 32))
+                for seed in range(1, NUM_PERM + 1)]
+TEXT_FIELDS = ("title", "subtitle", "left_title", "left_items", "right_title", "right_items", "content_list",
+               "code_snippet")
+XML_TEXT = re.compile(r"<a:t>([^<]*)</a:t>")
+
+def default_sources():
+    """Return the deck specs and markdown guides shipped in references/"""
+    return sorted(glob.glob(os.path.join(HERE, "decks", "*.yaml")) + glob.glob(os.path.join(HERE, "*.md")))
+
+# ============ DOCUMENTS ============
+
+class Document:
+    """One slide or guide section"""
+
+    __slots__ = ("source", "locator", "title", "text", "shingles", "signature")
+
+    def __init__(self, source, locator, title, text):
+        self.source = source
+        self.locator = locator
+        self.title = title
+        self.text = text
+        self.shingles = None
+        self.signature = None
+
+    def label(self):
+        """Return 'file locator: title' for reports"""
+        return f"{os.path.relpath(self.source)} {self.locator}: {self.title}"
+
+def slide_words(slide):
+    """Return the text a spec slide shows"""
+    if slide.kind == "raw":
+        return "\n".join(XML_TEXT.findall(slide.fields["xml"]))
+    parts = []
+    for name in TEXT_FIELDS:
+        value = slide.fields.get(name)
+        if isinstance(value, list):
+            parts.extend(value)
+        elif value:
+            parts.append(value)
+    return "\n".join(parts)
+
+def extract_documents(path):
+    """Yield the Documents of a deck spec, built deck or markdown guide"""
+    lower = path.lower()
+    if lower.endswith((".yaml", ".yml", ".json")):
+        from deck_spec import load_deck_spec
+
+        spec = load_deck_spec(path)
+        for slide in spec.slides:
+            yield Document(path, f"slide {slide.index}", slide.title or f"Slide {slide.index}", slide_words(slide))
+    elif lower.endswith(".pptx"):
+        for locator, title, text in extract_deck(path):
+            yield Document(path, locator, title, text)
+    else:
+        from deck_docs import strip_generated
+        from guide_sections import parse_sections, plain_text
+
+        # Blocks that deck_docs generates from the slides would only match the slides themselves
+        with open(path, encoding="utf-8") as f:
+            text = strip_generated(f.read())
+        for section in parse_sections(path, text):
+            yield Document(path, f"#{section.anchor}", section.title, plain_text(section.body))
+
+# ============ MINHASH ============
+
+def shingles(text, size=SHINGLE_WORDS):
+    """Return the set of hashed word n-grams of a text"""
+    words = tokenize(text)
+    if len(words) < size:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))} if words else set()
+    return {zlib.crc32(" ".join(words[i:i + size]).encode("utf-8")) for i in range(len(words) - size + 1)}
+
+@functools.lru_cache(maxsize=None)
+def _permutation_arrays():
+    """Return the permutation coefficients as numpy column vectors"""
+    import numpy as np
+
+    a, b = np.array(PERMUTATIONS, dtype=np.uint64).T
+    return a[:, None], b[:, None]
+
+def minhash(hashes):
+    """Return the MinHash signature of a set of shingle hashes"""
+    import numpy as np
+
+    a, b = _permutation_arrays()
+    values = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+    return tuple(((a * values + b) % np.uint64(HASH_PRIME)).min(axis=1).tolist())
+
+def load_signatures(path=SIGNATURES_PATH):
+    """Return the cached {key: signature} map"""
+    try:
+        with open(path, "rb") as f:
+            version, signatures = marshal.loads(zlib.decompress(f.read()))
+    except (OSError, ValueError, EOFError, zlib.error):
+        return {}
+    return signatures if version == SIGNATURES_FORMAT else {}
+
+def save_signatures(signatures, path=SIGNATURES_PATH):
+    """Write the signature cache atomically"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(zlib.compress(marshal.dumps((SIGNATURES_FORMAT, signatures)), 1))
+    os.replace(tmp, path)
+
+def sign_documents(documents, size=SHINGLE_WORDS, min_shingles=MIN_SHINGLES, cache_path=SIGNATURES_PATH):
+    """Shingle and sign documents (signatures from the cache where possible); return (kept, hashed)"""
+    cached = load_signatures(cache_path)
+    used = {}
+    kept = []
+    for doc in documents:
+        doc.shingles = shingles(doc.text, size)
+        if len(doc.shingles) < min_shingles:
+            continue
+        key = digest(f"{size}\0{NUM_PERM}\0{doc.text}")[:32]
+        signature = cached.get(key)
+        if signature is None:
+            signature = minhash(doc.shingles)
+        doc.signature = used[key] = signature
+        kept.append(doc)
+    hashed = len(used.keys() - cached.keys())
+    if hashed or len(used) != len(cached):
+        save_signatures(used, cache_path)
+    return kept, hashed
+
+def lsh_parameters(threshold, num_perm=NUM_PERM):
+    """Return (bands, rows) of the narrowest bands that still catch pairs at the threshold
+
+    The S-curve of b bands of r rows crosses 50% near (1/b)^(1/r); it is kept
+    below RECALL_MARGIN * threshold so near-threshold pairs are rarely missed
+    (candidates are verified exactly, so extra ones only cost a set comparison).
+    """
+    bands, rows = num_perm, 1
+    for r in range(2, num_perm + 1):
+        b = num_perm // r
+        if (1 / b) ** (1 / r) > RECALL_MARGIN * threshold:
+            break
+        bands, rows = b, r
+    return bands, rows
+
+def candidate_pairs(documents, bands, rows):
+    """Return index pairs that share at least one signature band"""
+    pairs = set()
+    for band in range(bands):
+        buckets = {}
+        start = band * rows
+        for i, doc in enumerate(documents):
+            buckets.setdefault(doc.signature[start:start + rows], []).append(i)
+        for members in buckets.values():
+            if len(members) > 1:
+                pairs.update((a, b) for n, a in enumerate(members) for b in members[n + 1:])
+    return pairs
+
+def jaccard(a, b):
+    """Return the Jaccard similarity of two sets"""
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+def find_clusters(documents, threshold=DEFAULT_THRESHOLD):
+    """Return ([(members, [(i, j, similarity)])], candidates) of near-duplicate documents"""
+    bands, rows = lsh_parameters(threshold)
+    candidates = candidate_pairs(documents, bands, rows)
+    parent = list(range(len(documents)))
+
+    def root(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    matches = []
+    for i, j in candidates:
+        similarity = jaccard(documents[i].shingles, documents[j].shingles)
+        if similarity >= threshold:
+            matches.append((i, j, similarity))
+            parent[root(i)] = root(j)
+
+    groups = {}
+    for i, j, similarity in matches:
+        groups.setdefault(root(i), []).append((i, j, similarity))
+    clusters = []
+    for pairs in groups.values():
+        members = sorted({i for pair in pairs for i in pair[:2]})
+        clusters.append((members, sorted(pairs, key=lambda p: -p[2])))
+    clusters.sort(key=lambda c: (-len(c[0]), -c[1][0][2]))
+    return clusters, len(candidates)
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Report near-duplicate slides and guide sections")
+    parser.add_argument("paths", nargs="*", help="Deck specs, .pptx decks and guides (default: decks/*.yaml, *.md)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Minimum Jaccard similarity")
+    parser.add_argument("--shingle", type=int, default=SHINGLE_WORDS, help="Words per shingle")
+    parser.add_argument("--min-shingles", type=int, default=MIN_SHINGLES, help="Skip shorter documents")
+    parser.add_argument("--json", action="store_true", help="Print the clusters as JSON")
+    args = parser.parse_args()
+    if not 0 < args.threshold <= 1:
+        print("Error: --threshold must be in (0, 1]")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    documents = []
+    for path in args.paths or default_sources():
+        try:
+            documents.extend(extract_documents(path))
+        except (OSError, ValueError) as e:
+            print(f"Error: {path}: {e}")
+            sys.exit(1)
+    documents, hashed = sign_documents(documents, args.shingle, args.min_shingles)
+    clusters, candidates = find_clusters(documents, args.threshold)
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        print(json.dumps([{"documents": [{"source": os.path.relpath(documents[i].source),
+                                          "locator": documents[i].locator, "title": documents[i].title}
+                                         for i in members],
+                           "pairs": [[members.index(i), members.index(j), round(s, 3)] for i, j, s in pairs]}
+                          for members, pairs in clusters], indent=1))
+        return
+    for n, (members, pairs) in enumerate(clusters, start=1):
+        print(f"{n}. {len(members)} near-duplicates (up to {pairs[0][2]:.0%} similar)")
+        for i in members:
+            print(f"   {documents[i].label()}")
+    print(f"✓ {len(clusters)} cluster(s) among {len(documents)} documents "
+          f"({candidates} candidate pairs, {hashed} signatures computed, {elapsed:.2f}s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,588 @@
+#!/usr/bin/env python3
+"""
+EPS Backend Web - Distributed Deck Builds
+Spreads a full regeneration (every spec with its .pptx, HTML site, slide
+renders, thumbnails, PDF and slice decks) over worker processes on any
+number of machines:
+- The coordinator splits each deck into tasks: one .pptx + HTML build,
+  page renders in chunks of slides, a PDF export once its pages exist and
+  one subset deck per slice once the .pptx exists
+- Workers connect over TCP, pull one task at a time and send the rendered
+  parts back; the coordinator writes every output next to its spec
+- A task whose worker disconnects or overruns the task timeout goes back
+  on the queue for another worker, up to MAX_ATTEMPTS times
+- Pages already in the build cache are not rendered again
+- Coordinator and workers prove to each other that they hold the shared
+  secret (EPS_FARM_SECRET, HMAC challenge/response) before any task is sent;
+  without a secret the coordinator only listens on loopback
+- Worker outputs are checked (expected names only, PNG/PDF/.pptx contents,
+  page sizes) before anything is written or put in the build cache
+Workers need the same references/ checkout (toolkit and raw slide media);
+spec files are sent to each worker once.
+
+Usage:
+    python deck_farm.py build [specs ...] [-o out/] [--listen 127.0.0.1:8768] [--local-workers 4] [--chunk 8]
+    EPS_FARM_SECRET=... python deck_farm.py build --listen 0.0.0.0:8768
+    EPS_FARM_SECRET=... python deck_farm.py worker --connect coordinator:8768 [--processes 4]
+"""
+
+import argparse
+import asyncio
+import glob
+import hashlib
+import hmac
+import io
+import json
+import os
+import socket
+import struct
+import sys
+import tempfile
+import time
+from collections import Counter, deque
+
+from deck_cache import cache_get, cache_put, digest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PORT = 8768
+CHUNK_SLIDES = 8
+MAX_ATTEMPTS = 3
+TASK_TIMEOUT = 300          # seconds a worker may spend on one task
+CONNECT_SECONDS = 30        # how long a worker keeps trying to reach the coordinator
+HEADER = struct.Struct(">I")
+MAX_HEADER = 1 << 20        # bytes of JSON per message
+MAX_BLOB = 1 << 28          # bytes per binary part
+SECRET = os.environ.get("EPS_FARM_SECRET", "")
+LOOPBACK_HOSTS = {"127.0.0.1", "::1", "localhost"}
+
+class HandshakeError(Exception):
+    """The other side does not hold the farm secret"""
+
+def default_specs():
+    """Return the deck specs shipped in references/decks"""
+    return sorted(glob.glob(os.path.join(HERE, "decks", "*.yaml")))
+
+def parse_address(text, default_host="127.0.0.1"):
+    """Return (host, port) from 'host:port' or ':port'"""
+    host, _, port = text.rpartition(":")
+    return host or default_host, int(port)
+
+def proof(secret, nonce, role):
+    """Return the HMAC that shows one side of a connection knows the secret"""
+    return hmac.new(secret.encode("utf-8"), f"{role}:{nonce}".encode("ascii"), hashlib.sha256).hexdigest()
+
+def check_proof(secret, nonce, role, value):
+    """Raise HandshakeError unless value is the proof for this nonce"""
+    if not isinstance(value, str) or not hmac.compare_digest(proof(secret, nonce, role), value):
+        raise HandshakeError(f"{role} failed the shared-secret check")
+
+# ============ WIRE FORMAT ============
+
+async def send_message(writer, header, blobs=None):
+    """Send a length-prefixed JSON header followed by its binary blobs"""
+    blobs = blobs or {}
+    head = json.dumps(dict(header, blobs=[[name, len(data)] for name, data in blobs.items()])).encode("utf-8")
+    writer.write(HEADER.pack(len(head)) + head)
+    for data in blobs.values():
+        writer.write(data)
+    await writer.drain()
+
+async def read_message(reader):
+    """Return (header, {name: bytes}) of the next message"""
+    (size,) = HEADER.unpack(await reader.readexactly(HEADER.size))
+    if size > MAX_HEADER:
+        raise ValueError(f"message header of {size} bytes")
+    header = json.loads(await reader.readexactly(size))
+    if not isinstance(header, dict) or not isinstance(header.get("blobs"), list):
+        raise ValueError("message header is not an object with a blob list")
+    blobs = {}
+    for entry in header.pop("blobs"):
+        name, length = entry if isinstance(entry, list) and len(entry) == 2 else (entry, None)
+        if not isinstance(name, str) or not isinstance(length, int) or not 0 <= length <= MAX_BLOB:
+            raise ValueError(f"bad blob {name!r}")
+        blobs[name] = await reader.readexactly(length)
+    return header, blobs
+
+# ============ WORKER ============
+
+def run_task(header, spec, blobs):
+    """Execute one task; return {output name: bytes}"""
+    from deck_render import page_job, page_key, pdf_bytes, render_page, thumbnail
+    from deck_themes import deck_theme
+
+    kind = header["kind"]
+    theme = deck_theme(spec)
+    if kind == "deck":
+        from deck_html import HtmlDeck
+        from deck_spec import build_presentation
+
+        site = HtmlDeck(spec, None, theme)
+        prs = build_presentation(spec, theme=theme, emitters=[site])
+        buffer = io.BytesIO()
+        prs.save(buffer)
+        outputs = {"deck.pptx": buffer.getvalue()}
+        outputs.update((f"html/{name}", data) for name, data in site.files().items())
+        return outputs
+    if kind == "pages":
+        colours = theme.colours()
+        outputs = {}
+        for index in header["indexes"]:
+            slide = spec.slides[index - 1]
+            page = render_page(page_job(spec, slide, colours, header["width"]))
+            outputs[f"page-{index:03d}.png"] = page
+            outputs[f"thumb-{index:03d}.png"] = thumbnail(page, page_key(spec, slide, colours, header["width"]),
+                                                          header["thumb_width"])
+        return outputs
+    if kind == "pdf":
+        pages = [blobs[f"page-{slide.index:03d}.png"] for slide in spec.slides]
+        return {"deck.pdf": pdf_bytes(spec, pages, header["keys"])}
+    if kind == "slice":
+        from deck_slice import slice_deck
+
+        with tempfile.TemporaryDirectory(prefix="deck-farm-") as tmp:
+            full = os.path.join(tmp, "full.pptx")
+            with open(full, "wb") as f:
+                f.write(blobs["deck.pptx"])
+            with open(slice_deck(full, header["indexes"], os.path.join(tmp, "slice.pptx")), "rb") as f:
+                return {"slice.pptx": f.read()}
+    raise ValueError(f"Unknown task kind {kind!r}")
+
+async def work(host, port, secret=SECRET):
+    """Pull and run tasks until the coordinator says the build is over"""
+    from deck_cache import flush_remote
+    from deck_spec import spec_from_bytes
+
+    deadline = time.monotonic() + CONNECT_SECONDS
+    while True:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            break
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.5)
+    try:
+        challenge, _ = await asyncio.wait_for(read_message(reader), CONNECT_SECONDS)
+        nonce = os.urandom(16).hex()
+        await send_message(writer, {"op": "hello", "node": socket.gethostname(), "pid": os.getpid(), "nonce": nonce,
+                                    "proof": proof(secret, challenge.get("nonce", ""), "worker")})
+        welcome, _ = await asyncio.wait_for(read_message(reader), CONNECT_SECONDS)
+        check_proof(secret, nonce, "coordinator", welcome.get("proof"))
+    except HandshakeError:
+        writer.close()
+        raise
+    except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError, ValueError) as e:
+        writer.close()
+        raise HandshakeError(f"coordinator rejected the connection ({type(e).__name__})") from e
+    loop = asyncio.get_running_loop()
+    specs = {}      # spec digest -> DeckSpec
+    done = 0
+    try:
+        while True:
+            try:
+                header, blobs = await read_message(reader)
+            except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+                break
+            if header["op"] == "exit":
+                break
+            if "spec" in blobs:
+                specs[header["spec_digest"]] = spec_from_bytes(blobs.pop("spec"), os.path.join(HERE, header["spec"]))
+            try:
+                outputs = await loop.run_in_executor(None, run_task, header, specs[header["spec_digest"]], blobs)
+                reply = {"op": "done", "id": header["id"]}
+                done += 1
+            except Exception as e:
+                outputs = {}
+                reply = {"op": "failed", "id": header["id"], "error": f"{type(e).__name__}: {e}"}
+            await send_message(writer, reply, outputs)
+    finally:
+        writer.close()
+        flush_remote()
+    return done
+
+# ============ COORDINATOR ============
+
+class DeckJob:
+    """One spec being built and the outputs gathered so far"""
+
+    def __init__(self, path, out_dir, width, thumb_width):
+        from deck_render import page_key
+        from deck_spec import load_deck_spec
+        from deck_themes import deck_theme
+
+        with open(path, "rb") as f:
+            self.data = f.read()
+        self.digest = digest(self.data)
+        self.spec = load_deck_spec(path)
+        self.relpath = os.path.relpath(os.path.abspath(path), HERE)
+        self.out_dir = out_dir or self.spec.base_dir
+        self.width = width
+        self.thumb_width = thumb_width
+        colours = deck_theme(self.spec).colours()
+        self.keys = [page_key(self.spec, slide, colours, width) for slide in self.spec.slides]
+        self.pages = [None] * len(self.spec.slides)
+        self.outputs = []
+        self.failed = False
+
+    @property
+    def thumbs_dir(self):
+        """Return the thumbnail folder"""
+        return os.path.join(self.out_dir, f"{self.spec.deck}_thumbs")
+
+class Task:
+    """One unit of work for a worker"""
+
+    __slots__ = ("id", "kind", "job", "args", "deps", "dependents", "status", "attempts", "outputs", "error")
+
+    def __init__(self, task_id, kind, job, args=None, deps=()):
+        self.id = task_id
+        self.kind = kind
+        self.job = job
+        self.args = args or {}
+        self.deps = list(deps)
+        self.dependents = []
+        self.status = "waiting"
+        self.attempts = 0
+        self.outputs = None
+        self.error = None
+        for dep in self.deps:
+            dep.dependents.append(self)
+
+    def label(self):
+        """Return a short description for reports"""
+        detail = self.args.get("slice") or (f"slides {self.args['indexes'][0]}-{self.args['indexes'][-1]}"
+                                            if self.kind == "pages" else "")
+        return f"{self.job.spec.deck} {self.kind} {detail}".strip()
+
+def _png_width(data):
+    """Return the pixel width of PNG bytes, or raise ValueError"""
+    from PIL import Image
+
+    if not data.startswith(b"\x89PNG\r\n\x1a\n"):
+        raise ValueError("not a PNG")
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image.verify()
+            return image.width
+    except Exception as e:
+        raise ValueError(f"unreadable PNG ({e})") from e
+
+def check_outputs(task, outputs):
+    """Raise ValueError unless a worker sent exactly the outputs its task produces, in the right formats"""
+    from deck_html import SITE_FILE
+
+    job = task.job
+    if task.kind == "deck":
+        expected = {"deck.pptx"} | {name for name in outputs
+                                    if name.startswith("html/") and SITE_FILE.fullmatch(name[5:])}
+    elif task.kind == "pages":
+        expected = {f"{prefix}-{index:03d}.png" for index in task.args["indexes"] for prefix in ("page", "thumb")}
+    else:
+        expected = {"pdf": {"deck.pdf"}, "slice": {"slice.pptx"}}[task.kind]
+    if set(outputs) != expected:
+        unexpected = sorted(set(outputs) ^ expected)
+        raise ValueError(f"unexpected or missing outputs {', '.join(map(repr, unexpected[:3]))}")
+    for name, data in outputs.items():
+        if name.endswith(".pptx") and not data.startswith(b"PK\x03\x04"):
+            raise ValueError(f"{name} is not a .pptx package")
+        if name.endswith(".pdf") and not data.startswith(b"%PDF-"):
+            raise ValueError(f"{name} is not a PDF")
+        if name.endswith(".png"):
+            width = _png_width(data)
+            wanted = job.width if name.startswith("page-") else job.thumb_width
+            if width != wanted:
+                raise ValueError(f"{name} is {width}px wide, expected {wanted}px")
+
+def _write_file(path, data):
+    """Write bytes unless the file already holds them; return the path"""
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return path
+    except OSError:
+        pass
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+class Coordinator:
+    """Hands out the tasks of a build graph and collects their outputs"""
+
+    def __init__(self, jobs, chunk=CHUNK_SLIDES, pdf=True, timeout=TASK_TIMEOUT, secret=SECRET):
+        self.jobs = jobs
+        self.secret = secret
+        self.timeout = timeout
+        self.tasks = []
+        self.ready = deque()
+        self.changed = None
+        self.retried = 0
+        self.per_worker = Counter()
+        for job in jobs:
+            self.plan(job, chunk, pdf)
+
+    def _task(self, kind, job, args=None, deps=()):
+        """Create a task and queue it if it has no dependencies"""
+        task = Task(len(self.tasks) + 1, kind, job, args, deps)
+        self.tasks.append(task)
+        if not task.deps:
+            task.status = "queued"
+            self.ready.append(task)
+        return task
+
+    def plan(self, job, chunk, pdf):
+        """Split one deck into tasks, reusing cached pages"""
+        from deck_render import pdf_key, thumbnail
+
+        deck = self._task("deck", job)
+        missing = []
+        for i, key in enumerate(job.keys):
+            job.pages[i] = cache_get("pages", key, ".png")
+            if job.pages[i] is None:
+                missing.append(i + 1)
+            else:
+                _write_file(os.path.join(job.thumbs_dir, f"slide-{i + 1:03d}.png"),
+                            thumbnail(job.pages[i], key, job.thumb_width))
+        renders = [self._task("pages", job, {"indexes": missing[n:n + chunk]}) for n in range(0, len(missing), chunk)]
+        if pdf and job.keys:
+            cached = cache_get("pdfs", pdf_key(job.spec, job.keys), ".pdf")
+            if cached is None:
+                self._task("pdf", job, deps=renders)
+            else:
+                job.outputs.append(_write_file(os.path.join(job.out_dir, f"{job.spec.deck}.pdf"), cached))
+        for name in job.spec.slices:
+            self._task("slice", job, {"slice": name, "indexes": job.spec.select(name)}, deps=[deck])
+
+    def message(self, task, sent_specs):
+        """Return the (header, blobs) that hand a task to a worker"""
+        job = task.job
+        header = dict(task.args, op="task", id=task.id, kind=task.kind, spec=job.relpath,
+                      spec_digest=job.digest, width=job.width, thumb_width=job.thumb_width)
+        blobs = {}
+        if job.digest not in sent_specs:
+            blobs["spec"] = job.data
+            sent_specs.add(job.digest)
+        if task.kind == "pdf":
+            header["keys"] = job.keys
+            blobs.update((f"page-{i:03d}.png", page) for i, page in enumerate(job.pages, start=1))
+        elif task.kind == "slice":
+            blobs["deck.pptx"] = task.deps[0].outputs["deck.pptx"]
+        return header, blobs
+
+    def collect(self, task, outputs):
+        """Write a finished task's outputs"""
+        from deck_delta import write_manifest
+        from deck_html import write_site
+        from deck_render import pdf_key
+        from deck_slice import slice_path
+
+        job = task.job
+        deck = job.spec.deck
+        if task.kind == "deck":
+            path = _write_file(os.path.join(job.out_dir, f"{deck}.pptx"), outputs["deck.pptx"])
+            write_manifest(path)
+            site = os.path.join(job.out_dir, f"{deck}_html")
+            write_site({name[5:]: data for name, data in outputs.items() if name.startswith("html/")}, site)
+            job.outputs += [path, site]
+            task.outputs = {"deck.pptx": outputs["deck.pptx"]} if task.dependents else {}
+        elif task.kind == "pages":
+            for index in task.args["indexes"]:
+                page = outputs[f"page-{index:03d}.png"]
+                job.pages[index - 1] = page
+                cache_put("pages", job.keys[index - 1], page, ".png")
+                _write_file(os.path.join(job.thumbs_dir, f"slide-{index:03d}.png"), outputs[f"thumb-{index:03d}.png"])
+        elif task.kind == "pdf":
+            cache_put("pdfs", pdf_key(job.spec, job.keys), outputs["deck.pdf"], ".pdf")
+            job.outputs.append(_write_file(os.path.join(job.out_dir, f"{deck}.pdf"), outputs["deck.pdf"]))
+        elif task.kind == "slice":
+            path = _write_file(slice_path(job.spec, task.args["slice"], job.out_dir), outputs["slice.pptx"])
+            write_manifest(path)
+            job.outputs.append(path)
+
+    def remaining(self):
+        """Return the number of tasks not yet done or failed"""
+        return sum(1 for task in self.tasks if task.status not in ("done", "failed"))
+
+    def _finish(self, task, status, error=None):
+        """Mark a task done or failed and release or fail its dependents"""
+        task.status = status
+        task.error = error
+        if status == "failed":
+            task.job.failed = True
+            print(f"✗ {task.label()}: {error}")
+        for dependent in task.dependents:
+            if status == "failed" and dependent.status == "waiting":
+                self._finish(dependent, "failed", f"needs {task.label()}")
+            elif dependent.status == "waiting" and all(dep.status == "done" for dep in dependent.deps):
+                dependent.status = "queued"
+                self.ready.append(dependent)
+
+    async def next_task(self):
+        """Return the next runnable task, or None once the build is over"""
+        async with self.changed:
+            await self.changed.wait_for(lambda: self.ready or not self.remaining())
+            if not self.ready:
+                return None
+            task = self.ready.popleft()
+            task.status = "running"
+            task.attempts += 1
+            return task
+
+    async def settle(self, task, status, error=None, outputs=None, worker=None):
+        """Record the outcome of a task run and wake the other connections"""
+        async with self.changed:
+            if status == "lost":
+                if task.attempts < MAX_ATTEMPTS:
+                    self.retried += 1
+                    task.status = "queued"
+                    self.ready.appendleft(task)
+                    print(f"↻ {task.label()}: {error}, retrying")
+                else:
+                    self._finish(task, "failed", f"{error} ({task.attempts} attempts)")
+            elif status == "done":
+                try:
+                    self.collect(task, outputs)
+                except (OSError, ValueError) as e:
+                    self._finish(task, "failed", f"cannot write outputs: {e}")
+                else:
+                    self.per_worker[worker] += 1
+                    self._finish(task, "done")
+            else:
+                self._finish(task, "failed", error)
+            self.changed.notify_all()
+
+    async def handle(self, reader, writer):
+        """Serve one worker connection"""
+        try:
+            nonce = os.urandom(16).hex()
+            await send_message(writer, {"op": "challenge", "nonce": nonce})
+            hello, _ = await asyncio.wait_for(read_message(reader), 10)
+            check_proof(self.secret, nonce, "worker", hello.get("proof"))
+            await send_message(writer, {"op": "welcome", "proof": proof(self.secret, str(hello.get("nonce")),
+                                                                        "coordinator")})
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError, ValueError, KeyError,
+                HandshakeError) as e:
+            print(f"✗ Rejected connection from {writer.get_extra_info('peername')}: {e}")
+            writer.close()
+            return
+        worker = f"{hello.get('node')}:{hello.get('pid')}"
+        sent_specs = set()
+        try:
+            while True:
+                task = await self.next_task()
+                if task is None:
+                    await send_message(writer, {"op": "exit"})
+                    break
+                try:
+                    header, blobs = self.message(task, sent_specs)
+                    await send_message(writer, header, blobs)
+                    reply, outputs = await asyncio.wait_for(read_message(reader), self.timeout)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError) as e:
+                    await self.settle(task, "lost", f"worker {worker} lost ({type(e).__name__})")
+                    break
+                except ValueError as e:
+                    # Oversized or malformed reply: drop the worker and let another one redo the task
+                    await self.settle(task, "lost", f"worker {worker} sent a malformed reply ({e})")
+                    break
+                if reply.get("op") == "done" and reply.get("id") == task.id:
+                    try:
+                        check_outputs(task, outputs)
+                    except ValueError as e:
+                        # Never write or cache what a misbehaving worker sent; let another worker redo it
+                        await self.settle(task, "lost", f"worker {worker} sent bad output ({e})")
+                        break
+                    await self.settle(task, "done", outputs=outputs, worker=worker)
+                else:
+                    await self.settle(task, "failed", reply.get("error", "bad reply"))
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def run(self, host, port, local_workers=0):
+        """Serve tasks until every one is done or failed"""
+        if not self.secret and host not in LOOPBACK_HOSTS:
+            raise ValueError(f"Set EPS_FARM_SECRET before listening on {host}: workers are unauthenticated "
+                             f"without it")
+        self.changed = asyncio.Condition()
+        server = await asyncio.start_server(self.handle, host, port)
+        port = server.sockets[0].getsockname()[1]
+        print(f"✓ Coordinator on {host}:{port}: {len(self.tasks)} task(s) for {len(self.jobs)} deck(s)")
+        workers = [await asyncio.create_subprocess_exec(sys.executable, os.path.abspath(__file__), "worker",
+                                                        "--connect", f"127.0.0.1:{port}")
+                   for _ in range(local_workers)]
+        async with self.changed:
+            await self.changed.wait_for(lambda: not self.remaining())
+            self.changed.notify_all()
+        server.close()
+        for process in workers:
+            await process.wait()
+        await server.wait_closed()
+
+def main():
+    """Main execution"""
+    from deck_render import DEFAULT_WIDTH, THUMB_WIDTH
+
+    parser = argparse.ArgumentParser(description="Build decks across worker processes and machines")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("build", help="Coordinate a build")
+    p.add_argument("specs", nargs="*", help="Deck specs (default: decks/*.yaml)")
+    p.add_argument("-o", "--output-dir", help="Output folder (default: next to each spec)")
+    p.add_argument("--listen", default=f"127.0.0.1:{DEFAULT_PORT}", help="Address workers connect to")
+    p.add_argument("--local-workers", type=int, default=os.cpu_count() or 1, help="Worker processes to start here")
+    p.add_argument("--chunk", type=int, default=CHUNK_SLIDES, help="Slides per render task")
+    p.add_argument("--width", type=int, default=DEFAULT_WIDTH, help="Page width in pixels")
+    p.add_argument("--thumb-width", type=int, default=THUMB_WIDTH, help="Thumbnail width in pixels")
+    p.add_argument("--task-timeout", type=float, default=TASK_TIMEOUT, help="Seconds before a task is reassigned")
+    p.add_argument("--no-pdf", action="store_true", help="Skip the PDF exports")
+    p = sub.add_parser("worker", help="Run tasks for a coordinator")
+    p.add_argument("--connect", default=f"127.0.0.1:{DEFAULT_PORT}", help="Coordinator address")
+    p.add_argument("--processes", type=int, default=1, help="Worker processes to run on this machine")
+    args = parser.parse_args()
+
+    if args.command == "worker":
+        host, port = parse_address(args.connect)
+        if args.processes > 1:
+            import subprocess
+
+            children = [subprocess.Popen([sys.executable, os.path.abspath(__file__), "worker", "--connect",
+                                          args.connect]) for _ in range(args.processes)]
+            sys.exit(max(child.wait() for child in children))
+        try:
+            asyncio.run(work(host, port))
+        except HandshakeError as e:
+            print(f"Error: {e} (is EPS_FARM_SECRET the same on both sides?)")
+            sys.exit(1)
+        except OSError as e:
+            print(f"Error: cannot reach coordinator {args.connect}: {e}")
+            sys.exit(1)
+        return
+
+    from deck_spec import SpecError
+
+    started = time.perf_counter()
+    try:
+        jobs = [DeckJob(path, args.output_dir, args.width, args.thumb_width) for path in args.specs or default_specs()]
+    except (OSError, SpecError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    coordinator = Coordinator(jobs, max(1, args.chunk), not args.no_pdf, args.task_timeout)
+    host, port = parse_address(args.listen)
+    if coordinator.remaining():
+        try:
+            asyncio.run(coordinator.run(host, port, args.local_workers))
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+    elapsed = time.perf_counter() - started
+
+    for job in jobs:
+        mark = "✗" if job.failed else "✓"
+        print(f"{mark} {job.spec.deck}: {len(job.outputs)} output(s) in {os.path.relpath(job.out_dir)}")
+    failed = sum(1 for task in coordinator.tasks if task.status == "failed")
+    print(f"✓ {len(coordinator.tasks)} task(s) on {len(coordinator.per_worker)} worker(s) in {elapsed:.2f}s "
+          f"({coordinator.retried} retried, {failed} failed)")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+EPS Backend Web - HTML Deck Export
+Browser-viewable decks as a static site, rendered from the same slide model
+as the add_*_slide helpers:
+- One small HTML file per slide (slide-001.html ...) plus an index page
+  grouped by section
+- One shared stylesheet per deck: theme colours as CSS variables and the
+  helper box geometry from deck_layout.py, sized relative to the slide
+- Assets (stylesheet, keyboard navigation script, raw slide images) are
+  content-hashed under assets/ and images are lazy-loaded
+- HtmlDeck is an emitter of deck_spec.render_slides(), so the .pptx and the
+  site come out of one pass over the loaded spec; files whose bytes did not
+  change are not rewritten
+
+Usage:
+    python deck_html.py decks/tot_2day.yaml [-o site/] [--pptx deck.pptx] [--theme dark]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+import xml.etree.ElementTree as ET
+from html import escape
+
+from deck_cache import digest
+from deck_layout import EMU_PER_INCH, EMU_PER_POINT, slide_layout
+from deck_package import NS_A, NS_P, NS_R, SHAPE_TAGS, paragraph_texts
+from deck_themes import ROLES, deck_theme, get_theme
+
+ASSETS_DIR = "assets"
+PAGE_NAME = "slide-{:03d}.html"
+INDEX_PAGE = "index.html"
+HASHED_ASSET = re.compile(r"^[0-9a-f]{16}\.\w+$")
+# Every file a site is made of; write_site refuses any other name
+SITE_FILE = re.compile(r"index\.html|slide-\d+\.html|assets/[0-9a-f]{16}\.[a-z0-9]+")
+FONT_STACK = 'Calibri, "Segoe UI", Arial, sans-serif'
+MONO_STACK = '"Courier New", Consolas, monospace'
+
+# Arrow keys / PageUp / PageDown follow the page's prev and next links
+NAV_SCRIPT = """document.addEventListener("keydown", function (e) {
+  var rel = {ArrowLeft: "prev", PageUp: "prev", ArrowRight: "next", PageDown: "next", Home: "index"}[e.key];
+  var link = rel && document.querySelector('link[rel="' + rel + '"]');
+  if (link) { location.href = link.href; }
+});
+"""
+
+def _pct(value, total):
+    """Return value as a CSS percentage of total"""
+    return f"{value * 100 / total:.3f}".rstrip("0").rstrip(".") + "%"
+
+def _var(role):
+    """Return the CSS variable of a colour role"""
+    return f"var(--{role.replace('_', '-')})"
+
+def _paragraph(text, header=False, href=None):
+    """Return one text paragraph (vertical tabs are line breaks), optionally linking to a page"""
+    inner = "<br>".join(escape(line) for line in text.replace("\v", "\n").split("\n")) or "&nbsp;"
+    if href:
+        inner = f'<a href="{href}">{inner}</a>'
+    return f'<p class="header">{inner}</p>' if header else f"<p>{inner}</p>"
+
+class HtmlDeck:
+    """Static HTML site of one DeckSpec, fed slide by slide alongside the .pptx build"""
+
+    def __init__(self, spec, out_dir, theme=None):
+        self.spec = spec
+        self.out_dir = out_dir
+        self.theme = deck_theme(spec, theme)
+        self.pages = []             # (SlideRecord, slide markup) in deck order
+        self.assets = {}            # content-hashed file name -> bytes
+        self.written = 0
+        self.unchanged = 0
+        self.elapsed = 0.0
+
+    # ============ SLIDES ============
+
+    def add(self, slide):
+        """Render one SlideRecord (called by render_slides or directly)"""
+        started = time.perf_counter()
+        if slide.kind == "raw":
+            body = self._raw_slide(slide)
+        else:
+            body = self._helper_slide(slide)
+        self.pages.append((slide, body))
+        self.elapsed += time.perf_counter() - started
+
+    def _helper_slide(self, slide):
+        """Return the boxes of a helper-rendered slide; geometry lives in the stylesheet"""
+        parts = []
+        for box in slide_layout(self.spec.style, slide.kind).boxes:
+            paragraphs = box.paragraphs(slide.fields)
+            if box.monospace:
+                code = escape(paragraphs[0][0])
+                language = escape(slide.fields.get("language", ""))
+                parts.append(f'<pre class="box {box.name}"><code class="language-{language}">{code}</code></pre>')
+            elif box.name == "title":
+                parts.append(f'<h1 class="box title">{escape(paragraphs[0][0])}</h1>')
+            else:
+                # Agenda entries link to their slides (slide.links index the content_list)
+                links = dict(slide.links) if box.field == "content_list" else {}
+                offset = 1 if box.header else 0
+                inner = "".join(
+                    _paragraph(text, header, PAGE_NAME.format(links[n - offset]) if n - offset in links else None)
+                    for n, (text, header) in enumerate(paragraphs))
+                parts.append(f'<div class="box {box.name}">{inner}</div>')
+        return f'<main class="slide {self.spec.style}-{slide.kind}">{"".join(parts)}</main>'
+
+    def _raw_slide(self, slide):
+        """Return the text and pictures of a passed-through slide, placed from its XML"""
+        root = ET.fromstring(slide.fields["xml"])
+        tree = root.find(f"{{{NS_P}}}cSld/{{{NS_P}}}spTree")
+        rels = slide.fields.get("rels") or {}
+        parts = []
+        for shape in (tree if tree is not None else ()):
+            if shape.tag not in SHAPE_TAGS:
+                continue
+            style = self._placement(shape)
+            blip = shape.find(f".//{{{NS_A}}}blip")
+            rel = rels.get(blip.get(f"{{{NS_R}}}embed")) if blip is not None else None
+            if rel and rel["type"] == "image":
+                src = self.asset_file(os.path.join(self.spec.base_dir, rel["target"]))
+                parts.append(f'<img class="box" style="{style}" src="{ASSETS_DIR}/{src}" alt="" '
+                             f'loading="lazy" decoding="async">')
+                continue
+            texts = [t for t in paragraph_texts(shape)]
+            if any(t.strip() for t in texts):
+                sizes = [int(e.get("sz")) for e in shape.iter(f"{{{NS_A}}}rPr") if e.get("sz")]
+                if sizes:
+                    style += f";font-size:{self._font_size(max(sizes) / 100)}"
+                parts.append(f'<div class="box" style="{style}">{"".join(_paragraph(t) for t in texts)}</div>')
+        return f'<main class="slide raw">{"".join(parts)}</main>'
+
+    def _placement(self, shape):
+        """Return the inline position of a raw shape from its a:xfrm"""
+        off = shape.find(f".//{{{NS_A}}}off")
+        ext = shape.find(f".//{{{NS_A}}}ext[@cx]")
+        if off is None or ext is None:
+            return "position:static"
+        width, height = self.spec.slide_width, self.spec.slide_height
+        return (f"left:{_pct(int(off.get('x')), width)};top:{_pct(int(off.get('y')), height)};"
+                f"width:{_pct(int(ext.get('cx')), width)};height:{_pct(int(ext.get('cy')), height)}")
+
+    def _font_size(self, points):
+        """Return a font size relative to the slide width (cqw)"""
+        return f"{points * EMU_PER_POINT * 100 / self.spec.slide_width:.3f}".rstrip("0").rstrip(".") + "cqw"
+
+    # ============ ASSETS ============
+
+    def asset(self, data, ext):
+        """Register asset bytes and return their content-hashed file name"""
+        name = digest(data)[:16] + ext
+        self.assets[name] = data
+        return name
+
+    def asset_file(self, path):
+        """Register a file as an asset and return its content-hashed file name"""
+        with open(path, "rb") as f:
+            return self.asset(f.read(), os.path.splitext(path)[1].lower())
+
+    def stylesheet(self):
+        """Return the deck stylesheet: theme variables, slide frame and helper box geometry"""
+        spec = self.spec
+        ratio = f"{spec.slide_width} / {spec.slide_height}"
+        colours = ";".join(f"--{role.replace('_', '-')}:#{getattr(self.theme, role)}" for role in ROLES)
+        rules = [
+            f":root{{{colours}}}",
+            "*{box-sizing:border-box}",
+            f"html{{background:#1a1a1a;font-family:{FONT_STACK}}}",
+            "body{margin:0;min-height:100vh;display:flex;flex-direction:column;align-items:center;"
+            "justify-content:center}",
+            f".slide{{position:relative;width:min(100vw,calc((100vh - 2.5rem) * {ratio}));aspect-ratio:{ratio};"
+            f"overflow:hidden;container-type:inline-size;background:{_var('background')};color:{_var('text')}}}",
+            ".box{position:absolute;margin:0;overflow:hidden;overflow-wrap:anywhere;line-height:1.2}",
+            ".box p{margin:0;white-space:pre-wrap}",
+            f"pre.box{{white-space:pre-wrap;font-family:{MONO_STACK};line-height:1}}",
+            "img.box{object-fit:contain}",
+            "nav{display:flex;gap:1.5rem;padding:.5rem;font-size:.9rem;color:#bbb}",
+            "nav a{color:#fff}",
+            ".index{max-width:60rem;padding:2rem;color:#eee}.index a{color:#fff}",
+        ]
+        for kind in ("title", "content", "two_column", "code"):
+            try:
+                layout = slide_layout(spec.style, kind)
+            except ValueError:
+                continue
+            scope = f".{spec.style}-{kind}"
+            rules.append(f"{scope}{{background:{_var(layout.background)}}}")
+            for box in layout.boxes:
+                rules.append(self._box_rule(f"{scope} .{box.name}", box))
+        return "\n".join(rules) + "\n"
+
+    def _box_rule(self, selector, box):
+        """Return the CSS rules that place and style one layout box"""
+        width, height = self.spec.slide_width, self.spec.slide_height
+        decl = [
+            f"left:{_pct(box.left * EMU_PER_INCH, width)}", f"top:{_pct(box.top * EMU_PER_INCH, height)}",
+            f"width:{_pct(box.width * EMU_PER_INCH, width)}", f"height:{_pct(box.height * EMU_PER_INCH, height)}",
+        ]
+        if box.size:
+            decl.append(f"font-size:{self._font_size(box.size)}")
+        if box.role:
+            decl.append(f"color:{_var(box.role)}")
+        if box.fill:
+            decl.append(f"background:{_var(box.fill)}")
+        if box.line:
+            decl.append(f"border:1px solid {_var(box.line)}")
+        if box.bold:
+            decl.append("font-weight:bold")
+        if box.align != "left":
+            decl.append(f"text-align:{box.align}")
+        rules = [f"{selector}{{{';'.join(decl)}}}"]
+        if box.space_before:
+            rules.append(f"{selector} p+p{{margin-top:{self._font_size(box.space_before)}}}")
+        if box.space_after:
+            rules.append(f"{selector} p{{margin-bottom:{self._font_size(box.space_after)}}}")
+        if box.header:
+            rules.append(f"{selector} .header{{font-size:{self._font_size(box.header_size)};font-weight:bold;"
+                         f"color:{_var('heading')}}}")
+        return "".join(rules)
+
+    # ============ PAGES ============
+
+    def _head(self, title, css, script, links=""):
+        """Return the shared <head> of every page"""
+        return (f'<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n'
+                f'<meta name="viewport" content="width=device-width, initial-scale=1">\n'
+                f"<title>{escape(title)}</title>\n"
+                f'<link rel="stylesheet" href="{ASSETS_DIR}/{css}">\n{links}'
+                f'<script src="{ASSETS_DIR}/{script}" defer></script>\n</head>\n')
+
+    def files(self):
+        """Return {relative path: bytes} of the whole site (pages, index and assets)"""
+        css = self.asset(self.stylesheet().encode("utf-8"), ".css")
+        script = self.asset(NAV_SCRIPT.encode("utf-8"), ".js")
+        deck = self.spec.deck
+        count = len(self.pages)
+        files = {}
+        for i, (slide, body) in enumerate(self.pages, start=1):
+            prev_page = PAGE_NAME.format(i - 1) if i > 1 else INDEX_PAGE
+            next_page = PAGE_NAME.format(i + 1) if i < count else INDEX_PAGE
+            links = (f'<link rel="prev" href="{prev_page}">\n<link rel="next" href="{next_page}">\n'
+                     f'<link rel="index" href="{INDEX_PAGE}">\n')
+            title = f"{slide.title or f'Slide {i}'} - {deck}"
+            nav = (f'<nav><a href="{prev_page}">&larr; Previous</a><a href="{INDEX_PAGE}">Contents</a>'
+                   f"<span>{i} / {count}</span><a href=\"{next_page}\">Next &rarr;</a></nav>")
+            page = f"{self._head(title, css, script, links)}<body>\n{body}\n{nav}\n</body>\n</html>\n"
+            files[PAGE_NAME.format(i)] = page.encode("utf-8")
+
+        items = []
+        for section, slides in self.spec.sections():
+            entries = "".join(f'<li><a href="{PAGE_NAME.format(s.index)}">{escape(s.title or f"Slide {s.index}")}'
+                              f"</a></li>" for s in slides)
+            heading = f"<h2>{escape(section)}</h2>" if section else ""
+            items.append(f"{heading}<ol start=\"{slides[0].index}\">{entries}</ol>")
+        first = f'<link rel="next" href="{PAGE_NAME.format(1)}">\n' if count else ""
+        index = (f"{self._head(deck, css, script, first)}<body>\n"
+                 f'<div class="index"><h1>{escape(deck)}</h1>{"".join(items)}</div>\n</body>\n</html>\n')
+        files[INDEX_PAGE] = index.encode("utf-8")
+        for name, data in self.assets.items():
+            files[f"{ASSETS_DIR}/{name}"] = data
+        return files
+
+    def finish(self):
+        """Write the site under out_dir; remove pages and assets of older builds"""
+        started = time.perf_counter()
+        written, unchanged = write_site(self.files(), self.out_dir)
+        self.written += written
+        self.unchanged += unchanged
+        self.elapsed += time.perf_counter() - started
+        return os.path.join(self.out_dir, INDEX_PAGE)
+
+def write_site(files, out_dir):
+    """Write {relative path: bytes} under out_dir, skipping unchanged files; return (written, unchanged)
+
+    Slide pages and hashed assets that are not part of this build are removed. Names
+    outside SITE_FILE (absolute paths, "..", other folders) raise ValueError before
+    anything is written.
+    """
+    for name in files:
+        if not SITE_FILE.fullmatch(name):
+            raise ValueError(f"Refusing to write site file {name!r}")
+    os.makedirs(os.path.join(out_dir, ASSETS_DIR), exist_ok=True)
+    written = unchanged = 0
+    for name, data in files.items():
+        path = os.path.join(out_dir, *name.split("/"))
+        try:
+            with open(path, "rb") as f:
+                if f.read() == data:
+                    unchanged += 1
+                    continue
+        except OSError:
+            pass
+        with open(path, "wb") as f:
+            f.write(data)
+        written += 1
+    for name in os.listdir(out_dir):
+        if re.fullmatch(r"slide-\d+\.html", name) and name not in files:
+            os.remove(os.path.join(out_dir, name))
+    for name in os.listdir(os.path.join(out_dir, ASSETS_DIR)):
+        if HASHED_ASSET.match(name) and f"{ASSETS_DIR}/{name}" not in files:
+            os.remove(os.path.join(out_dir, ASSETS_DIR, name))
+    return written, unchanged
+
+def export_html(spec, out_dir, theme=None):
+    """Write the HTML site of a DeckSpec without building a .pptx; return the HtmlDeck"""
+    site = HtmlDeck(spec, out_dir, theme)
+    for slide in spec.slides:
+        site.add(slide)
+    site.finish()
+    return site
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Export a deck spec as a static HTML site")
+    parser.add_argument("spec")
+    parser.add_argument("-o", "--output-dir", help="Site folder (default: <deck>_html next to the spec)")
+    parser.add_argument("--pptx", help="Also build the .pptx here, in the same pass")
+    parser.add_argument("--theme", help="Colour theme (default: the spec's theme)")
+    args = parser.parse_args()
+
+    from deck_spec import SpecError, build_presentation, load_deck_spec
+
+    try:
+        spec = load_deck_spec(args.spec)
+        theme = deck_theme(spec, get_theme(args.theme) if args.theme else None)
+    except (SpecError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    out_dir = args.output_dir or os.path.join(spec.base_dir, f"{spec.deck}_html")
+
+    started = time.perf_counter()
+    if args.pptx:
+        from deck_delta import write_manifest
+
+        site = HtmlDeck(spec, out_dir, theme)
+        prs = build_presentation(spec, theme=theme, emitters=[site])
+        os.makedirs(os.path.dirname(os.path.abspath(args.pptx)), exist_ok=True)
+        prs.save(args.pptx)
+        index = site.finish()
+        total = time.perf_counter() - started
+        print(f"✓ Presentation created: {args.pptx}")
+        print(f"✓ Manifest: {write_manifest(args.pptx)}")
+        print(f"✓ Build: {total:.2f}s, of which HTML {site.elapsed:.3f}s")
+    else:
+        site = export_html(spec, out_dir, theme)
+        index = os.path.join(out_dir, INDEX_PAGE)
+        print(f"✓ HTML rendered in {site.elapsed:.3f}s")
+    print(f"✓ Site: {index} ({len(site.pages)} slides, {site.written} file(s) written, "
+          f"{site.unchanged} unchanged)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+EPS Backend Web - Bilingual Deck Builds
+English and Bahasa Malaysia decks from one spec and an on-disk translation memory:
+- Every string passed to the add_*_slide helpers is looked up by the hash of
+  its English source in decks/translations/<language>.json
+- Strings without a translation fall back to English, are listed in the
+  untranslated-strings report and are added to the memory with an empty
+  target, so translators see exactly what is missing
+- Known strings are a dictionary lookup; the memory file is only rewritten
+  when new source strings appear
+- One pass over the spec renders every language deck (spec, theme, layout
+  and sections are shared); slides whose text needs no translation are
+  rendered once and copied into the other languages
+Code snippets, raw slides, section names and speaker notes (taken from the
+English guides) are not translated. Agenda entries are translated by their
+label alone (the section name or slide title), and their "— slide N" ending
+is kept, so slide moves do not create new strings and slicing can still
+renumber the translated agenda.
+
+Usage:
+    python deck_i18n.py build decks/tot_2day.yaml [--languages en ms] [-o out/] [--strict]
+    python deck_i18n.py report [--language ms]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+from deck_cache import digest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+TRANSLATIONS_DIR = os.path.join(HERE, "decks", "translations")
+
+SOURCE_LANGUAGE = "en"
+LANGUAGES = {"en": "English", "ms": "Bahasa Malaysia"}
+
+# Helper arguments that carry prose (code_snippet, language and raw XML do not)
+TRANSLATABLE_FIELDS = ("title", "subtitle", "content_list", "left_title", "left_items", "right_title", "right_items")
+WORDS = re.compile(r"[A-Za-z]")
+
+def string_key(text):
+    """Return the translation memory key of an English source string"""
+    return digest(text)[:16]
+
+class TranslationMemory:
+    """Source-hash keyed translations for one language"""
+
+    __slots__ = ("language", "path", "entries", "misses", "added")
+
+    def __init__(self, language, path=None):
+        self.language = language
+        self.path = path or os.path.join(TRANSLATIONS_DIR, f"{language}.json")
+        self.entries = {}       # key -> {"source": str, "target": str or None}
+        self.misses = {}        # key -> (source, [locations]) for this build
+        self.added = 0
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.entries = json.load(f)["entries"]
+        except FileNotFoundError:
+            pass
+
+    def lookup(self, text, where=None):
+        """Return the translation of text, or text itself if there is none yet"""
+        if not WORDS.search(text):
+            return text
+        key = string_key(text)
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self.entries[key] = {"source": text, "target": None}
+            self.added += 1
+        if entry["target"]:
+            return entry["target"]
+        miss = self.misses.setdefault(key, (text, []))
+        if where:
+            miss[1].append(where)
+        return text
+
+    def untranslated(self):
+        """Return the entries that still have no target"""
+        return {key: entry for key, entry in self.entries.items() if not entry["target"]}
+
+    def save(self):
+        """Write the memory if new source strings were added"""
+        if not self.added:
+            return None
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"language": self.language, "entries": self.entries}, f, indent=1, ensure_ascii=False)
+            f.write("\n")
+        os.replace(tmp, self.path)
+        self.added = 0
+        return self.path
+
+def translate_fields(fields, memory, where):
+    """Return a copy of a slide's helper arguments with prose translated"""
+    translated = dict(fields)
+    for name in TRANSLATABLE_FIELDS:
+        value = fields.get(name)
+        if isinstance(value, str):
+            translated[name] = memory.lookup(value, f"{where} {name}")
+        elif isinstance(value, list):
+            translated[name] = [memory.lookup(item, f"{where} {name}[{i}]") for i, item in enumerate(value)]
+    return translated
+
+def translate_agenda_entry(text, memory, where):
+    """Return an agenda entry with its label translated and its bullet and slide number kept"""
+    from deck_spec import AGENDA_NUMBER
+
+    number = AGENDA_NUMBER.search(text)
+    end = number.start() if number else len(text)
+    start = text.find("• ") + 2 if "• " in text else 0
+    return text[:start] + memory.lookup(text[start:end], where) + text[end:]
+
+def translate_slide(slide, memory, deck):
+    """Return a translated copy of a SlideRecord (raw slides are shared)"""
+    from deck_spec import SlideRecord
+
+    if slide.kind == "raw":
+        return slide
+    where = f"{deck} slide {slide.index}"
+    if slide.agenda:
+        fields = translate_fields(dict(slide.fields, content_list=[]), memory, where)
+        fields["content_list"] = [translate_agenda_entry(item, memory, f"{where} content_list[{i}]")
+                                  for i, item in enumerate(slide.fields["content_list"])]
+    else:
+        fields = translate_fields(slide.fields, memory, where)
+    return SlideRecord(slide.index, slide.kind, fields, slide.section, slide.tags, notes=slide.notes,
+                       links=slide.links, agenda=slide.agenda)
+
+def clone_slide(prs, source):
+    """Append a copy of a rendered helper slide to another presentation"""
+    import copy
+
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    sld = slide._element
+    for child in list(sld):
+        sld.remove(child)
+    for child in source._element:
+        sld.append(copy.deepcopy(child))
+    return slide
+
+def _layout_only(slide):
+    """Return True if a slide relates to nothing but its layout (and its own notes)"""
+    from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+
+    return all(rel.reltype in (RT.SLIDE_LAYOUT, RT.NOTES_SLIDE) for rel in slide.part.rels.values())
+
+def build_languages(spec, languages, out_dir, helpers=None):
+    """Render one .pptx per language in a single pass; return ({language: path}, memories)"""
+    from pptx import Presentation
+
+    from deck_spec import NotesWriter, add_sections, add_spec_slide, link_slides, style_helpers
+    from deck_themes import apply_theme, deck_theme
+    from guide_sections import GuideIndex
+
+    helpers = helpers or style_helpers(spec.style)
+    theme = deck_theme(spec)
+    guides = GuideIndex(spec.base_dir)
+    memories = {lang: TranslationMemory(lang) for lang in languages if lang != SOURCE_LANGUAGE}
+    decks = {}
+    for lang in languages:
+        prs = Presentation()
+        prs.slide_width = spec.slide_width
+        prs.slide_height = spec.slide_height
+        decks[lang] = prs
+    notes = {lang: NotesWriter(prs, guides) for lang, prs in decks.items()}
+    pending = {lang: [] for lang in decks}     # agenda slides linked once every slide exists
+
+    for slide in spec.slides:
+        rendered = {}   # helper arguments -> slide already rendered in this pass
+        for lang, prs in decks.items():
+            record = slide if lang == SOURCE_LANGUAGE else translate_slide(slide, memories[lang], spec.deck)
+            key = repr(record.fields)
+            if key in rendered:
+                added = clone_slide(prs, rendered[key])
+                notes[lang].write(added, record)
+            else:
+                added = add_spec_slide(prs, record, helpers, spec.base_dir, theme, notes[lang])
+                if _layout_only(added):
+                    rendered[key] = added
+            if record.links:
+                pending[lang].append((added, record))
+
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {}
+    for lang, prs in decks.items():
+        link_slides(prs, pending[lang])
+        add_sections(prs, spec)
+        apply_theme(prs, theme)
+        paths[lang] = os.path.join(out_dir, f"{spec.deck}_{lang}.pptx")
+        prs.save(paths[lang])
+    for memory in memories.values():
+        memory.save()
+    return paths, memories
+
+def print_misses(memory, limit=None):
+    """Print this build's untranslated strings with their slide locations"""
+    shown = list(memory.misses.items())[:limit]
+    for key, (source, locations) in shown:
+        where = locations[0] + (f" (+{len(locations) - 1} more)" if len(locations) > 1 else "")
+        print(f"  {key}  {where}: {source.splitlines()[0][:70]}")
+    if limit is not None and len(memory.misses) > limit:
+        print(f"  ... {len(memory.misses) - limit} more (python deck_i18n.py report --language {memory.language})")
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Build bilingual decks from a translation memory")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("build", help="Render every language of a spec in one pass")
+    p.add_argument("spec")
+    p.add_argument("--languages", nargs="+", default=list(LANGUAGES), choices=sorted(LANGUAGES))
+    p.add_argument("-o", "--output-dir", help="Output folder (default: next to the spec)")
+    p.add_argument("--strict", action="store_true", help="Exit with status 1 if any string is untranslated")
+    p = sub.add_parser("report", help="List untranslated strings in the translation memory")
+    p.add_argument("--language", default="ms", choices=sorted(set(LANGUAGES) - {SOURCE_LANGUAGE}))
+    args = parser.parse_args()
+
+    if args.command == "report":
+        memory = TranslationMemory(args.language)
+        missing = memory.untranslated()
+        for key, entry in missing.items():
+            print(f"{key}  {json.dumps(entry['source'], ensure_ascii=False)}")
+        print(f"{len(missing)} of {len(memory.entries)} strings untranslated in {memory.path}")
+        return
+
+    from deck_delta import write_manifest
+    from deck_spec import SpecError, load_deck_spec
+
+    try:
+        spec = load_deck_spec(args.spec)
+    except SpecError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    started = time.perf_counter()
+    paths, memories = build_languages(spec, args.languages, args.output_dir or spec.base_dir)
+    elapsed = time.perf_counter() - started
+    for lang, path in paths.items():
+        print(f"✓ {LANGUAGES[lang]}: {path}")
+        print(f"✓ Manifest: {write_manifest(path)}")
+    print(f"✓ {len(paths)} language(s) of {len(spec)} slides in {elapsed:.2f}s")
+
+    untranslated = 0
+    for memory in memories.values():
+        untranslated += len(memory.misses)
+        if memory.misses:
+            print(f"✗ {LANGUAGES[memory.language]}: {len(memory.misses)} untranslated string(s), "
+                  f"fill in their targets in {memory.path}")
+            print_misses(memory, limit=20)
+    sys.exit(1 if args.strict and untranslated else 0)
+
+if __name__ == "__main__":
+    main()
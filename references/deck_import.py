@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+EPS Backend Web - Deck Importer
+Turns existing .pptx decks (eps_tot_training.pptx, laravel_tot_eps.pptx, ...)
+into declarative deck specs (see deck_spec.py):
+- Streams every slide with iterparse and classifies it as one of the
+  title / content / two_column / code kinds of the generator helpers
+- Slides with pictures, tables, charts or groups are kept as raw XML
+  (their images are copied next to the spec)
+- Every classification is checked against the slide's text, so the spec
+  rebuilds the deck with the same slide count and text
+- Folders of decks are imported in parallel
+Only plain text decks, like the ones the generator helpers build, turn into
+editable slide kinds. Designed decks whose slides carry icons or pictures
+and dozens of separately placed text boxes (eps_tot_training.pptx is one:
+all 41 slides) come back as raw slides, because no generator kind can
+reproduce their layout; the summary line says why each raw slide stayed raw.
+
+Usage:
+    python deck_import.py eps_tot_training.pptx [-o eps_tot_training.deck.json] [--verify]
+    python deck_import.py references/ --jobs 4
+"""
+
+import argparse
+import glob
+import hashlib
+import os
+import posixpath
+import re
+import sys
+
+from deck_package import (
+    NS_A, NS_P, NS_R, RT_HYPERLINK, iter_slide_shapes, open_package, paragraph_texts, read_rels,
+    slide_part_names, slide_text,
+)
+from deck_spec import SPEC_VERSION, dump_spec
+
+# Shapes that only a raw passthrough can reproduce
+RICH_TAGS = {f"{{{NS_P}}}pic", f"{{{NS_P}}}graphicFrame", f"{{{NS_P}}}grpSp", f"{{{NS_P}}}contentPart"}
+MONOSPACE = re.compile(r"mono|courier|consolas|menlo|monaco", re.IGNORECASE)
+
+# A title slide's heading sits well below the top of the slide
+TITLE_SLIDE_MIN_TOP = 0.2
+TITLE_SLIDE_MIN_SIZE = 3600  # hundredths of a point
+
+SPEC_SUFFIX = ".deck.json"
+
+RAW_RICH = "pictures, tables or groups"
+RAW_LAYOUT = "text does not fit a generator layout"
+
+class ShapeInfo:
+    """What the classifier needs to know about one top-level shape"""
+
+    __slots__ = ("left", "top", "width", "paragraphs", "max_size", "monospace", "rich")
+
+    def __init__(self, elem):
+        self.left = self.top = self.width = 0
+        off = elem.find(f".//{{{NS_A}}}off")
+        ext = elem.find(f".//{{{NS_A}}}ext")
+        if off is not None:
+            self.left, self.top = int(off.get("x", 0)), int(off.get("y", 0))
+        if ext is not None and ext.get("cx") is not None:
+            self.width = int(ext.get("cx"))
+        self.paragraphs = [t for t in paragraph_texts(elem) if t.strip()]
+        sizes = [int(e.get("sz")) for e in elem.iter() if e.get("sz") and e.tag.startswith(f"{{{NS_A}}}")]
+        self.max_size = max(sizes, default=0)
+        fonts = [e.get("typeface", "") for e in elem.iter(f"{{{NS_A}}}latin")]
+        self.monospace = bool(fonts) and all(MONOSPACE.search(f) for f in fonts)
+        self.rich = elem.tag in RICH_TAGS or any(
+            e.tag in RICH_TAGS or any(key.startswith(f"{{{NS_R}}}") for key in e.attrib)
+            for e in elem.iter())
+
+def text_lines(paragraphs):
+    """Normalize paragraphs into non-empty lines (line breaks count as new lines)"""
+    lines = []
+    for paragraph in paragraphs:
+        lines.extend(line for line in paragraph.replace("\v", "\n").split("\n") if line.strip())
+    return lines
+
+def spec_lines(slide):
+    """Return the text lines a spec slide renders with the tot helpers"""
+    kind = slide["kind"]
+    if kind == "title":
+        parts = [slide["title"], slide["subtitle"]]
+    elif kind == "content":
+        parts = [slide["title"]] + slide["content_list"]
+    elif kind == "two_column":
+        parts = [slide["title"], slide["left_title"]] + slide["left_items"] + [slide["right_title"]] + slide["right_items"]
+    elif kind == "code":
+        parts = [slide["title"], slide["code_snippet"]]
+    else:
+        return None
+    return text_lines(parts)
+
+def classify(shapes, slide_width, slide_height):
+    """Return a spec slide dict for a text-only slide, or None if it needs raw XML"""
+    if any(s.rich for s in shapes):
+        return None
+    texts = [s for s in shapes if s.paragraphs]
+    if not texts:
+        return None
+    head = texts[0]
+    title = head.paragraphs[0]
+    rest = head.paragraphs[1:]
+    body = texts[1:]
+
+    code = [s for s in body if s.monospace]
+    if code and len(code) == len(body) and not rest:
+        return {"kind": "code", "title": title,
+                "code_snippet": "\n".join(p for s in code for p in s.paragraphs), "language": "php"}
+
+    if (len(texts) <= 3 and head.top >= slide_height * TITLE_SLIDE_MIN_TOP
+            and head.max_size >= TITLE_SLIDE_MIN_SIZE):
+        subtitle = rest + [p for s in body for p in s.paragraphs]
+        return {"kind": "title", "title": title, "subtitle": "\n".join(subtitle)}
+
+    if (not rest and len(body) == 2 and all(len(s.paragraphs) >= 1 for s in body)
+            and body[0].left + body[0].width <= slide_width * 0.55
+            and body[1].left >= slide_width * 0.45):
+        left, right = body
+        return {"kind": "two_column", "title": title,
+                "left_title": left.paragraphs[0], "left_items": left.paragraphs[1:],
+                "right_title": right.paragraphs[0], "right_items": right.paragraphs[1:]}
+
+    return {"kind": "content", "title": title,
+            "content_list": rest + [p for s in body for p in s.paragraphs]}
+
+def raw_slide(zf, part_name, media_dir, spec_dir):
+    """Return a raw spec slide, copying the slide's images into media_dir"""
+    rels = {}
+    for rid, (rel_type, target, mode) in read_rels(zf, part_name).items():
+        kind = rel_type.rsplit("/", 1)[-1]
+        if rel_type == RT_HYPERLINK and mode == "External":
+            rels[rid] = {"type": "hyperlink", "target": target}
+        elif kind == "image":
+            data = zf.read(target)
+            name = hashlib.sha1(data).hexdigest()[:16] + posixpath.splitext(target)[1]
+            path = os.path.join(media_dir, name)
+            if not os.path.exists(path):
+                os.makedirs(media_dir, exist_ok=True)
+                with open(path, "wb") as f:
+                    f.write(data)
+            rels[rid] = {"type": "image", "target": os.path.relpath(path, spec_dir).replace(os.sep, "/")}
+    return {"kind": "raw", "xml": zf.read(part_name).decode("utf-8"), "rels": rels}
+
+def _slide_size(zf):
+    """Return (cx, cy) from presentation.xml"""
+    import xml.etree.ElementTree as ET
+
+    size = ET.fromstring(zf.read("ppt/presentation.xml")).find(f"{{{NS_P}}}sldSz")
+    return int(size.get("cx")), int(size.get("cy"))
+
+def raw_reason(shapes):
+    """Return why classify() left a slide as raw XML"""
+    return RAW_RICH if any(s.rich for s in shapes) else RAW_LAYOUT
+
+def import_deck(pptx_path, spec_path=None):
+    """Convert a .pptx into a deck spec; return (spec path, kind counts, raw slide counts by reason)"""
+    stem = os.path.splitext(os.path.basename(pptx_path))[0]
+    spec_path = spec_path or os.path.join(os.path.dirname(os.path.abspath(pptx_path)), stem + SPEC_SUFFIX)
+    spec_dir = os.path.dirname(os.path.abspath(spec_path))
+    media_dir = os.path.join(spec_dir, stem + ".media")
+
+    counts = {}
+    reasons = {}
+    slides = []
+    with open_package(pptx_path) as zf:
+        width, height = _slide_size(zf)
+        for part in slide_part_names(zf):
+            shapes = [ShapeInfo(elem) for elem in iter_slide_shapes(zf, part)]
+            slide = classify(shapes, width, height)
+            original = text_lines(p for s in shapes for p in s.paragraphs)
+            if slide is None or spec_lines(slide) != original:
+                slide = raw_slide(zf, part, media_dir, spec_dir)
+                reason = raw_reason(shapes)
+                reasons[reason] = reasons.get(reason, 0) + 1
+            counts[slide["kind"]] = counts.get(slide["kind"], 0) + 1
+            slides.append(slide)
+
+    spec = {
+        "version": SPEC_VERSION,
+        "deck": stem,
+        "style": "tot",
+        "source": os.path.basename(pptx_path),
+        "slide_width": width,
+        "slide_height": height,
+        "slides": slides,
+    }
+    dump_spec(spec, spec_path)
+    return spec_path, counts, reasons
+
+def verify_import(pptx_path, spec_path):
+    """Rebuild a spec and check slide count and text against the original deck"""
+    import tempfile
+
+    from deck_spec import build_presentation, load_deck_spec
+
+    prs = build_presentation(load_deck_spec(spec_path))
+    with tempfile.TemporaryDirectory() as tmp:
+        rebuilt = os.path.join(tmp, "rebuilt.pptx")
+        prs.save(rebuilt)
+        problems = []
+        with open_package(pptx_path) as a, open_package(rebuilt) as b:
+            old_parts, new_parts = slide_part_names(a), slide_part_names(b)
+            if len(old_parts) != len(new_parts):
+                problems.append(f"slide count {len(old_parts)} != {len(new_parts)}")
+            for i, (pa, pb) in enumerate(zip(old_parts, new_parts), start=1):
+                old_text = text_lines(t for shape in slide_text(a, pa) for t in shape)
+                new_text = text_lines(t for shape in slide_text(b, pb) for t in shape)
+                if old_text != new_text:
+                    problems.append(f"slide {i}: text differs")
+    return problems
+
+def _import_one(args):
+    """Worker entry point for parallel folder imports"""
+    pptx_path, verify = args
+    spec_path, counts, reasons = import_deck(pptx_path)
+    problems = verify_import(pptx_path, spec_path) if verify else []
+    return pptx_path, spec_path, counts, reasons, problems
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Import .pptx decks as declarative deck specs")
+    parser.add_argument("source", help="A .pptx file or a folder of decks")
+    parser.add_argument("-o", "--output", help="Spec path for a single deck (.json or .yaml)")
+    parser.add_argument("--verify", action="store_true", help="Rebuild each spec and compare slide text")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Parallel imports for folders")
+    args = parser.parse_args()
+
+    if os.path.isdir(args.source):
+        decks = sorted(glob.glob(os.path.join(args.source, "*.pptx")))
+        jobs = [(path, args.verify) for path in decks]
+        if args.jobs > 1 and len(decks) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+                results = list(pool.map(_import_one, jobs))
+        else:
+            results = [_import_one(job) for job in jobs]
+    else:
+        spec_path, counts, reasons = import_deck(args.source, args.output)
+        problems = verify_import(args.source, spec_path) if args.verify else []
+        results = [(args.source, spec_path, counts, reasons, problems)]
+
+    failed = False
+    for pptx_path, spec_path, counts, reasons, problems in results:
+        kinds = ", ".join(f"{n} {kind}" for kind, n in sorted(counts.items()))
+        print(f"✓ {os.path.basename(pptx_path)} -> {spec_path} ({kinds})")
+        for reason, n in sorted(reasons.items()):
+            print(f"  {n} raw: {reason}")
+        for problem in problems:
+            failed = True
+            print(f"  ✗ {problem}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
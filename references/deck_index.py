@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+EPS Backend Web - Training Material Search Index
+Full-text search over the training decks and markdown guides:
+- Slide text (plus speaker notes) streamed from .pptx parts with iterparse
+- Markdown guides split into heading sections
+- Compact on-disk inverted index (marshal + zlib), updated incrementally:
+  only files whose size/mtime and content digest changed are re-extracted
+- The index keeps postings and per-document titles and lengths only; result
+  snippets are read back from the source files of the hits
+- BM25 ranking with a title boost
+
+Usage:
+    python deck_index.py build [paths ...]          # defaults to references/*.md and *.pptx
+    python deck_index.py query "Too Many Connections" [-n 10]
+"""
+
+import argparse
+import glob
+import hashlib
+import marshal
+import math
+import os
+import re
+import sys
+import time
+import zlib
+
+from deck_cache import CACHE_DIR
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+INDEX_PATH = os.path.join(CACHE_DIR, "search_index.bin")
+INDEX_FORMAT = 2
+
+TOKEN = re.compile(r"[a-z0-9]+(?:[.'][a-z0-9]+)*")
+TITLE_WEIGHT = 3
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+def tokenize(text):
+    """Split text into lowercase search terms"""
+    return TOKEN.findall(text.lower())
+
+def default_sources():
+    """Return the guides and decks shipped in references/"""
+    return sorted(glob.glob(os.path.join(HERE, "*.md")) + glob.glob(os.path.join(HERE, "*.pptx")))
+
+# ============ EXTRACTION ============
+
+def extract_deck(path):
+    """Yield (locator, title, text) for every slide of a deck"""
+    from deck_package import notes_text, open_package, read_rels, slide_part_names, slide_text
+
+    with open_package(path) as zf:
+        for i, part in enumerate(slide_part_names(zf), start=1):
+            paragraphs = [t for shape in slide_text(zf, part) for t in shape if t.strip()]
+            notes = notes_text(zf, read_rels(zf, part))
+            title = paragraphs[0] if paragraphs else f"Slide {i}"
+            yield f"slide {i}", title, "\n".join(paragraphs + notes)
+
+def extract_guide(path):
+    """Yield (locator, title, text) for every section of a markdown guide"""
+    from guide_sections import parse_sections
+
+    for section in parse_sections(path):
+        yield f"#{section.anchor} (line {section.line})", section.title, section.body
+
+def extract(path):
+    """Yield (locator, title, text) documents for any supported file"""
+    if path.lower().endswith(".pptx"):
+        return extract_deck(path)
+    return extract_guide(path)
+
+# ============ INDEX ============
+
+def empty_index():
+    """Return a new, empty index structure"""
+    return {
+        "format": INDEX_FORMAT,
+        "files": {},      # path -> [size, mtime_ns, sha256, [doc ids]]
+        "docs": [],       # doc id -> [path, locator, title, length] or None
+        "postings": {},   # term -> {doc id: weighted term frequency}
+        "total_length": 0,
+        "live_docs": 0,
+    }
+
+def load_index(path=INDEX_PATH):
+    """Load the on-disk index, or return an empty one"""
+    try:
+        with open(path, "rb") as f:
+            index = marshal.loads(zlib.decompress(f.read()))
+    except (OSError, ValueError, zlib.error, EOFError):
+        return empty_index()
+    return index if index.get("format") == INDEX_FORMAT else empty_index()
+
+def save_index(index, path=INDEX_PATH):
+    """Write the index atomically"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(zlib.compress(marshal.dumps(index), 6))
+    os.replace(tmp, path)
+
+def _remove_file(index, path):
+    """Drop every document that came from a file"""
+    entry = index["files"].pop(path, None)
+    if not entry:
+        return
+    doc_ids = set(entry[3])
+    for term, postings in list(index["postings"].items()):
+        if not doc_ids.isdisjoint(postings):
+            for doc_id in doc_ids.intersection(postings):
+                del postings[doc_id]
+            if not postings:
+                del index["postings"][term]
+    for doc_id in doc_ids:
+        index["total_length"] -= index["docs"][doc_id][3]
+        index["live_docs"] -= 1
+        index["docs"][doc_id] = None
+
+def _add_file(index, path, stat, sha):
+    """Extract and index every document of a file"""
+    doc_ids = []
+    for locator, title, text in extract(path):
+        counts = {}
+        for term in tokenize(title):
+            counts[term] = counts.get(term, 0) + TITLE_WEIGHT
+        for term in tokenize(text):
+            counts[term] = counts.get(term, 0) + 1
+        if not counts:
+            continue
+        doc_id = len(index["docs"])
+        length = sum(counts.values())
+        index["docs"].append([path, locator, title, length])
+        for term, tf in counts.items():
+            index["postings"].setdefault(term, {})[doc_id] = tf
+        index["total_length"] += length
+        index["live_docs"] += 1
+        doc_ids.append(doc_id)
+    index["files"][path] = [stat.st_size, stat.st_mtime_ns, sha, doc_ids]
+
+def _compact(index):
+    """Renumber documents once deleted slots outweigh live ones"""
+    if len(index["docs"]) <= 2 * max(index["live_docs"], 1):
+        return index
+    fresh = empty_index()
+    remap = {}
+    for old_id, doc in enumerate(index["docs"]):
+        if doc is not None:
+            remap[old_id] = len(fresh["docs"])
+            fresh["docs"].append(doc)
+    fresh["postings"] = {
+        term: {remap[d]: tf for d, tf in postings.items()}
+        for term, postings in index["postings"].items()
+    }
+    fresh["files"] = {
+        path: entry[:3] + [[remap[d] for d in entry[3]]]
+        for path, entry in index["files"].items()
+    }
+    fresh["total_length"] = index["total_length"]
+    fresh["live_docs"] = index["live_docs"]
+    return fresh
+
+def _file_sha(path):
+    """Return the SHA-256 digest of a file"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def update_index(paths, index_path=INDEX_PATH):
+    """Bring the index up to date with paths; return (index, changed files)"""
+    index = load_index(index_path)
+    paths = [os.path.abspath(p) for p in paths]
+    changed = []
+
+    for path in set(index["files"]) - set(paths):
+        _remove_file(index, path)
+        changed.append(path)
+
+    for path in paths:
+        stat = os.stat(path)
+        entry = index["files"].get(path)
+        if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            continue
+        sha = _file_sha(path)
+        if entry and entry[2] == sha:
+            entry[0], entry[1] = stat.st_size, stat.st_mtime_ns
+            continue
+        _remove_file(index, path)
+        _add_file(index, path, stat, sha)
+        changed.append(path)
+
+    index = _compact(index)
+    save_index(index, index_path)
+    return index, changed
+
+# ============ QUERY ============
+
+def search(index, query, limit=10):
+    """Return [(score, doc)] ranked by BM25 for a free-text query"""
+    terms = list(dict.fromkeys(tokenize(query)))
+    if not terms or not index["live_docs"]:
+        return []
+    n = index["live_docs"]
+    avg_length = index["total_length"] / n
+    scores = {}
+    for term in terms:
+        postings = index["postings"].get(term)
+        if not postings:
+            continue
+        idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+        for doc_id, tf in postings.items():
+            length = index["docs"][doc_id][3]
+            norm = tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length))
+            scores[doc_id] = scores.get(doc_id, 0.0) + idf * norm
+
+    phrase = " ".join(terms)
+    for doc_id in scores:
+        if phrase in " ".join(tokenize(index["docs"][doc_id][2])):
+            scores[doc_id] *= 2
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return [(score, index["docs"][doc_id]) for doc_id, score in ranked]
+
+def document_texts(docs):
+    """Return {(path, locator): text} for documents, re-extracting only the files they come from"""
+    wanted = {}
+    for path, locator, _, _ in docs:
+        wanted.setdefault(path, set()).add(locator)
+    texts = {}
+    for path, locators in wanted.items():
+        try:
+            for locator, _, text in extract(path):
+                if locator in locators:
+                    texts[path, locator] = text
+                    locators.discard(locator)
+                    if not locators:
+                        break
+        except (OSError, ValueError):
+            continue        # moved or unreadable since indexing: results show without snippets
+    return texts
+
+def snippet(text, query, width=100):
+    """Return the first line of text that mentions a query term"""
+    terms = set(tokenize(query))
+    for line in text.splitlines():
+        if terms & set(tokenize(line)):
+            line = line.strip()
+            return line if len(line) <= width else line[:width - 1] + "…"
+    return ""
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Search the training decks and guides")
+    parser.add_argument("--index", default=INDEX_PATH, help="Index file location")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("build", help="Create or incrementally update the index")
+    p.add_argument("paths", nargs="*", help="Decks and guides (default: references/*.md, *.pptx)")
+    p = sub.add_parser("query", help="Search the index")
+    p.add_argument("query")
+    p.add_argument("-n", "--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.command == "build":
+        index, changed = update_index(args.paths or default_sources(), args.index)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"✓ Index updated: {args.index}")
+        print(f"✓ Files re-indexed: {len(changed)}, documents: {index['live_docs']}, "
+              f"terms: {len(index['postings'])} ({elapsed:.0f} ms)")
+        return
+
+    index = load_index(args.index)
+    if not index["live_docs"]:
+        print("Index is empty - run: python deck_index.py build")
+        sys.exit(1)
+    results = search(index, args.query, args.limit)
+    elapsed = (time.perf_counter() - started) * 1000
+    texts = document_texts([doc for _, doc in results])
+    for rank, (score, (path, locator, title, _)) in enumerate(results, start=1):
+        print(f"{rank:2}. [{score:5.2f}] {os.path.relpath(path)} {locator}: {title}")
+        line = snippet(texts.get((path, locator), ""), args.query)
+        if line and line != title:
+            print(f"      {line}")
+    print(f"{len(results)} hits in {elapsed:.1f} ms")
+
+if __name__ == "__main__":
+    main()
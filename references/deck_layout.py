@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+EPS Backend Web - Slide Layout Metrics
+The boxes the add_*_slide helpers of each style draw, as data, for renderers
+that do not go through python-pptx (HTML export, thumbnails):
+- Position and size in inches from the slide's top-left corner
+- Font size in points, colour role (see deck_themes.py), weight and alignment
+- Which spec field (or fixed text) each box shows
+
+The values mirror create_tot_presentation.py and
+create_troubleshooting_architecture_presentation.py; change both together.
+"""
+
+EMU_PER_INCH = 914400
+EMU_PER_POINT = 12700
+POINTS_PER_INCH = 72
+LINE_HEIGHT = 1.2           # line pitch in font sizes
+MONOSPACE_ADVANCE = 0.6     # Courier glyph width in font sizes
+
+# python-pptx text box insets, in inches
+INSET_X = 0.1
+INSET_Y = 0.05
+
+class Box:
+    """One shape drawn by a slide helper"""
+
+    __slots__ = ("name", "left", "top", "width", "height", "field", "header", "text", "size", "header_size",
+                 "role", "fill", "line", "bold", "align", "space_before", "space_after", "monospace")
+
+    def __init__(self, name, left, top, width, height, field=None, header=None, text=None, size=None,
+                 header_size=None, role="text", fill=None, line=None, bold=False, align="left",
+                 space_before=0, space_after=0, monospace=False):
+        self.name = name
+        self.left = left                # inches
+        self.top = top
+        self.width = width
+        self.height = height
+        self.field = field              # spec field shown in the box (str, list or code)
+        self.header = header            # spec field shown as a bold first paragraph
+        self.text = text                # fixed text drawn by the helper itself
+        self.size = size                # points
+        self.header_size = header_size
+        self.role = role                # text colour role
+        self.fill = fill                # fill colour role of shapes without text
+        self.line = line
+        self.bold = bold
+        self.align = align
+        self.space_before = space_before    # points
+        self.space_after = space_after
+        self.monospace = monospace
+
+    def paragraphs(self, fields):
+        """Return [(text, is_header)] for the box given a slide's helper arguments"""
+        if self.text is not None:
+            return [(self.text, False)]
+        if self.field is None:
+            return []
+        lines = [(fields[self.header], True)] if self.header else []
+        value = fields.get(self.field, "")
+        if isinstance(value, list):
+            lines.extend((item, False) for item in value)
+        elif self.monospace:
+            lines.append((value, False))
+        else:
+            lines.extend((line, False) for line in value.split("\n"))
+        return lines
+
+    def line_capacity(self):
+        """Return how many single-line paragraphs fit in the box"""
+        pitch = self.size * LINE_HEIGHT + self.space_before + self.space_after
+        return int((self.height - 2 * INSET_Y) * POINTS_PER_INCH // pitch)
+
+    def column_capacity(self):
+        """Return how many monospace characters fit on one line of the box"""
+        return int((self.width - 2 * INSET_X) * POINTS_PER_INCH // (self.size * MONOSPACE_ADVANCE))
+
+    def __repr__(self):
+        return f"<Box {self.name} {self.left},{self.top} {self.width}x{self.height}>"
+
+class SlideLayout:
+    """Background role and boxes of one slide kind, in drawing order"""
+
+    __slots__ = ("background", "boxes")
+
+    def __init__(self, background, boxes):
+        self.background = background
+        self.boxes = boxes
+
+def _heading(size, height=0.8):
+    """Return the red heading box the content-style slides start with"""
+    return Box("title", 0.5, 0.3, 9, height, field="title", size=size, role="heading", bold=True)
+
+LAYOUTS = {
+    "tot": {
+        "title": SlideLayout("title_background", (
+            Box("title", 0.5, 2, 9, 1.5, field="title", size=54, role="title_text", bold=True),
+            Box("subtitle", 0.5, 3.7, 9, 2, field="subtitle", size=24, role="title_muted"),
+        )),
+        "content": SlideLayout("background", (
+            _heading(40),
+            Box("body", 0.7, 1.3, 8.6, 5.5, field="content_list", size=18, space_before=6),
+        )),
+        "two_column": SlideLayout("background", (
+            _heading(36),
+            Box("left", 0.5, 1.2, 4.3, 5.5, field="left_items", header="left_title", size=14, header_size=20,
+                space_before=4),
+            Box("right", 5.2, 1.2, 4.3, 5.5, field="right_items", header="right_title", size=14, header_size=20,
+                space_before=4),
+        )),
+        "code": SlideLayout("background", (
+            _heading(32, height=0.7),
+            Box("panel", 0.4, 1.1, 9.2, 5.8, role=None, fill="code_background", line="code_border"),
+            Box("code", 0.6, 1.3, 9, 5.4, field="code_snippet", size=9, role="code_text", monospace=True),
+        )),
+    },
+    "troubleshooting": {
+        "title": SlideLayout("title_background", (
+            Box("title", 0.5, 2.5, 9, 1.5, field="title", size=60, role="title_text", bold=True, align="center"),
+            Box("subtitle", 0.5, 4, 9, 1.5, field="subtitle", size=28, role="title_text", align="center"),
+            Box("date", 0.5, 6.5, 9, 0.8, text="January 7, 2026", size=14, role="title_muted", align="center"),
+        )),
+        "content": SlideLayout("background", (
+            _heading(44),
+            Box("rule", 0.5, 1.15, 9, 0.02, role=None, fill="heading", line="heading"),
+            Box("body", 0.7, 1.5, 8.6, 5.5, field="content_list", size=14, space_before=6, space_after=6),
+        )),
+        "two_column": SlideLayout("background", (
+            _heading(44),
+            Box("rule", 0.5, 1.15, 9, 0.02, role=None, fill="heading", line="heading"),
+            Box("left", 0.5, 1.5, 4.5, 5.5, field="left_items", size=13, space_before=4, space_after=4),
+            Box("right", 5.2, 1.5, 4.3, 5.5, field="right_items", size=13, space_before=4, space_after=4),
+        )),
+    },
+}
+
+def slide_layout(style, kind):
+    """Return the SlideLayout of a slide kind in a style"""
+    try:
+        return LAYOUTS[style][kind]
+    except KeyError:
+        raise ValueError(f"No layout for {kind} slides in style {style!r}") from None
+
+def field_boxes(kind, field):
+    """Yield the box showing a spec field on slides of a kind, in every style"""
+    for layouts in LAYOUTS.values():
+        for box in layouts[kind].boxes if kind in layouts else ():
+            if box.field == field:
+                yield box
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+EPS Backend Web - Link Checker
+Finds every URL in the training material and checks that it still resolves:
+- Deck specs: slide text fields and raw-slide hyperlinks
+  (scheme-less "laravel.com/docs" in slide text counts as a link)
+- .pptx decks: slide text and external hyperlink relationships
+- Markdown guides and reference.txt: every http(s) URL
+URLs are collected in one pass, de-duplicated, then checked concurrently
+with asyncio (CONCURRENCY requests in flight, PER_HOST per host). Each URL
+gets a HEAD request, falling back to GET when the server refuses HEAD,
+and redirects are followed. Results are cached on disk for LINK_TTL
+(FAILED_TTL for broken links) so repeated runs only hit the network for
+new or expired URLs.
+
+Usage:
+    python deck_links.py [paths ...] [--refresh] [--ignore HOST ...] [--json]
+"""
+
+import argparse
+import glob
+import json
+import marshal
+import os
+import re
+import sys
+import time
+import zlib
+
+from deck_cache import CACHE_DIR
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+LINK_CACHE_PATH = os.path.join(CACHE_DIR, "link_results.bin")
+LINK_FORMAT = 1
+LINK_TTL = 24 * 3600
+FAILED_TTL = 3600
+
+CONCURRENCY = 16
+PER_HOST = 2
+TIMEOUT = 10.0
+MAX_REDIRECTS = 5
+USER_AGENT = "eps-decks-linkcheck/1.0"
+
+URL = re.compile(r"https?://[^\s<>\"'`|\\]+", re.IGNORECASE)
+# Scheme-less links as trainers write them on slides ("laravel.com/docs", "www.php.net")
+BARE_URL = re.compile(r"(?<![\w@./:=-])(?:www\.)?(?:[a-z0-9-]+\.)+(?:com|org|net|io|dev|be|ly)(?:/[^\s<>\"'`|\\]*)?"
+                      r"|https?://[^\s<>\"'`|\\]+", re.IGNORECASE)
+TRAILING = ".,;:!?'\""
+# Local services from the guides, and internal EPS deployments not reachable from outside
+IGNORED_HOSTS = {"localhost", "127.0.0.1", "0.0.0.0", "local.eps.com", "keycloak.eps.gov.my", "eps-frontend.gov.my"}
+IGNORED_SUFFIXES = (".local", ".test", ".localhost")
+# Fields whose text is code, where only explicit http(s) URLs count
+CODE_FIELDS = {"code_snippet"}
+
+def default_sources():
+    """Return the deck specs, guides and reference.txt shipped in references/"""
+    return (sorted(glob.glob(os.path.join(HERE, "decks", "*.yaml"))) + sorted(glob.glob(os.path.join(HERE, "*.md")))
+            + [os.path.join(HERE, "reference.txt")])
+
+# ============ EXTRACTION ============
+
+def clean_url(url):
+    """Strip punctuation and unbalanced brackets that end a sentence, not the URL"""
+    url = url.rstrip(TRAILING)
+    while url.endswith(")") and url.count(")") > url.count("("):
+        url = url[:-1].rstrip(TRAILING)
+    while url.endswith("]") and url.count("]") > url.count("["):
+        url = url[:-1].rstrip(TRAILING)
+    if not url.lower().startswith(("http://", "https://")):
+        url = "https://" + url
+    return url
+
+def find_urls(text, bare=False):
+    """Return the URLs in a piece of text"""
+    return [clean_url(match.group(0)) for match in (BARE_URL if bare else URL).finditer(text)]
+
+def extract_spec(path):
+    """Yield (url, location) from a deck spec's slides"""
+    from deck_spec import load_deck_spec
+
+    spec = load_deck_spec(path)
+    where = os.path.relpath(path)
+    for slide in spec.slides:
+        for name, value in slide.fields.items():
+            if name == "rels":
+                for rel in value.values():
+                    if rel["type"] == "hyperlink":
+                        yield rel["target"], f"{where}: slide {slide.index} (hyperlink)"
+                continue
+            for text in value if isinstance(value, list) else [value]:
+                if isinstance(text, str):
+                    for url in find_urls(text, bare=slide.kind != "raw" and name not in CODE_FIELDS):
+                        yield url, f"{where}: slide {slide.index}"
+
+def extract_deck(path):
+    """Yield (url, location) from a .pptx deck's slide text and hyperlinks"""
+    from deck_package import RT_HYPERLINK, open_package, read_rels, slide_part_names, slide_text
+
+    where = os.path.relpath(path)
+    with open_package(path) as zf:
+        for i, part in enumerate(slide_part_names(zf), start=1):
+            for rel_type, target, mode in read_rels(zf, part).values():
+                if rel_type == RT_HYPERLINK and mode == "External":
+                    yield target, f"{where}: slide {i} (hyperlink)"
+            for shape in slide_text(zf, part):
+                for text in shape:
+                    for url in find_urls(text, bare=True):
+                        yield url, f"{where}: slide {i}"
+
+def extract_text(path):
+    """Yield (url, location) from a markdown or plain-text file"""
+    where = os.path.relpath(path)
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, start=1):
+            for url in find_urls(line):
+                yield url, f"{where}:{number}"
+
+def collect_links(paths, ignored=IGNORED_HOSTS):
+    """Return ({url: [locations]}, skipped count) for every checkable URL in the files"""
+    from urllib.parse import urlsplit
+
+    links = {}
+    skipped = 0
+    for path in paths:
+        lower = path.lower()
+        if lower.endswith((".yaml", ".yml")):
+            found = extract_spec(path)
+        elif lower.endswith(".pptx"):
+            found = extract_deck(path)
+        else:
+            found = extract_text(path)
+        for url, location in found:
+            if not url.lower().startswith(("http://", "https://")):
+                continue
+            try:
+                host = (urlsplit(url).hostname or "").lower()
+            except ValueError:
+                host = ""
+            if not host or host in ignored or host.endswith(IGNORED_SUFFIXES) or any(c in url for c in "*{}"):
+                skipped += 1
+                continue
+            links.setdefault(url, []).append(location)
+    return links, skipped
+
+# ============ CHECKING ============
+
+def load_link_cache(path=LINK_CACHE_PATH):
+    """Return the cached {url: (checked at, status, final url, error)}"""
+    try:
+        with open(path, "rb") as f:
+            version, results = marshal.loads(zlib.decompress(f.read()))
+    except (OSError, ValueError, EOFError, zlib.error):
+        return {}
+    return results if version == LINK_FORMAT else {}
+
+def save_link_cache(results, path=LINK_CACHE_PATH):
+    """Write link results atomically"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(zlib.compress(marshal.dumps((LINK_FORMAT, results)), 1))
+    os.replace(tmp, path)
+
+def is_broken(result):
+    """Return True for a result that failed or answered with an error status"""
+    _, status, _, error = result
+    return bool(error) or not 200 <= status < 400
+
+def is_fresh(result, now):
+    """Return True while a cached result is within its TTL"""
+    return now - result[0] < (FAILED_TTL if is_broken(result) else LINK_TTL)
+
+async def _request(url, method, timeout, ssl_context):
+    """Send one request; return (status, {header: value}) from the response head"""
+    import asyncio
+    from urllib.parse import quote, urlsplit
+
+    parts = urlsplit(url)
+    secure = parts.scheme.lower() == "https"
+    host = parts.hostname
+    port = parts.port or (443 if secure else 80)
+    target = quote(parts.path or "/", safe="/%:@!$&'()*+,;=~-._")
+    if parts.query:
+        target += "?" + quote(parts.query, safe="/%:@!$&'()*+,;=?~-._")
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection(host, port, ssl=ssl_context if secure else None,
+                                server_hostname=host if secure else None), timeout)
+    try:
+        writer.write((f"{method} {target} HTTP/1.1\r\nHost: {parts.netloc.rsplit('@', 1)[-1]}\r\n"
+                      f"User-Agent: {USER_AGENT}\r\nAccept: */*\r\nConnection: close\r\n\r\n").encode("ascii"))
+        await writer.drain()
+        status_line = await asyncio.wait_for(reader.readline(), timeout)
+        fields = status_line.split(None, 2)
+        if len(fields) < 2 or not fields[0].startswith(b"HTTP/") or not fields[1].isdigit():
+            raise ConnectionError(f"bad response {status_line[:40]!r}")
+        headers = {}
+        while True:
+            line = await asyncio.wait_for(reader.readline(), timeout)
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        return int(fields[1]), headers
+    finally:
+        writer.close()
+
+async def check_url(url, limits, timeout, ssl_context):
+    """Return (checked at, status, final url, error), following redirects with HEAD then GET"""
+    import asyncio
+    from urllib.parse import urljoin, urlsplit
+
+    current = url
+    status = 0
+    try:
+        for _ in range(MAX_REDIRECTS + 1):
+            host = (urlsplit(current).hostname or "").lower()
+            async with limits["all"], limits["hosts"].setdefault(host, asyncio.Semaphore(limits["per_host"])):
+                status, headers = await _request(current, "HEAD", timeout, ssl_context)
+                if status >= 400:
+                    # Plenty of servers reject or mishandle HEAD but serve the page
+                    status, headers = await _request(current, "GET", timeout, ssl_context)
+            if status in (301, 302, 303, 307, 308) and headers.get("location"):
+                current = urljoin(current, headers["location"])
+                continue
+            return time.time(), status, current, ""
+        return time.time(), status, current, f"more than {MAX_REDIRECTS} redirects"
+    except asyncio.TimeoutError:
+        return time.time(), status, current, f"timed out after {timeout:g}s"
+    except (OSError, ConnectionError, UnicodeError, ValueError) as e:
+        return time.time(), status, current, str(e) or type(e).__name__
+
+async def check_urls(urls, concurrency=CONCURRENCY, per_host=PER_HOST, timeout=TIMEOUT):
+    """Return {url: result} for URLs checked concurrently"""
+    import asyncio
+    import ssl
+
+    limits = {"all": asyncio.Semaphore(concurrency), "hosts": {}, "per_host": per_host}
+    ssl_context = ssl.create_default_context()
+    results = await asyncio.gather(*(check_url(url, limits, timeout, ssl_context) for url in urls))
+    return dict(zip(urls, results))
+
+def check_links(urls, refresh=False, cache_path=LINK_CACHE_PATH, **options):
+    """Return ({url: result}, URLs fetched), reusing fresh cached results"""
+    import asyncio
+
+    now = time.time()
+    cache = load_link_cache(cache_path)
+    results = {}
+    stale = []
+    for url in urls:
+        cached = cache.get(url)
+        if cached is not None and not refresh and is_fresh(cached, now):
+            results[url] = cached
+        else:
+            stale.append(url)
+    if stale:
+        results.update(asyncio.run(check_urls(stale, **options)))
+        cache.update((url, results[url]) for url in stale)
+        cache = {url: result for url, result in cache.items() if is_fresh(result, now)}
+        save_link_cache(cache, cache_path)
+    return results, len(stale)
+
+def describe(result):
+    """Return a short status text for a result"""
+    _, status, final, error = result
+    if error:
+        return f"{error}" + (f" (last status {status})" if status else "")
+    return f"HTTP {status}"
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Check the URLs in deck specs, decks and guides")
+    parser.add_argument("paths", nargs="*", help="Specs, .pptx decks or text files (default: decks/*.yaml, *.md, "
+                                                 "reference.txt)")
+    parser.add_argument("--refresh", action="store_true", help="Ignore cached results")
+    parser.add_argument("--ignore", action="append", default=[], metavar="HOST", help="Host to skip (repeatable)")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY, help="Requests in flight")
+    parser.add_argument("--per-host", type=int, default=PER_HOST, help="Requests in flight per host")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT, help="Seconds per connect or read")
+    parser.add_argument("--json", action="store_true", help="Print every result as JSON")
+    args = parser.parse_args()
+
+    from deck_spec import SpecError
+
+    started = time.perf_counter()
+    try:
+        links, skipped = collect_links(args.paths or default_sources(),
+                                       IGNORED_HOSTS | {host.lower() for host in args.ignore})
+    except (OSError, SpecError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    results, fetched = check_links(list(links), refresh=args.refresh, concurrency=args.concurrency,
+                                   per_host=args.per_host, timeout=args.timeout)
+    elapsed = time.perf_counter() - started
+    broken = [url for url in links if is_broken(results[url])]
+
+    if args.json:
+        print(json.dumps([{"url": url, "ok": not is_broken(results[url]), "status": results[url][1],
+                           "final_url": results[url][2], "error": results[url][3], "locations": locations}
+                          for url, locations in links.items()], indent=1, ensure_ascii=False))
+    else:
+        for url in broken:
+            print(f"✗ {url}: {describe(results[url])}")
+            for location in links[url]:
+                print(f"     {location}")
+        for url in links:
+            final = results[url][2]
+            if not is_broken(results[url]) and final.rstrip("/") != url.rstrip("/"):
+                print(f"→ {url} redirects to {final}")
+        print(f"{'✗' if broken else '✓'} {len(broken)} broken of {len(links)} URL(s) "
+              f"({fetched} checked, {len(links) - fetched} cached, {skipped} local skipped, {elapsed:.1f}s)")
+    sys.exit(1 if broken else 0)
+
+if __name__ == "__main__":
+    main()
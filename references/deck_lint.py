@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+EPS Backend Web - Deck Content Linter
+Checks the slide model of deck specs before anything is rendered:
+- empty-list:      a bullet list with no text in it
+- bare-bullet:     an item that is only a bullet marker ("• ")
+- mixed-bullets:   one list using different markers ("• " and "✓ ")
+- too-many-bullets: more items than fit on a slide (--max-bullets)
+- long-code:       code snippets over --max-code-lines lines
+- wide-code:       code lines wider than the code box (--max-code-width)
+- missing-title:   a slide without a title
+- duplicate-title: the same title on several slides of a deck
+Every rule runs in one pass over the slides. Per-slide results are cached
+by slide digest (and rule settings), so re-linting an edited deck only
+re-checks the slides that changed.
+
+Usage:
+    python deck_lint.py [specs ...] [--max-bullets 10] [--disable long-code ...] [--json]
+"""
+
+import argparse
+import glob
+import json
+import marshal
+import os
+import sys
+import time
+import zlib
+
+from deck_cache import CACHE_DIR, cache_key
+from deck_layout import field_boxes
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+LINT_CACHE_PATH = os.path.join(CACHE_DIR, "lint_results.bin")
+LINT_FORMAT = 1
+MAX_CACHED_SLIDES = 50000
+
+# Defaults fill the tightest box of any style (deck_layout): single-line bullets in a content
+# slide body, and lines and characters of 9pt Courier in the 9 x 5.4in code box
+MAX_BULLETS = min(box.line_capacity() for box in field_boxes("content", "content_list"))
+MAX_CODE_LINES = min(box.line_capacity() for box in field_boxes("code", "code_snippet"))
+MAX_CODE_WIDTH = min(box.column_capacity() for box in field_boxes("code", "code_snippet"))
+BULLETS = "•✓✗→▪◦-*"
+
+def default_specs():
+    """Return the deck specs shipped in references/decks"""
+    return sorted(glob.glob(os.path.join(HERE, "decks", "*.yaml")))
+
+# ============ RULES ============
+
+def _lists(slide):
+    """Yield (field name, items) for every bullet list of a slide"""
+    for name, value in slide.fields.items():
+        if isinstance(value, list):
+            yield name, value
+
+def _marker(item):
+    """Return the bullet marker of a top-level item, or None"""
+    if len(item) > 1 and item[0] in BULLETS and item[1] == " ":
+        return item[0]
+    return None
+
+def check_lists(slide, limits):
+    """Yield (rule, message) for empty, bare, mixed and overlong bullet lists"""
+    for name, items in _lists(slide):
+        lines = [item for item in items if item.strip()]
+        if not lines:
+            yield "empty-list", f"{name} has no text"
+            continue
+        for item in lines:
+            text = item.strip()
+            if len(text) == 1 and text in BULLETS:
+                yield "bare-bullet", f"{name} has an item with only {text!r}"
+        markers = {}
+        for item in lines:
+            marker = _marker(item)
+            if marker:
+                markers[marker] = markers.get(marker, 0) + 1
+        if len(markers) > 1:
+            used = ", ".join(f'{n} "{marker} "' for marker, n in markers.items())
+            yield "mixed-bullets", f"{name} mixes bullet markers ({used})"
+        if len(lines) > limits["max_bullets"]:
+            yield "too-many-bullets", f"{name} has {len(lines)} items (limit {limits['max_bullets']})"
+
+def check_code(slide, limits):
+    """Yield (rule, message) for code snippets that overflow the code box"""
+    code = slide.fields.get("code_snippet")
+    if code is None:
+        return
+    lines = code.splitlines()
+    if len(lines) > limits["max_code_lines"]:
+        yield "long-code", f"code_snippet has {len(lines)} lines (limit {limits['max_code_lines']})"
+    wide = [n for n, line in enumerate(lines, start=1) if len(line.expandtabs(4)) > limits["max_code_width"]]
+    if wide:
+        yield "wide-code", (f"code_snippet line(s) {', '.join(map(str, wide[:5]))} exceed "
+                            f"{limits['max_code_width']} characters")
+
+def check_title(slide, limits):
+    """Yield (rule, message) for slides without a title"""
+    if slide.kind != "raw" and not slide.title.strip():
+        yield "missing-title", "slide has no title"
+
+# Rules applied to each slide on its own (deck-wide rules run in lint_spec)
+SLIDE_RULES = (check_lists, check_code, check_title)
+RULES = ("empty-list", "bare-bullet", "mixed-bullets", "too-many-bullets", "long-code", "wide-code",
+         "missing-title", "duplicate-title")
+
+def _title_key(title):
+    """Return a title normalised for duplicate detection"""
+    return " ".join(title.casefold().split())
+
+# ============ LINTING ============
+
+def load_lint_cache(settings_key, path=LINT_CACHE_PATH):
+    """Return the cached {slide digest: [(rule, message)]} for these rule settings"""
+    try:
+        with open(path, "rb") as f:
+            version, cached_settings, slides = marshal.loads(zlib.decompress(f.read()))
+    except (OSError, ValueError, EOFError, zlib.error):
+        return {}
+    return slides if (version, cached_settings) == (LINT_FORMAT, settings_key) else {}
+
+def save_lint_cache(settings_key, slides, path=LINT_CACHE_PATH):
+    """Write per-slide results atomically"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(zlib.compress(marshal.dumps((LINT_FORMAT, settings_key, slides)), 1))
+    os.replace(tmp, path)
+
+def lint_spec(spec, limits, cache):
+    """Return ([(slide index, rule, message)], slides checked) in one pass, reusing cached slide results"""
+    findings = []
+    titles = {}
+    checked = 0
+    for slide in spec.slides:
+        results = cache.get(slide.digest)
+        if results is None:
+            results = [result for rule in SLIDE_RULES for result in rule(slide, limits)]
+            cache[slide.digest] = results
+            checked += 1
+        findings.extend((slide.index, rule, message) for rule, message in results)
+        if slide.title.strip():
+            titles.setdefault(_title_key(slide.title), []).append(slide.index)
+    for indexes in titles.values():
+        for index in indexes[1:]:
+            findings.append((index, "duplicate-title", f"same title as slide {indexes[0]}"))
+    findings.sort(key=lambda finding: finding[0])
+    return findings, checked
+
+def lint_specs(specs, limits, disabled=(), cache_path=LINT_CACHE_PATH):
+    """Return ({spec: findings}, slides checked) for DeckSpecs"""
+    settings_key = cache_key("lint", LINT_FORMAT, BULLETS, sorted(limits.items()))
+    cache = load_lint_cache(settings_key, cache_path)
+    report = {}
+    checked = 0
+    for spec in specs:
+        findings, count = lint_spec(spec, limits, cache)
+        report[spec] = [finding for finding in findings if finding[1] not in disabled]
+        checked += count
+    if checked:
+        if len(cache) > MAX_CACHED_SLIDES:
+            cache = {slide.digest: cache[slide.digest] for spec in specs for slide in spec.slides}
+        save_lint_cache(settings_key, cache, cache_path)
+    return report, checked
+
+def main():
+    """Main execution"""
+    from deck_spec import SpecError, load_deck_spec
+
+    parser = argparse.ArgumentParser(description="Lint deck spec content before rendering")
+    parser.add_argument("specs", nargs="*", help="Deck specs (default: decks/*.yaml)")
+    parser.add_argument("--max-bullets", type=int, default=MAX_BULLETS, help="Items allowed in one list")
+    parser.add_argument("--max-code-lines", type=int, default=MAX_CODE_LINES, help="Lines allowed in a code snippet")
+    parser.add_argument("--max-code-width", type=int, default=MAX_CODE_WIDTH, help="Characters allowed per code line")
+    parser.add_argument("--disable", action="append", default=[], choices=RULES, metavar="RULE",
+                        help="Rule to skip (repeatable)")
+    parser.add_argument("--json", action="store_true", help="Print the findings as JSON")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    specs = []
+    failed = False
+    for path in args.specs or default_specs():
+        try:
+            specs.append(load_deck_spec(path))
+        except (OSError, SpecError) as e:
+            failed = True
+            print(f"✗ {e}")
+    limits = {"max_bullets": args.max_bullets, "max_code_lines": args.max_code_lines,
+              "max_code_width": args.max_code_width}
+    report, checked = lint_specs(specs, limits, set(args.disable))
+    elapsed = (time.perf_counter() - started) * 1000
+    total = sum(len(findings) for findings in report.values())
+
+    if args.json:
+        print(json.dumps([{"spec": os.path.relpath(spec.path), "slide": index, "rule": rule, "message": message}
+                          for spec, findings in report.items() for index, rule, message in findings],
+                         indent=1, ensure_ascii=False))
+    else:
+        for spec, findings in report.items():
+            for index, rule, message in findings:
+                title = spec.slides[index - 1].title
+                print(f"{os.path.relpath(spec.path)}: slide {index} ({title[:40]!r}) [{rule}] {message}")
+        slides = sum(len(spec) for spec in specs)
+        print(f"{'✗' if total else '✓'} {total} problem(s) in {slides} slides of {len(specs)} deck(s) "
+              f"({checked} slide(s) re-checked, {elapsed:.1f} ms)")
+    sys.exit(1 if total or failed else 0)
+
+if __name__ == "__main__":
+    main()
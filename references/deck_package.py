@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+EPS Backend Web - PPTX Package Reader
+Lightweight, streaming access to .pptx (OOXML) packages without python-pptx:
+- Slide order from presentation.xml and its relationships
+- Per-part relationship tables
+- Slide text extracted with iterparse
+"""
+
+import posixpath
+import xml.etree.ElementTree as ET
+
+NS_A = "http://schemas.openxmlformats.org/drawingml/2006/main"
+NS_P = "http://schemas.openxmlformats.org/presentationml/2006/main"
+NS_R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+NS_REL = "http://schemas.openxmlformats.org/package/2006/relationships"
+NS_CT = "http://schemas.openxmlformats.org/package/2006/content-types"
+NS_P14 = "http://schemas.microsoft.com/office/powerpoint/2010/main"
+
+RT_SLIDE = NS_R + "/slide"
+RT_SLIDE_LAYOUT = NS_R + "/slideLayout"
+RT_NOTES_SLIDE = NS_R + "/notesSlide"
+RT_HYPERLINK = NS_R + "/hyperlink"
+
+PRESENTATION_PART = "ppt/presentation.xml"
+CONTENT_TYPES_PART = "[Content_Types].xml"
+
+# presentation.xml extension that holds PowerPoint sections (p14:sectionLst)
+EXT_SECTION_LIST = "{521415D9-36F7-43E2-AB2F-B90AF26B5E84}"
+
+TAG_PARAGRAPH = f"{{{NS_A}}}p"
+TAG_TEXT = f"{{{NS_A}}}t"
+TAG_BREAK = f"{{{NS_A}}}br"
+
+# Top-level shape elements inside a slide's p:spTree
+SHAPE_TAGS = {f"{{{NS_P}}}{name}" for name in ("sp", "pic", "graphicFrame", "grpSp", "cxnSp", "contentPart")}
+
+def rels_part_name(part_name):
+    """Return the relationships part name for a part"""
+    directory, filename = posixpath.split(part_name)
+    return posixpath.join(directory, "_rels", filename + ".rels")
+
+def resolve_target(source_part, target):
+    """Resolve a relationship target relative to its source part"""
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join(posixpath.dirname(source_part), target))
+
+def relative_target(source_part, target_part):
+    """Return the relationship target of target_part as seen from source_part"""
+    return posixpath.relpath(target_part, posixpath.dirname(source_part))
+
+def read_rels(zf, part_name):
+    """Return {rId: (type, target part name or URL, target mode)} for a part"""
+    try:
+        data = zf.read(rels_part_name(part_name))
+    except KeyError:
+        return {}
+    rels = {}
+    for rel in ET.fromstring(data).iter(f"{{{NS_REL}}}Relationship"):
+        mode = rel.get("TargetMode", "Internal")
+        target = rel.get("Target")
+        if mode != "External":
+            target = resolve_target(part_name, target)
+        rels[rel.get("Id")] = (rel.get("Type"), target, mode)
+    return rels
+
+def slide_part_names(zf):
+    """Return the slide part names in presentation order"""
+    rels = read_rels(zf, PRESENTATION_PART)
+    order = []
+    for event, elem in ET.iterparse(zf.open(PRESENTATION_PART), events=("end",)):
+        if elem.tag == f"{{{NS_P}}}sldId":
+            order.append(rels[elem.get(f"{{{NS_R}}}id")][1])
+        elif elem.tag == f"{{{NS_P}}}sldIdLst":
+            break
+    return order
+
+def paragraph_texts(elem):
+    """Return the text of each a:p paragraph below an element"""
+    texts = []
+    for p in elem.iter(TAG_PARAGRAPH):
+        texts.append("".join(
+            (node.text or "") if node.tag == TAG_TEXT else "\v"
+            for node in p.iter() if node.tag in (TAG_TEXT, TAG_BREAK)
+        ))
+    return texts
+
+def iter_slide_shapes(zf, part_name):
+    """Yield each top-level shape element of a slide as it is parsed
+
+    Elements are cleared after the consumer resumes, so callers must copy
+    anything they need before asking for the next shape.
+    """
+    depth = 0
+    tree_depth = None
+    for event, elem in ET.iterparse(zf.open(part_name), events=("start", "end")):
+        if event == "start":
+            depth += 1
+            if elem.tag == f"{{{NS_P}}}spTree":
+                tree_depth = depth
+            continue
+        if tree_depth is not None and depth == tree_depth + 1 and elem.tag in SHAPE_TAGS:
+            yield elem
+            elem.clear()
+        depth -= 1
+
+def slide_text(zf, part_name):
+    """Return the paragraphs of every shape on a slide as a list of lists"""
+    return [paragraph_texts(shape) for shape in iter_slide_shapes(zf, part_name)]
+
+def notes_text(zf, rels):
+    """Return the paragraphs of a slide's speaker notes, given the slide's rels"""
+    for rel_type, target, mode in rels.values():
+        if rel_type == RT_NOTES_SLIDE and mode != "External":
+            texts = []
+            for sp in ET.fromstring(zf.read(target)).iter(f"{{{NS_P}}}sp"):
+                ph = sp.find(f".//{{{NS_P}}}ph")
+                if ph is not None and ph.get("type") == "body":
+                    texts.extend(paragraph_texts(sp))
+            return texts
+    return []
+
+def open_package(path):
+    """Open a .pptx file as a zip package"""
+    import zipfile
+
+    return zipfile.ZipFile(path)
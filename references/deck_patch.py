@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+"""
+EPS Backend Web - In-place Slide Patching
+Corrects individual slides of hand-maintained decks (eps_tot_training.pptx,
+laravel_tot_eps.pptx) without re-saving the whole package through python-pptx:
+- Opens the .pptx lazily (only presentation.xml, its rels and content types)
+- Replaces, inserts or deletes slides using the add_*_slide kinds
+  (title, content, two_column, code) of the generator scripts
+- Keeps PowerPoint sections in step with inserted and deleted slides
+- Keeps agenda entries ("... — slide N") in step too: linked entries get
+  their target's new number, entries whose target was deleted lose both
+  the link and the number
+- Rewrites only the affected zip entries and stream-copies everything else
+
+Usage: python deck_patch.py deck.pptx operations.json [-o patched.pptx] [--style tot]
+
+operations.json is a list such as:
+    [{"op": "replace", "index": 5, "kind": "content",
+      "args": {"title": "Course Overview", "content_list": ["• ..."]}},
+     {"op": "insert", "index": 6, "kind": "code",
+      "args": {"title": "Example", "code_snippet": "<?php ..."}},
+     {"op": "delete", "index": 12}]
+Slide indexes are 1-based and refer to the deck as left by the previous operation.
+"""
+
+import argparse
+import json
+import os
+import posixpath
+import re
+import shutil
+import zipfile
+
+from deck_package import (
+    CONTENT_TYPES_PART, NS_A, NS_CT, NS_P, NS_P14, NS_R, NS_REL, PRESENTATION_PART, RT_NOTES_SLIDE, RT_SLIDE,
+    RT_SLIDE_LAYOUT, rels_part_name, relative_target, resolve_target,
+)
+from deck_spec import AGENDA_NUMBER, STYLES, slide_helper
+
+CT_SLIDE = "application/vnd.openxmlformats-officedocument.presentationml.slide+xml"
+APP_PROPERTIES_PART = "docProps/app.xml"
+
+class DeckPatcher:
+    """A .pptx package with pending slide replacements, insertions and deletions"""
+
+    def __init__(self, path, style="tot"):
+        self.path = path
+        self.style = style
+        self._zip = zipfile.ZipFile(path)
+        self._loaded = False
+        self._written = {}   # part name -> bytes to write
+        self._removed = set()
+        self._layout = None
+        self._reordered = False     # slides were inserted or deleted: agenda numbers need updating
+
+    # ============ LAZY PACKAGE STATE ============
+
+    def _load(self):
+        """Parse presentation.xml, its relationships and the content types"""
+        if self._loaded:
+            return
+        from lxml import etree
+
+        self._presentation = etree.fromstring(self._zip.read(PRESENTATION_PART))
+        self._pres_rels = etree.fromstring(self._zip.read(rels_part_name(PRESENTATION_PART)))
+        self._content_types = etree.fromstring(self._zip.read(CONTENT_TYPES_PART))
+        self._names = set(self._zip.namelist())
+        self._loaded = True
+
+    def _sld_id_list(self):
+        """Return the p:sldIdLst element, creating it if missing"""
+        lst = self._presentation.find(f"{{{NS_P}}}sldIdLst")
+        if lst is None:
+            from lxml import etree
+
+            lst = etree.Element(f"{{{NS_P}}}sldIdLst")
+            self._presentation.find(f"{{{NS_P}}}sldMasterIdLst").addnext(lst)
+        return lst
+
+    def _slide_rel(self, sld_id):
+        """Return the presentation relationship element of a p:sldId"""
+        rid = sld_id.get(f"{{{NS_R}}}id")
+        for rel in self._pres_rels:
+            if rel.get("Id") == rid:
+                return rel
+        raise KeyError(rid)
+
+    def _slide_part(self, index):
+        """Return (sldId element, slide part name) for a 1-based slide index"""
+        lst = self._sld_id_list()
+        if not 1 <= index <= len(lst):
+            raise IndexError(f"Slide {index} out of range (deck has {len(lst)} slides)")
+        sld_id = lst[index - 1]
+        return sld_id, posixpath.normpath(posixpath.join("ppt", self._slide_rel(sld_id).get("Target")))
+
+    def _section_entry(self, slide_id):
+        """Return the p14:sldId entry of a slide in the section list, or None"""
+        for entry in self._presentation.iter(f"{{{NS_P14}}}sldId"):
+            if entry.get("id") == slide_id:
+                return entry
+        return None
+
+    def _remove_from_sections(self, slide_id):
+        """Drop a slide from its PowerPoint section, and the section once it is empty"""
+        entry = self._section_entry(slide_id)
+        if entry is None:
+            return
+        ids = entry.getparent()
+        ids.remove(entry)
+        if len(ids) == 0:
+            section = ids.getparent()
+            section.getparent().remove(section)
+
+    def _add_to_sections(self, slide_id, after_id):
+        """Put a new slide into the section of the slide it follows (or the first section)"""
+        from lxml import etree
+
+        if after_id is not None:
+            entry = self._section_entry(after_id)
+            if entry is not None:
+                entry.addnext(etree.Element(f"{{{NS_P14}}}sldId", id=slide_id))
+                return
+        ids = next(self._presentation.iter(f"{{{NS_P14}}}sldIdLst"), None)
+        if ids is not None:
+            ids.insert(0, etree.Element(f"{{{NS_P14}}}sldId", id=slide_id))
+
+    def _exists(self, name):
+        """Return True if a part exists in the patched package"""
+        return name not in self._removed and (name in self._names or name in self._written)
+
+    def _read(self, name):
+        """Return the current bytes of a part"""
+        if name in self._written:
+            return self._written[name]
+        return self._zip.read(name)
+
+    def _unique_part_name(self, template):
+        """Return the first free part name for a template such as ppt/slides/slide{}.xml"""
+        n = 1
+        while self._exists(template.format(n)) or template.format(n) in self._removed:
+            n += 1
+        return template.format(n)
+
+    def _set_override(self, part_name, content_type):
+        """Add or update the content-type override for a part"""
+        from lxml import etree
+
+        for override in self._content_types.iter(f"{{{NS_CT}}}Override"):
+            if override.get("PartName") == "/" + part_name:
+                override.set("ContentType", content_type)
+                return
+        etree.SubElement(self._content_types, f"{{{NS_CT}}}Override",
+                         PartName="/" + part_name, ContentType=content_type)
+
+    def _remove_override(self, part_name):
+        """Drop the content-type override for a part"""
+        for override in list(self._content_types.iter(f"{{{NS_CT}}}Override")):
+            if override.get("PartName") == "/" + part_name:
+                self._content_types.remove(override)
+
+    def _ensure_default(self, extension, content_type):
+        """Register a default content type for a file extension"""
+        from lxml import etree
+
+        for default in self._content_types.iter(f"{{{NS_CT}}}Default"):
+            if default.get("Extension", "").lower() == extension.lower():
+                return
+        self._content_types.insert(0, etree.Element(
+            f"{{{NS_CT}}}Default", Extension=extension, ContentType=content_type))
+
+    def _blank_layout(self):
+        """Return the part name of the deck's blank layout (or its first layout)"""
+        from lxml import etree
+
+        if self._layout is not None:
+            return self._layout
+        layouts = sorted(
+            (n for n in self._names if re.match(r"ppt/slideLayouts/slideLayout\d+\.xml$", n)),
+            key=lambda n: int(re.search(r"(\d+)\.xml$", n).group(1)),
+        )
+        self._layout = layouts[0]
+        for name in layouts:
+            if etree.fromstring(self._zip.read(name)).get("type") == "blank":
+                self._layout = name
+                break
+        return self._layout
+
+    def _slide_size(self):
+        """Return (cx, cy) of the deck's slides in EMU"""
+        size = self._presentation.find(f"{{{NS_P}}}sldSz")
+        return int(size.get("cx")), int(size.get("cy"))
+
+    # ============ RENDERING ============
+
+    def _part_rels(self, part_name):
+        """Return [(rId, type, resolved target, external)] for a part as currently staged"""
+        import xml.etree.ElementTree as ET
+
+        name = rels_part_name(part_name)
+        if not self._exists(name):
+            return []
+        rels = []
+        for rel in ET.fromstring(self._read(name)).iter(f"{{{NS_REL}}}Relationship"):
+            external = rel.get("TargetMode") == "External"
+            target = rel.get("Target") if external else resolve_target(part_name, rel.get("Target"))
+            rels.append((rel.get("Id"), rel.get("Type"), target, external))
+        return rels
+
+    def _render(self, part_name, kind, args, keep_rels=()):
+        """Render one slide with a generator helper and stage it as part_name"""
+        from pptx import Presentation
+
+        prs = Presentation()
+        prs.slide_width, prs.slide_height = self._slide_size()
+        slide_helper(self.style, kind)(prs, **args)
+        slide_part = prs.slides[0].part
+
+        # Rendered rIds are kept so the slide XML needs no rewriting
+        entries = []
+        for rel in slide_part.rels.values():
+            if rel.reltype == RT_SLIDE_LAYOUT:
+                entries.append((rel.rId, rel.reltype, self._blank_layout(), False))
+            elif rel.is_external:
+                entries.append((rel.rId, rel.reltype, rel.target_ref, True))
+            else:
+                target = rel.target_part
+                ext = posixpath.splitext(str(target.partname))[1]
+                media_name = self._unique_part_name("ppt/media/media{}" + ext)
+                self._written[media_name] = target.blob
+                self._ensure_default(ext.lstrip("."), target.content_type)
+                entries.append((rel.rId, rel.reltype, media_name, False))
+
+        used = {rid for rid, _, _, _ in entries}
+        n = 1
+        for rel_type, target in keep_rels:
+            while f"rId{n}" in used:
+                n += 1
+            used.add(f"rId{n}")
+            entries.append((f"rId{n}", rel_type, target, False))
+
+        self._written[part_name] = slide_part.blob
+        self._written[rels_part_name(part_name)] = _rels_xml(part_name, entries)
+        self._set_override(part_name, CT_SLIDE)
+
+    # ============ OPERATIONS ============
+
+    def replace_slide(self, index, kind, **args):
+        """Replace slide `index` with a freshly rendered slide, keeping its notes"""
+        self._load()
+        _, part_name = self._slide_part(index)
+        old_rels = self._part_rels(part_name)
+        keep = [(rel_type, target) for _, rel_type, target, external in old_rels
+                if rel_type == RT_NOTES_SLIDE and not external]
+        self._render(part_name, kind, args, keep)
+        self._drop_orphan_media(old_rels)
+
+    def insert_slide(self, index, kind, **args):
+        """Insert a rendered slide so that it becomes slide `index`"""
+        from lxml import etree
+
+        self._load()
+        lst = self._sld_id_list()
+        if not 1 <= index <= len(lst) + 1:
+            raise IndexError(f"Cannot insert at {index} (deck has {len(lst)} slides)")
+        part_name = self._unique_part_name("ppt/slides/slide{}.xml")
+        self._render(part_name, kind, args)
+
+        rids = {rel.get("Id") for rel in self._pres_rels}
+        n = 1
+        while f"rId{n}" in rids:
+            n += 1
+        etree.SubElement(self._pres_rels, f"{{{NS_REL}}}Relationship",
+                         Id=f"rId{n}", Type=RT_SLIDE, Target=relative_target(PRESENTATION_PART, part_name))
+        next_id = max([int(s.get("id")) for s in lst] + [255]) + 1
+        sld_id = etree.Element(f"{{{NS_P}}}sldId", id=str(next_id))
+        sld_id.set(f"{{{NS_R}}}id", f"rId{n}")
+        lst.insert(index - 1, sld_id)
+        self._reordered = True
+        self._add_to_sections(str(next_id), lst[index - 2].get("id") if index > 1 else None)
+
+    def _unlink_slide(self, index):
+        """Remove slide `index`, its notes and its section entry; return its relationships"""
+        sld_id, part_name = self._slide_part(index)
+        self._pres_rels.remove(self._slide_rel(sld_id))
+        self._sld_id_list().remove(sld_id)
+        self._reordered = True
+        self._remove_from_sections(sld_id.get("id"))
+
+        rels = self._part_rels(part_name)
+        for _, rel_type, target, external in rels:
+            if rel_type == RT_NOTES_SLIDE and not external:
+                self._drop_part(target)
+                self._drop_part(rels_part_name(target))
+        self._drop_part(part_name)
+        self._drop_part(rels_part_name(part_name))
+        return rels
+
+    def delete_slide(self, index):
+        """Delete slide `index` together with its notes slide"""
+        self.delete_slides([index])
+
+    def delete_slides(self, indexes):
+        """Delete several slides (1-based indexes into the current deck) in one pass"""
+        self._load()
+        rels = []
+        parts = set()
+        for index in sorted(set(indexes), reverse=True):
+            parts.add(self._slide_part(index)[1])
+            rels.extend(self._unlink_slide(index))
+        self._drop_slide_links(parts)
+        self._drop_orphan_media(rels)
+
+    def _drop_slide_links(self, deleted):
+        """Unlink hyperlinks (e.g. agenda entries) in the remaining slides that jump to deleted slides"""
+        from lxml import etree
+
+        for sld_id in self._sld_id_list():
+            part_name = posixpath.normpath(posixpath.join("ppt", self._slide_rel(sld_id).get("Target")))
+            rels = self._part_rels(part_name)
+            dead = {rid for rid, rel_type, target, external in rels
+                    if rel_type == RT_SLIDE and not external and target in deleted}
+            if not dead:
+                continue
+            root = etree.fromstring(self._read(part_name))
+            for link in list(root.iter(f"{{{NS_A}}}hlinkClick")):
+                if link.get(f"{{{NS_R}}}id") in dead:
+                    paragraph = next(link.iterancestors(f"{{{NS_A}}}p"), None)
+                    link.getparent().remove(link)
+                    if paragraph is not None:
+                        _set_agenda_number(paragraph, None)
+            self._written[part_name] = etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
+            self._written[rels_part_name(part_name)] = _rels_xml(part_name, [rel for rel in rels if rel[0] not in dead])
+
+    def _renumber_slide_links(self):
+        """Point the number of every linked agenda entry at its target's current position"""
+        from lxml import etree
+
+        positions = {}
+        for position, sld_id in enumerate(self._sld_id_list(), start=1):
+            positions[posixpath.normpath(posixpath.join("ppt", self._slide_rel(sld_id).get("Target")))] = position
+        for part_name in positions:
+            targets = {rid: positions[target] for rid, rel_type, target, external in self._part_rels(part_name)
+                       if rel_type == RT_SLIDE and not external and target in positions}
+            if not targets:
+                continue
+            root = etree.fromstring(self._read(part_name))
+            changed = False
+            for paragraph in root.iter(f"{{{NS_A}}}p"):
+                rids = {link.get(f"{{{NS_R}}}id") for link in paragraph.iter(f"{{{NS_A}}}hlinkClick")}
+                linked = [targets[rid] for rid in rids if rid in targets]
+                if len(linked) == 1:
+                    changed = _set_agenda_number(paragraph, linked[0]) or changed
+            if changed:
+                self._written[part_name] = etree.tostring(root, xml_declaration=True, encoding="UTF-8",
+                                                          standalone=True)
+
+    def keep_slides(self, indexes):
+        """Delete every slide whose 1-based index is not listed"""
+        self._load()
+        keep = set(indexes)
+        self.delete_slides([i for i in range(1, len(self._sld_id_list()) + 1) if i not in keep])
+
+    def _drop_part(self, name):
+        """Remove a part from the patched package"""
+        self._written.pop(name, None)
+        if name in self._names:
+            self._removed.add(name)
+        self._remove_override(name)
+
+    def _drop_orphan_media(self, rels):
+        """Remove media that no other relationship in the package still points at"""
+        candidates = {target for _, _, target, external in rels
+                      if not external and target.startswith("ppt/media/")}
+        if not candidates:
+            return
+        names = (self._names | set(self._written)) - self._removed
+        for name in names:
+            if name.endswith(".rels"):
+                source = posixpath.join(posixpath.dirname(posixpath.dirname(name)), posixpath.basename(name)[:-5])
+                candidates -= {target for _, _, target, _ in self._part_rels(source)}
+        for name in candidates:
+            self._drop_part(name)
+
+    def apply(self, operations):
+        """Apply a list of operation dicts (see module docstring)"""
+        for op in operations:
+            if op["op"] == "replace":
+                self.replace_slide(op["index"], op["kind"], **op.get("args", {}))
+            elif op["op"] == "insert":
+                self.insert_slide(op["index"], op["kind"], **op.get("args", {}))
+            elif op["op"] == "delete":
+                self.delete_slide(op["index"])
+            else:
+                raise ValueError(f"Unknown operation: {op['op']}")
+
+    # ============ OUTPUT ============
+
+    def _update_app_properties(self):
+        """Keep the slide count in docProps/app.xml in step with the deck"""
+        if APP_PROPERTIES_PART not in self._names:
+            return
+        count = len(self._sld_id_list())
+        data = self._zip.read(APP_PROPERTIES_PART)
+        updated = re.sub(rb"<Slides>\d+</Slides>", f"<Slides>{count}</Slides>".encode(), data)
+        if updated != data:
+            self._written[APP_PROPERTIES_PART] = updated
+
+    def save(self, out_path=None):
+        """Write the patched package (in place when out_path is omitted)"""
+        from lxml import etree
+
+        target = out_path or self.path
+        if self._loaded:
+            xml = dict(xml_declaration=True, encoding="UTF-8", standalone=True)
+            if self._reordered:
+                self._renumber_slide_links()
+            self._written[PRESENTATION_PART] = etree.tostring(self._presentation, **xml)
+            self._written[rels_part_name(PRESENTATION_PART)] = etree.tostring(self._pres_rels, **xml)
+            self._written[CONTENT_TYPES_PART] = etree.tostring(self._content_types, **xml)
+            self._update_app_properties()
+
+        tmp_path = target + ".tmp"
+        try:
+            with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as out:
+                for info in self._zip.infolist():
+                    name = info.filename
+                    if name in self._removed:
+                        continue
+                    if name in self._written:
+                        out.writestr(info, self._written.pop(name), zipfile.ZIP_DEFLATED)
+                        continue
+                    with self._zip.open(info) as src, out.open(info, "w") as dst:
+                        shutil.copyfileobj(src, dst, 1 << 16)
+                for name, data in self._written.items():
+                    out.writestr(name, data)
+            self._zip.close()
+            os.replace(tmp_path, target)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return target
+
+def _set_agenda_number(paragraph, number):
+    """Rewrite the "— slide N" ending of an agenda entry paragraph (dropped when number is None); return True if changed"""
+    texts = [t for t in paragraph.iter(f"{{{NS_A}}}t") if t.text]
+    if not texts:
+        return False
+    ending = "" if number is None else f" — slide {number}"
+    text = AGENDA_NUMBER.sub(ending, texts[-1].text)
+    if text == texts[-1].text:
+        return False
+    texts[-1].text = text
+    return True
+
+def _rels_xml(part_name, entries):
+    """Serialize (rId, type, target, external) tuples as a relationships part"""
+    lines = [f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<Relationships xmlns="{NS_REL}">']
+    for rid, rel_type, target, external in entries:
+        mode = ' TargetMode="External"' if external else ""
+        if not external:
+            target = relative_target(part_name, target)
+        lines.append(f'<Relationship Id="{rid}" Type="{rel_type}" Target="{_escape(target)}"{mode}/>')
+    lines.append("</Relationships>")
+    return "".join(lines).encode("utf-8")
+
+def _escape(value):
+    """Escape a string for use in an XML attribute"""
+    return value.replace("&", "&amp;").replace('"', "&quot;").replace("<", "&lt;")
+
+def patch_deck(path, operations, out_path=None, style="tot"):
+    """Apply slide operations to a deck and return the written path"""
+    patcher = DeckPatcher(path, style)
+    patcher.apply(operations)
+    return patcher.save(out_path)
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Patch individual slides of an existing deck")
+    parser.add_argument("deck", help="Deck to patch")
+    parser.add_argument("operations", help="JSON file with the slide operations")
+    parser.add_argument("-o", "--output", help="Write here instead of patching in place")
+    parser.add_argument("--style", default="tot", choices=sorted(STYLES), help="Generator helpers to render with")
+    args = parser.parse_args()
+
+    with open(args.operations, encoding="utf-8") as f:
+        operations = json.load(f)
+    target = patch_deck(args.deck, operations, args.output, args.style)
+    print(f"✓ Deck patched: {target}")
+    print(f"✓ Operations applied: {len(operations)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+EPS Backend Web - Thumbnail & PDF Renderer
+Visual checks of generated decks without PowerPoint or LibreOffice:
+- Rasterizes title / content / two_column / code slides with Pillow, using
+  the helper box geometry, font sizes and theme colours from deck_layout.py
+  and deck_themes.py (raw slides: text and pictures placed from their XML)
+- Writes PNG thumbnails and one combined PDF per deck
+- Pages and thumbnails are cached by slide digest, theme and size, so only
+  new or changed slides are rendered; misses are rendered in parallel
+  processes
+
+Fonts are approximations (Calibri / Courier New when installed, otherwise
+DejaVu or Pillow's built-in font); the output is a layout preview, not a
+pixel-exact PowerPoint rendering.
+
+Usage:
+    python deck_render.py decks/tot_2day.yaml [-o out/] [--width 1280] [--thumb-width 320] [--jobs 4]
+    python deck_render.py decks/tot_2day.yaml --theme dark --no-pdf
+"""
+
+import argparse
+import functools
+import io
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+from deck_cache import cache_get, cache_key, cache_prefetch, cache_put
+from deck_layout import EMU_PER_INCH, INSET_X, INSET_Y, LINE_HEIGHT, slide_layout
+from deck_package import NS_A, NS_P, NS_R, SHAPE_TAGS, paragraph_texts
+from deck_themes import deck_theme, get_theme
+
+RENDER_FORMAT = 1
+DEFAULT_WIDTH = 1280
+THUMB_WIDTH = 320
+
+# Font files tried in order (Windows names first, then common Linux fonts)
+FONTS = {
+    "regular": ("calibri.ttf", "DejaVuSans.ttf", "LiberationSans-Regular.ttf", "arial.ttf"),
+    "bold": ("calibrib.ttf", "DejaVuSans-Bold.ttf", "LiberationSans-Bold.ttf", "arialbd.ttf"),
+    "mono": ("cour.ttf", "DejaVuSansMono.ttf", "LiberationMono-Regular.ttf"),
+}
+
+@functools.lru_cache(maxsize=None)
+def get_font(face, px):
+    """Return the first installed font of a face at a pixel size"""
+    from PIL import ImageFont
+
+    for name in FONTS[face]:
+        try:
+            return ImageFont.truetype(name, px)
+        except OSError:
+            continue
+    return ImageFont.load_default(px)
+
+def wrap_line(text, font, width):
+    """Split one line of text into lines that fit a pixel width"""
+    if not text or font.getlength(text) <= width:
+        return [text]
+    words = text.split(" ")
+    lines = []
+    current = words[0]
+    for word in words[1:]:
+        candidate = f"{current} {word}"
+        if current.strip() and font.getlength(candidate) > width:
+            lines.append(current)
+            current = word
+        else:
+            current = candidate
+    lines.append(current)
+    return lines
+
+def _rgb(value):
+    """Return a hex colour as a Pillow colour string"""
+    return f"#{value}"
+
+# ============ PAGES ============
+
+class Page:
+    """One slide canvas with inch-based drawing helpers"""
+
+    def __init__(self, slide_width, slide_height, width, background):
+        from PIL import Image, ImageDraw
+
+        self.scale = width / (slide_width / EMU_PER_INCH)    # pixels per inch
+        self.image = Image.new("RGB", (width, round(width * slide_height / slide_width)), _rgb(background))
+        self.draw = ImageDraw.Draw(self.image)
+
+    def px(self, inches):
+        """Return inches as pixels"""
+        return inches * self.scale
+
+    def points(self, size):
+        """Return a font size in points as pixels"""
+        return size / 72 * self.scale
+
+    def text(self, rect, paragraphs, align="left", space_before=0, space_after=0):
+        """Draw [(text, face, size, colour)] paragraphs into a text box rectangle (inches)"""
+        left, top, width, _ = rect
+        x = self.px(left + INSET_X)
+        inner = self.px(width - 2 * INSET_X)
+        y = self.px(top + INSET_Y)
+        for i, (text, face, size, colour) in enumerate(paragraphs):
+            px = self.points(size)
+            font = get_font(face, max(1, round(px)))
+            if i:
+                y += self.points(space_before)
+            for raw in text.replace("\v", "\n").split("\n"):
+                for line in wrap_line(raw, font, inner):
+                    offset = (inner - font.getlength(line)) / 2 if align == "center" else 0
+                    self.draw.text((x + offset, y), line, font=font, fill=_rgb(colour))
+                    y += px * LINE_HEIGHT
+            y += self.points(space_after)
+
+    def png(self):
+        """Return the page as PNG bytes"""
+        buffer = io.BytesIO()
+        self.image.save(buffer, "PNG", optimize=False)
+        return buffer.getvalue()
+
+def render_helper_slide(page, style, kind, fields, colours):
+    """Draw a title / content / two_column / code slide from its layout boxes"""
+    for box in slide_layout(style, kind).boxes:
+        rect = (box.left, box.top, box.width, box.height)
+        if box.fill:
+            x, y = page.px(box.left), page.px(box.top)
+            page.draw.rectangle([x, y, x + max(1, page.px(box.width)), y + max(1, page.px(box.height))],
+                                fill=_rgb(colours[box.fill]), outline=_rgb(colours[box.line or box.fill]))
+        paragraphs = []
+        for text, header in box.paragraphs(fields):
+            if header:
+                paragraphs.append((text, "bold", box.header_size, colours["heading"]))
+            else:
+                face = "mono" if box.monospace else ("bold" if box.bold else "regular")
+                paragraphs.append((text, face, box.size, colours[box.role]))
+        if paragraphs:
+            page.text(rect, paragraphs, box.align, box.space_before, box.space_after)
+
+def render_raw_slide(page, fields, colours, base_dir):
+    """Draw the pictures and text of a passed-through slide at their XML positions"""
+    from PIL import Image
+
+    root = ET.fromstring(fields["xml"])
+    fill = root.find(f"{{{NS_P}}}cSld/{{{NS_P}}}bg//{{{NS_A}}}srgbClr")
+    if fill is not None:
+        page.draw.rectangle([0, 0, page.image.width, page.image.height], fill=_rgb(fill.get("val")))
+    tree = root.find(f"{{{NS_P}}}cSld/{{{NS_P}}}spTree")
+    rels = fields.get("rels") or {}
+    for shape in (tree if tree is not None else ()):
+        off = shape.find(f".//{{{NS_A}}}off")
+        ext = shape.find(f".//{{{NS_A}}}ext[@cx]")
+        if shape.tag not in SHAPE_TAGS or off is None or ext is None:
+            continue
+        rect = tuple(int(v) / EMU_PER_INCH for v in (off.get("x"), off.get("y"), ext.get("cx"), ext.get("cy")))
+        blip = shape.find(f".//{{{NS_A}}}blip")
+        rel = rels.get(blip.get(f"{{{NS_R}}}embed")) if blip is not None else None
+        if rel and rel["type"] == "image":
+            size = (max(1, round(page.px(rect[2]))), max(1, round(page.px(rect[3]))))
+            with Image.open(os.path.join(base_dir, rel["target"])) as picture:
+                picture = picture.convert("RGBA").resize(size)
+                page.image.paste(picture, (round(page.px(rect[0])), round(page.px(rect[1]))), picture)
+            continue
+        shape_fill = shape.find(f"{{{NS_P}}}spPr/{{{NS_A}}}solidFill/{{{NS_A}}}srgbClr")
+        if shape_fill is not None:
+            x, y = page.px(rect[0]), page.px(rect[1])
+            page.draw.rectangle([x, y, x + page.px(rect[2]), y + page.px(rect[3])], fill=_rgb(shape_fill.get("val")))
+        texts = paragraph_texts(shape)
+        if any(t.strip() for t in texts):
+            sizes = [int(e.get("sz")) / 100 for e in shape.iter(f"{{{NS_A}}}rPr") if e.get("sz")]
+            colour = shape.find(f".//{{{NS_A}}}rPr/{{{NS_A}}}solidFill/{{{NS_A}}}srgbClr")
+            colour = colour.get("val") if colour is not None else colours["text"]
+            bold = any(e.get("b") == "1" for e in shape.iter(f"{{{NS_A}}}rPr"))
+            size = max(sizes, default=18)
+            page.text(rect, [(t, "bold" if bold else "regular", size, colour) for t in texts])
+
+def render_page(job):
+    """Render one slide to PNG bytes (worker entry point for parallel renders)"""
+    style, kind, fields, colours, slide_width, slide_height, width, base_dir = job
+    background = colours["background"]
+    if kind != "raw":
+        background = colours[slide_layout(style, kind).background]
+    page = Page(slide_width, slide_height, width, background)
+    if kind == "raw":
+        render_raw_slide(page, fields, colours, base_dir)
+    else:
+        render_helper_slide(page, style, kind, fields, colours)
+    return page.png()
+
+# ============ DECKS ============
+
+def page_key(spec, slide, colours, width):
+    """Return the cache key of a rendered page"""
+    return cache_key("page", RENDER_FORMAT, spec.style, slide.digest, colours,
+                     spec.slide_width, spec.slide_height, width)
+
+def page_job(spec, slide, colours, width=DEFAULT_WIDTH):
+    """Return the render_page() arguments of one slide"""
+    return (spec.style, slide.kind, slide.fields, colours, spec.slide_width, spec.slide_height, width, spec.base_dir)
+
+def render_pages(spec, theme=None, width=DEFAULT_WIDTH, jobs=1):
+    """Return ([PNG bytes per slide], [page keys], cached count), rendering only cache misses"""
+    colours = deck_theme(spec, theme).colours()
+    keys = [page_key(spec, slide, colours, width) for slide in spec.slides]
+    cache_prefetch("pages", keys, ".png")
+    pages = []
+    missing = []
+    for i, (slide, key) in enumerate(zip(spec.slides, keys)):
+        data = cache_get("pages", key, ".png")
+        pages.append(data)
+        if data is None:
+            missing.append((i, key, page_job(spec, slide, colours, width)))
+
+    if jobs > 1 and len(missing) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            rendered = list(pool.map(render_page, [job for _, _, job in missing], chunksize=4))
+    else:
+        rendered = [render_page(job) for _, _, job in missing]
+    for (i, key, _), data in zip(missing, rendered):
+        cache_put("pages", key, data, ".png")
+        pages[i] = data
+    return pages, keys, len(pages) - len(missing)
+
+def _write_if_changed(path, data):
+    """Write bytes unless the file already holds them"""
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return path
+    except OSError:
+        pass
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+def thumbnail_key(key, thumb_width=THUMB_WIDTH):
+    """Return the cache key of a page's thumbnail"""
+    return cache_key("thumb", key, thumb_width)
+
+def thumbnail(page, key, thumb_width=THUMB_WIDTH):
+    """Return the PNG thumbnail of a rendered page, cached by its page key"""
+    from PIL import Image
+
+    thumb_key = thumbnail_key(key, thumb_width)
+    thumb = cache_get("thumbs", thumb_key, ".png")
+    if thumb is None:
+        with Image.open(io.BytesIO(page)) as image:
+            height = round(image.height * thumb_width / image.width)
+            buffer = io.BytesIO()
+            image.resize((thumb_width, height), Image.LANCZOS).save(buffer, "PNG")
+        thumb = buffer.getvalue()
+        cache_put("thumbs", thumb_key, thumb, ".png")
+    return thumb
+
+def write_thumbnails(pages, keys, out_dir, thumb_width=THUMB_WIDTH):
+    """Write slide-NNN.png thumbnails; return their paths"""
+    os.makedirs(out_dir, exist_ok=True)
+    cache_prefetch("thumbs", [thumbnail_key(key, thumb_width) for key in keys], ".png")
+    paths = []
+    for i, (page, key) in enumerate(zip(pages, keys), start=1):
+        path = os.path.join(out_dir, f"slide-{i:03d}.png")
+        paths.append(_write_if_changed(path, thumbnail(page, key, thumb_width)))
+    return paths
+
+def pdf_key(spec, keys):
+    """Return the cache key of a deck's PDF"""
+    return cache_key("pdf", RENDER_FORMAT, spec.deck, spec.slide_width, keys)
+
+def pdf_bytes(spec, pages, keys):
+    """Return one PDF of rendered pages at the slide's physical size (cached per page set)"""
+    from PIL import Image
+
+    key = pdf_key(spec, keys)
+    data = cache_get("pdfs", key, ".pdf")
+    if data is None:
+        images = [Image.open(io.BytesIO(page)).convert("RGB") for page in pages]
+        dpi = images[0].width / (spec.slide_width / EMU_PER_INCH)
+        buffer = io.BytesIO()
+        images[0].save(buffer, "PDF", save_all=True, append_images=images[1:], resolution=dpi, title=spec.deck)
+        data = buffer.getvalue()
+        cache_put("pdfs", key, data, ".pdf")
+    return data
+
+def write_pdf(spec, pages, keys, path):
+    """Combine rendered pages into one PDF file"""
+    return _write_if_changed(path, pdf_bytes(spec, pages, keys))
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Render deck spec slides to PNG thumbnails and a PDF")
+    parser.add_argument("spec")
+    parser.add_argument("-o", "--output-dir", help="Output folder (default: next to the spec)")
+    parser.add_argument("--theme", help="Colour theme (default: the spec's theme)")
+    parser.add_argument("--width", type=int, default=DEFAULT_WIDTH, help="Page width in pixels")
+    parser.add_argument("--thumb-width", type=int, default=THUMB_WIDTH, help="Thumbnail width in pixels")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Parallel render processes")
+    parser.add_argument("--no-pdf", action="store_true", help="Only write thumbnails")
+    args = parser.parse_args()
+
+    from deck_spec import SpecError, load_deck_spec
+
+    try:
+        spec = load_deck_spec(args.spec)
+        theme = deck_theme(spec, get_theme(args.theme) if args.theme else None)
+    except (SpecError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    out_dir = args.output_dir or spec.base_dir
+    suffix = "" if theme.name == spec.theme else f"_{theme.name}"
+
+    started = time.perf_counter()
+    pages, keys, cached = render_pages(spec, theme, args.width, args.jobs)
+    rendered = time.perf_counter() - started
+    thumbs = write_thumbnails(pages, keys, os.path.join(out_dir, f"{spec.deck}{suffix}_thumbs"), args.thumb_width)
+    print(f"✓ Thumbnails: {os.path.dirname(thumbs[0]) if thumbs else out_dir} ({len(thumbs)} slides)")
+    if not args.no_pdf and pages:
+        print(f"✓ PDF: {write_pdf(spec, pages, keys, os.path.join(out_dir, f'{spec.deck}{suffix}.pdf'))}")
+    print(f"✓ {len(pages) - cached} page(s) rendered, {cached} from cache, in {rendered:.2f}s")
+
+if __name__ == "__main__":
+    main()
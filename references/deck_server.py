@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+EPS Backend Web - Deck Preview Server
+Browse the latest decks without downloading them:
+- /                                  deck listing
+- /<deck>/                           thumbnail overview of one deck
+- /<deck>/html/slide-001.html        HTML slides (see deck_html.py)
+- /<deck>/thumbs/slide-001.png       thumbnails (see deck_render.py)
+- /<deck>/<deck name>.pptx           the built presentation
+
+One asyncio process (stdlib only) serves many reviewers at once:
+- Every deck is built in the background (.pptx and HTML in one pass,
+  thumbnails from the page cache) and rebuilt when its spec changes;
+  reviewers get the previous build until the new one is ready
+- ETags derive from slide digests, so unchanged slides answer
+  304 Not Modified across rebuilds
+- Serialised (and gzip-compressed) responses are kept in an in-memory
+  LRU cache bounded by size
+
+Usage:
+    python deck_server.py [specs or folders ...] [--host 127.0.0.1] [--port 8765] [--poll 2]
+"""
+
+import argparse
+import asyncio
+import glob
+import gzip
+import io
+import os
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+from html import escape
+from urllib.parse import quote, unquote, urlsplit
+
+from deck_cache import cache_get, cache_key, digest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DECKS_DIR = os.path.join(HERE, "decks")
+
+DEFAULT_PORT = 8765
+POLL_SECONDS = 2.0
+KEEPALIVE_SECONDS = 15
+MAX_HEADER_BYTES = 16384
+MAX_BODY_BYTES = 4 * 1024 * 1024
+RESPONSE_CACHE_BYTES = 64 * 1024 * 1024
+COMPRESSIBLE = ("text/", "application/javascript")
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+STATUS = {200: "OK", 202: "Accepted", 301: "Moved Permanently", 304: "Not Modified", 400: "Bad Request",
+          401: "Unauthorized", 404: "Not Found", 405: "Method Not Allowed", 409: "Conflict",
+          413: "Content Too Large", 429: "Too Many Requests", 500: "Internal Server Error",
+          503: "Service Unavailable"}
+CONTENT_TYPES = {".html": "text/html; charset=utf-8", ".css": "text/css; charset=utf-8",
+                 ".js": "application/javascript; charset=utf-8", ".png": "image/png", ".jpg": "image/jpeg",
+                 ".jpeg": "image/jpeg", ".gif": "image/gif", ".svg": "image/svg+xml",
+                 ".pptx": "application/vnd.openxmlformats-officedocument.presentationml.presentation"}
+
+def toolkit_digest():
+    """Return a digest of the generator sources, so ETags change when the code does"""
+    parts = []
+    for path in sorted(glob.glob(os.path.join(HERE, "*.py"))):
+        with open(path, "rb") as f:
+            parts.append(digest(f.read()))
+    return digest("".join(parts))[:12]
+
+def find_specs(sources):
+    """Return the deck spec paths named by files and folders"""
+    paths = []
+    for source in sources:
+        if os.path.isdir(source):
+            for pattern in ("*.yaml", "*.yml", "*.json"):
+                paths.extend(glob.glob(os.path.join(source, pattern)))
+        else:
+            paths.append(source)
+    return sorted(os.path.abspath(p) for p in paths)
+
+def _stamp(path):
+    """Return (mtime, size) of a file, or None if it is gone"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+# ============ BUILDS ============
+
+class Resource:
+    """One servable file of a deck build"""
+
+    __slots__ = ("etag", "content_type", "load", "cache_control")
+
+    def __init__(self, etag, content_type, load, cache_control="no-cache"):
+        self.etag = etag
+        self.content_type = content_type
+        self.load = load            # callable returning the body bytes
+        self.cache_control = cache_control
+
+class DeckBuild:
+    """Everything served for one deck, produced by one background build"""
+
+    def __init__(self, spec, resources, elapsed):
+        self.spec = spec
+        self.resources = resources  # relative path -> Resource
+        self.elapsed = elapsed
+        self.built = time.time()
+
+def build_deck(path, version, thumb_width):
+    """Build the .pptx, HTML site and thumbnails of a spec (runs in a worker thread)"""
+    from deck_html import ASSETS_DIR, PAGE_NAME, HtmlDeck
+    from deck_render import render_pages, thumbnail, thumbnail_key
+    from deck_spec import build_presentation, load_deck_spec
+
+    started = time.perf_counter()
+    spec = load_deck_spec(path)
+    site = HtmlDeck(spec, None)
+    prs = build_presentation(spec, emitters=[site])
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    pptx = buffer.getvalue()
+    files = site.files()
+    count = len(spec)
+    css = next((name for name in files if name.startswith(ASSETS_DIR) and name.endswith(".css")), "")
+
+    resources = {}
+    for name, data in files.items():
+        ext = os.path.splitext(name)[1]
+        if name.startswith(ASSETS_DIR + "/"):
+            resources["html/" + name] = Resource(f'"{name.rsplit("/", 1)[1]}"', CONTENT_TYPES.get(ext, "application/octet-stream"),
+                                                 (lambda d=data: d), IMMUTABLE)
+        else:
+            resources["html/" + name] = Resource(None, CONTENT_TYPES[".html"], (lambda d=data: d))
+    for slide in spec.slides:
+        page = PAGE_NAME.format(slide.index)
+        resources["html/" + page].etag = f'"{cache_key(version, slide.digest, slide.index, count, css)[:32]}"'
+    resources["html/index.html"].etag = f'"{cache_key(version, spec.digest, css)[:32]}"'
+
+    pages, keys, _ = render_pages(spec)
+    for slide, page, key in zip(spec.slides, pages, keys):
+        thumb_key = thumbnail_key(key, thumb_width)
+        thumbnail(page, key, thumb_width)
+        resources[f"thumbs/slide-{slide.index:03d}.png"] = Resource(
+            f'"{thumb_key[:32]}"', CONTENT_TYPES[".png"], (lambda k=thumb_key: cache_get("thumbs", k, ".png")))
+    resources[f"{spec.deck}.pptx"] = Resource(f'"{cache_key(version, spec.digest)[:32]}"', CONTENT_TYPES[".pptx"],
+                                             (lambda d=pptx: d))
+    return DeckBuild(spec, resources, time.perf_counter() - started)
+
+class DeckState:
+    """A watched spec, its current build and any build error"""
+
+    def __init__(self, path):
+        self.path = path
+        self.name = os.path.splitext(os.path.basename(path))[0]
+        self.build = None
+        self.error = None
+        self.stamp = None
+        self.task = None
+
+# ============ RESPONSES ============
+
+class ResponseCache:
+    """Serialised responses by (path, etag, encoding), evicted least recently used"""
+
+    def __init__(self, max_bytes=RESPONSE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries = OrderedDict()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        """Return a cached response and mark it recently used"""
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        """Store a response, evicting old ones beyond the byte budget"""
+        if len(value) > self.max_bytes // 4:
+            return
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.size -= len(old)
+        self.entries[key] = value
+        self.size += len(value)
+        while self.size > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+
+def http_response(status, body=b"", content_type="text/plain; charset=utf-8", headers=(), head=False):
+    """Serialise an HTTP/1.1 response"""
+    lines = [f"HTTP/1.1 {status} {STATUS[status]}", f"Date: {formatdate(usegmt=True)}",
+             f"Content-Length: {len(body)}"]
+    if body or status == 200:
+        lines.append(f"Content-Type: {content_type}")
+    lines.extend(f"{name}: {value}" for name, value in headers)
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (b"" if head else body)
+
+def etag_matches(header, etag):
+    """Return True if an If-None-Match header names etag"""
+    if not header or not etag:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+# ============ SERVER ============
+
+class PreviewServer:
+    """Serves deck builds and keeps them in step with their specs"""
+
+    def __init__(self, sources, poll=POLL_SECONDS, thumb_width=320, cache_bytes=RESPONSE_CACHE_BYTES):
+        self.sources = sources
+        self.poll = poll
+        self.thumb_width = thumb_width
+        self.version = toolkit_digest()
+        self.decks = {}             # deck name -> DeckState
+        self.cache = ResponseCache(cache_bytes)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="deck-build")
+        self.requests = 0
+
+    def discover(self):
+        """Add new specs from the watched sources; return the states needing a build"""
+        stale = []
+        for path in find_specs(self.sources):
+            state = self.decks.get(os.path.splitext(os.path.basename(path))[0])
+            if state is None:
+                state = self.decks[os.path.splitext(os.path.basename(path))[0]] = DeckState(path)
+            if _stamp(path) != state.stamp and (state.task is None or state.task.done()):
+                stale.append(state)
+        return stale
+
+    async def rebuild(self, state):
+        """Build a deck in the worker thread and swap it in when done"""
+        loop = asyncio.get_running_loop()
+        state.stamp = _stamp(state.path)
+        try:
+            state.build = await loop.run_in_executor(self.executor, build_deck, state.path, self.version,
+                                                     self.thumb_width)
+            state.error = None
+            print(f"✓ Built {state.name}: {len(state.build.spec)} slides in {state.build.elapsed:.2f}s")
+        except Exception as e:  # keep serving the previous build
+            state.error = f"{type(e).__name__}: {e}"
+            print(f"✗ {state.name}: {state.error}")
+
+    def schedule(self):
+        """Start background builds for new or changed specs"""
+        for state in self.discover():
+            state.task = asyncio.create_task(self.rebuild(state))
+
+    async def watch(self):
+        """Poll the specs and rebuild decks whose sources changed"""
+        while True:
+            await asyncio.sleep(self.poll)
+            self.schedule()
+
+    async def current_build(self, state):
+        """Return a deck's build, waiting for the first one if needed"""
+        if state.build is None and state.task is not None:
+            await asyncio.shield(state.task)
+        return state.build
+
+    # ---- pages generated by the server ----
+
+    def listing(self):
+        """Return (etag, html) of the deck listing"""
+        rows = []
+        for name, state in sorted(self.decks.items()):
+            build = state.build
+            if build is None:
+                status = escape(state.error or "building…")
+                rows.append(f"<li>{escape(name)} <em>{status}</em></li>")
+                continue
+            error = f' <em class="error">last rebuild failed: {escape(state.error)}</em>' if state.error else ""
+            rows.append(f'<li><a href="/{quote(name)}/">{escape(build.spec.deck)}</a> '
+                        f"({len(build.spec)} slides, built {time.strftime('%H:%M:%S', time.localtime(build.built))})"
+                        f"{error}</li>")
+        etag = f'"{cache_key(self.version, rows)[:32]}"'
+        body = _page("EPS decks", f"<h1>EPS decks</h1><ul>{''.join(rows)}</ul>")
+        return etag, body
+
+    def overview(self, name, build):
+        """Return (etag, html) of one deck's thumbnail overview"""
+        spec = build.spec
+        cards = []
+        for section, slides in spec.sections():
+            if section:
+                cards.append(f"<h2>{escape(section)}</h2>")
+            cards.append('<div class="grid">')
+            for slide in slides:
+                cards.append(f'<a href="html/slide-{slide.index:03d}.html"><img src="thumbs/slide-{slide.index:03d}.png" '
+                             f'alt="" loading="lazy" width="{self.thumb_width}"><span>{slide.index}. '
+                             f"{escape(slide.title)}</span></a>")
+            cards.append("</div>")
+        links = (f'<p><a href="{quote(spec.deck)}.pptx">Download {escape(spec.deck)}.pptx</a> · '
+                 f'<a href="html/index.html">HTML slides</a> · <a href="/">All decks</a></p>')
+        etag = f'"{cache_key(self.version, spec.digest, name, "overview")[:32]}"'
+        return etag, _page(spec.deck, f"<h1>{escape(spec.deck)}</h1>{links}{''.join(cards)}")
+
+    # ---- request handling ----
+
+    async def respond(self, method, target, headers, body=b""):
+        """Return the serialised response to one request"""
+        self.requests += 1
+        if method not in ("GET", "HEAD"):
+            return http_response(405, b"Method not allowed\n", headers=[("Allow", "GET, HEAD")])
+        head = method == "HEAD"
+        path = unquote(urlsplit(target).path)
+        parts = [p for p in path.split("/") if p]
+        if ".." in parts:
+            return http_response(400, b"Bad path\n", head=head)
+
+        if not parts:
+            etag, body = self.listing()
+            return self.send(path, etag, "text/html; charset=utf-8", lambda: body, headers, head)
+        state = self.decks.get(parts[0])
+        if state is None:
+            return http_response(404, b"No such deck\n", head=head)
+        if len(parts) == 1 and not path.endswith("/"):
+            return http_response(301, headers=[("Location", f"/{quote(parts[0])}/")], head=head)
+        build = await self.current_build(state)
+        if build is None:
+            return http_response(503, f"{state.name} failed to build: {state.error}\n".encode("utf-8"), head=head)
+        if len(parts) == 1:
+            etag, body = self.overview(state.name, build)
+            return self.send(path, etag, "text/html; charset=utf-8", lambda: body, headers, head)
+        relative = "/".join(parts[1:])
+        if relative == "html":
+            relative = "html/index.html"
+        resource = build.resources.get(relative)
+        if resource is None:
+            return http_response(404, b"Not found\n", head=head)
+        return self.send(path, resource.etag, resource.content_type, resource.load, headers, head,
+                         resource.cache_control)
+
+    def send(self, path, etag, content_type, load, headers, head, cache_control="no-cache"):
+        """Answer with 304 if the client has this version, else the (cached) full response"""
+        extra = [("ETag", etag), ("Cache-Control", cache_control)]
+        if etag_matches(headers.get("if-none-match"), etag):
+            return http_response(304, headers=extra, head=True)
+        compress = content_type.startswith(COMPRESSIBLE) and "gzip" in headers.get("accept-encoding", "")
+        key = (path, etag, compress, head)
+        response = self.cache.get(key)
+        if response is None:
+            body = load()
+            if body is None:
+                return http_response(404, b"Not found (evicted from the build cache)\n", head=head)
+            extra.append(("Vary", "Accept-Encoding"))
+            if compress:
+                body = gzip.compress(body, compresslevel=6, mtime=0)
+                extra.append(("Content-Encoding", "gzip"))
+            response = http_response(200, body, content_type, extra, head)
+            self.cache.put(key, response)
+        return response
+
+    async def handle(self, reader, writer):
+        """Serve one connection"""
+        await serve_connection(reader, writer, self.respond)
+
+    async def serve(self, host, port):
+        """Build every deck in the background and serve until cancelled"""
+        self.schedule()
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER_BYTES)
+        print(f"✓ Serving {len(self.decks)} deck(s) on http://{host}:{port}/ (watching every {self.poll:g}s)")
+        watcher = asyncio.create_task(self.watch())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            watcher.cancel()
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+async def serve_connection(reader, writer, respond):
+    """Read HTTP/1.1 requests off one keep-alive connection and write respond()'s answers"""
+    try:
+        while True:
+            try:
+                head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE_SECONDS)
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError,
+                    ConnectionError):
+                break
+            lines = head.decode("latin-1").split("\r\n")
+            try:
+                method, target, version = lines[0].split(" ", 2)
+            except ValueError:
+                writer.write(http_response(400, b"Bad request\n", headers=[("Connection", "close")]))
+                break
+            headers = {}
+            for line in lines[1:]:
+                name, sep, value = line.partition(":")
+                if sep:
+                    headers[name.strip().lower()] = value.strip()
+            try:
+                length = int(headers.get("content-length", 0))
+            except ValueError:
+                length = -1
+            if not 0 <= length <= MAX_BODY_BYTES:
+                writer.write(http_response(413, b"Request body too large\n", headers=[("Connection", "close")]))
+                break
+            body = await reader.readexactly(length) if length else b""
+            try:
+                response = await respond(method, target, headers, body)
+            except Exception as e:
+                response = http_response(500, f"{type(e).__name__}: {e}\n".encode("utf-8"))
+            writer.write(response)
+            await writer.drain()
+            connection = headers.get("connection", "").lower()
+            if connection == "close" or (version == "HTTP/1.0" and connection != "keep-alive"):
+                break
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+def _page(title, body):
+    """Return a small standalone HTML page"""
+    style = ("body{font-family:Calibri,'Segoe UI',Arial,sans-serif;margin:2rem;color:#333}h1{color:#CC0000}"
+             ".grid{display:flex;flex-wrap:wrap;gap:1rem}.grid a{width:20rem;color:#333;text-decoration:none}"
+             ".grid img{display:block;width:100%;height:auto;border:1px solid #ccc}.error{color:#CC0000}")
+    return (f'<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n<title>{escape(title)}</title>\n'
+            f"<style>{style}</style>\n</head>\n<body>\n{body}\n</body>\n</html>\n").encode("utf-8")
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Serve deck previews with incremental rebuilds")
+    parser.add_argument("sources", nargs="*", default=[DECKS_DIR], help="Deck specs or folders of specs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--poll", type=float, default=POLL_SECONDS, help="Seconds between source checks")
+    parser.add_argument("--cache-mb", type=int, default=RESPONSE_CACHE_BYTES // (1024 * 1024),
+                        help="In-memory response cache size")
+    args = parser.parse_args()
+
+    server = PreviewServer(args.sources, args.poll, cache_bytes=args.cache_mb * 1024 * 1024)
+    if not find_specs(args.sources):
+        print(f"Error: no deck specs found in {', '.join(args.sources)}")
+        sys.exit(1)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print(f"✓ Stopped after {server.requests} request(s)")
+
+if __name__ == "__main__":
+    main()
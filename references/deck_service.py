@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+EPS Backend Web - Deck Generation Service
+A local HTTP API for tools that need generated decks (such as the Laravel
+export endpoints) instead of shelling out to the generator scripts:
+- POST /jobs                  {"spec": "tot_2day.yaml", "theme": "...", "slice": "day1"}
+                              or {"spec_data": {inline spec}}; answers 202 with the job
+- GET  /jobs/<id>             status (queued, running, done, failed) and timings
+- GET  /jobs/<id>/download    the .pptx once the job is done
+- GET  /metrics               throughput, queue depth and latency percentiles
+- Jobs wait in a bounded queue; when it is full, submissions get 429 with
+  Retry-After instead of piling up
+- Identical requests share one job while it is queued or running, and
+  finished decks are served from the build cache
+- Builds run in a pool of worker processes that import python-pptx, the
+  generator scripts and the default template once, at start-up
+- Inline specs may not use speaker notes or raw slides: both read files on
+  the service host. The service listens on loopback by default; set
+  EPS_DECK_SERVICE_TOKEN to require Authorization: Bearer on every request
+  (and to listen on any other address)
+
+Usage:
+    python deck_service.py [--host 127.0.0.1] [--port 8766] [--workers 2] [--queue 32]
+    EPS_DECK_SERVICE_TOKEN=... python deck_service.py --host 0.0.0.0
+    curl -X POST http://127.0.0.1:8766/jobs -d '{"spec": "tot_2day.yaml", "slice": "day1"}'
+"""
+
+import argparse
+import asyncio
+import hmac
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import quote, urlsplit
+
+from deck_cache import LOOPBACK_HOSTS, cache_get, cache_key, cache_put, flush_remote
+from deck_server import CONTENT_TYPES, DECKS_DIR, MAX_HEADER_BYTES, http_response, serve_connection, toolkit_digest
+
+SERVICE_FORMAT = 1
+DEFAULT_PORT = 8766
+DEFAULT_WORKERS = 2
+QUEUE_SIZE = 32
+MAX_JOBS = 1000             # finished jobs remembered for status and download
+LATENCY_SAMPLES = 1000
+THROUGHPUT_WINDOW = 60      # seconds
+INLINE_SPEC = "inline.json"
+TOKEN = os.environ.get("EPS_DECK_SERVICE_TOKEN", "")
+
+# ============ WORKERS ============
+
+def warm_worker():
+    """Import the generators and load the default template before the first job"""
+    from pptx import Presentation
+
+    from deck_spec import STYLES, style_helpers
+
+    Presentation()
+    for style in STYLES:
+        style_helpers(style)
+
+def generate(key, path, data, theme, slice_name):
+    """Build one deck into the build cache; return (bytes, slides, seconds)"""
+    started = time.perf_counter()
+    deck = cache_get("builds", key, ".pptx")
+    if deck is not None:
+        return len(deck), 0, 0.0
+
+    from deck_slice import slice_deck
+    from deck_spec import build_presentation, spec_from_bytes
+    from deck_themes import get_theme
+
+    spec = spec_from_bytes(data, path)
+    prs = build_presentation(spec, theme=get_theme(theme) if theme else None)
+    slides = len(prs.slides)
+    with tempfile.TemporaryDirectory(prefix="deck-service-") as tmp:
+        full = os.path.join(tmp, "full.pptx")
+        prs.save(full)
+        if slice_name:
+            indexes = spec.select(slice_name)
+            slides = len(indexes)
+            full = slice_deck(full, indexes, os.path.join(tmp, "slice.pptx"))
+        with open(full, "rb") as f:
+            deck = f.read()
+    cache_put("builds", key, deck, ".pptx")
+    flush_remote()      # worker processes skip atexit handlers
+    return len(deck), slides, time.perf_counter() - started
+
+# ============ JOBS ============
+
+class Job:
+    """One requested deck and its progress"""
+
+    __slots__ = ("id", "key", "deck", "theme", "slice", "status", "submitted", "started", "finished",
+                 "error", "size", "slides", "cached", "done")
+
+    def __init__(self, key, deck, theme=None, slice_name=None):
+        self.id = uuid.uuid4().hex[:16]
+        self.key = key
+        self.deck = deck
+        self.theme = theme
+        self.slice = slice_name
+        self.status = "queued"
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.error = None
+        self.size = None
+        self.slides = None
+        self.cached = False
+        self.done = asyncio.Event()
+
+    @property
+    def filename(self):
+        """Return the download file name"""
+        return f"{self.deck}_{self.slice}.pptx" if self.slice else f"{self.deck}.pptx"
+
+    def as_dict(self):
+        """Return the job as a JSON-ready mapping"""
+        data = {"id": self.id, "status": self.status, "deck": self.deck, "theme": self.theme,
+                "slice": self.slice, "submitted": self.submitted, "started": self.started,
+                "finished": self.finished, "cached": self.cached, "status_url": f"/jobs/{self.id}"}
+        if self.status == "done":
+            data.update(size=self.size, slides=self.slides, download_url=f"/jobs/{self.id}/download")
+        if self.error:
+            data["error"] = self.error
+        return data
+
+class Metrics:
+    """Counters plus recent queue-wait, build and end-to-end latencies"""
+
+    def __init__(self):
+        self.started = time.time()
+        self.counts = dict(submitted=0, deduplicated=0, cache_hits=0, rejected=0, completed=0, failed=0)
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)     # (finished, wait, build, total)
+
+    def record(self, job):
+        """Record a finished job"""
+        self.counts["completed" if job.status == "done" else "failed"] += 1
+        if job.started is not None:
+            self.latencies.append((job.finished, job.started - job.submitted, job.finished - job.started,
+                                   job.finished - job.submitted))
+
+    def build_time(self):
+        """Return the mean build time of recent jobs (seconds)"""
+        if not self.latencies:
+            return 1.0
+        return sum(sample[2] for sample in self.latencies) / len(self.latencies)
+
+    def as_dict(self, queued, running, workers):
+        """Return the metrics as a JSON-ready mapping"""
+        now = time.time()
+        recent = sum(1 for sample in self.latencies if sample[0] >= now - THROUGHPUT_WINDOW)
+        window = min(THROUGHPUT_WINDOW, max(now - self.started, 1e-9))
+        latency = {}
+        for i, name in enumerate(("queue_wait", "build", "total"), start=1):
+            values = sorted(sample[i] for sample in self.latencies)
+            latency[name] = {f"p{p}": round(percentile(values, p), 4) for p in (50, 95, 99)}
+        return dict(self.counts, queued=queued, running=running, workers=workers,
+                    uptime=round(now - self.started, 1), jobs_per_minute=round(recent * 60 / window, 2),
+                    latency_seconds=latency, samples=len(self.latencies))
+
+def percentile(values, p):
+    """Return the p-th percentile of sorted values (nearest rank)"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, math.ceil(p / 100 * len(values)) - 1))]
+
+def json_response(status, data, headers=(), head=False):
+    """Serialise a JSON response"""
+    body = (json.dumps(data, indent=1) + "\n").encode("utf-8")
+    return http_response(status, body, "application/json", headers, head)
+
+class RequestError(ValueError):
+    """A job request that cannot be built"""
+
+# ============ SERVICE ============
+
+class DeckService:
+    """Bounded job queue in front of a pool of warm generator processes"""
+
+    def __init__(self, workers=DEFAULT_WORKERS, queue_size=QUEUE_SIZE, token=TOKEN):
+        self.workers = workers
+        self.token = token
+        self.version = toolkit_digest()
+        self.queue = None
+        self.queue_size = queue_size
+        self.pool = self._new_pool()
+        self.jobs = OrderedDict()       # id -> Job
+        self.inflight = {}              # build key -> queued or running Job
+        self.running = 0
+        self.metrics = Metrics()
+
+    def _new_pool(self):
+        """Start the worker processes"""
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=warm_worker)
+
+    def parse_request(self, body):
+        """Return (key, spec path, spec bytes, deck, theme, slice) of a job request"""
+        from deck_spec import spec_from_bytes
+        from deck_themes import get_theme
+
+        try:
+            request = json.loads(body or b"{}")
+        except ValueError as e:
+            raise RequestError(f"Request body is not JSON: {e}") from None
+        if not isinstance(request, dict):
+            raise RequestError("Request body must be a JSON object")
+        if ("spec" in request) == ("spec_data" in request):
+            raise RequestError("Give exactly one of spec (a file in decks/) or spec_data (an inline spec)")
+        if "spec" in request:
+            path = os.path.realpath(os.path.join(DECKS_DIR, str(request["spec"])))
+            if os.path.dirname(path) != os.path.realpath(DECKS_DIR) or not os.path.isfile(path):
+                raise RequestError(f"No spec {request['spec']!r} in {DECKS_DIR}")
+            with open(path, "rb") as f:
+                data = f.read()
+        else:
+            path = os.path.join(DECKS_DIR, INLINE_SPEC)
+            data = json.dumps(request["spec_data"], sort_keys=True, ensure_ascii=False).encode("utf-8")
+        try:
+            spec = spec_from_bytes(data, path)
+        except Exception as e:
+            raise RequestError(str(e)) from None
+        if "spec_data" in request:
+            # Notes and raw slide media are paths on this host: only specs saved in decks/ may use them
+            unsafe = [str(slide.index) for slide in spec.slides if slide.kind == "raw" or slide.notes]
+            if unsafe:
+                raise RequestError(f"Inline specs cannot use speaker notes or raw slides (slide {', '.join(unsafe)}); "
+                                   f"save the spec in decks/ instead")
+
+        theme = request.get("theme")
+        slice_name = request.get("slice")
+        if theme is not None:
+            try:
+                get_theme(theme)
+            except ValueError as e:
+                raise RequestError(str(e)) from None
+        if slice_name is not None and slice_name not in spec.slices:
+            raise RequestError(f"Deck {spec.deck!r} has no slice {slice_name!r} "
+                               f"(defines: {', '.join(spec.slices) or 'none'})")
+        key = cache_key("service", SERVICE_FORMAT, self.version, spec.digest, theme, slice_name)
+        return key, path, data, spec.deck, theme, slice_name
+
+    def remember(self, job):
+        """Track a job, forgetting the oldest finished ones"""
+        self.jobs[job.id] = job
+        while len(self.jobs) > MAX_JOBS:
+            oldest = next((j for j in self.jobs.values() if j.done.is_set()), None)
+            if oldest is None:
+                break
+            del self.jobs[oldest.id]
+
+    def submit(self, body):
+        """Queue a job request; return (status, response body mapping, extra headers)"""
+        self.metrics.counts["submitted"] += 1
+        try:
+            key, path, data, deck, theme, slice_name = self.parse_request(body)
+        except RequestError as e:
+            return 400, {"error": str(e)}, ()
+
+        job = self.inflight.get(key)
+        if job is not None:
+            self.metrics.counts["deduplicated"] += 1
+            return 200, dict(job.as_dict(), deduplicated=True), ()
+
+        job = Job(key, deck, theme, slice_name)
+        deck = cache_get("builds", key, ".pptx")
+        if deck is not None:
+            self.metrics.counts["cache_hits"] += 1
+            job.status = "done"
+            job.cached = True
+            job.finished = job.submitted
+            job.size = len(deck)
+            job.done.set()
+            self.remember(job)
+            return 200, job.as_dict(), ()
+        try:
+            self.queue.put_nowait((job, path, data))
+        except asyncio.QueueFull:
+            self.metrics.counts["rejected"] += 1
+            retry = max(1, math.ceil(self.metrics.build_time() * self.queue.qsize() / self.workers))
+            return 429, {"error": f"Queue full ({self.queue.qsize()} jobs), retry in {retry}s"}, \
+                [("Retry-After", str(retry))]
+        self.inflight[key] = job
+        self.remember(job)
+        return 202, job.as_dict(), [("Location", f"/jobs/{job.id}")]
+
+    async def dispatch(self):
+        """Feed queued jobs to the worker pool, one at a time per worker"""
+        loop = asyncio.get_running_loop()
+        while True:
+            job, path, data = await self.queue.get()
+            job.status = "running"
+            job.started = time.time()
+            self.running += 1
+            try:
+                job.size, job.slides, _ = await loop.run_in_executor(
+                    self.pool, generate, job.key, path, data, job.theme, job.slice)
+                job.status = "done"
+            except BrokenProcessPool:
+                job.status = "failed"
+                job.error = "A worker process died; the pool was restarted"
+                self.pool.shutdown(wait=False, cancel_futures=True)
+                self.pool = self._new_pool()
+            except Exception as e:
+                job.status = "failed"
+                job.error = f"{type(e).__name__}: {e}"
+            finally:
+                self.running -= 1
+                job.finished = time.time()
+                self.inflight.pop(job.key, None)
+                self.metrics.record(job)
+                job.done.set()
+                self.queue.task_done()
+
+    async def respond(self, method, target, headers, body=b""):
+        """Return the serialised response to one request"""
+        head = method == "HEAD"
+        if self.token and not hmac.compare_digest(headers.get("authorization", ""), f"Bearer {self.token}"):
+            return json_response(401, {"error": "Missing or wrong service token"},
+                                 [("WWW-Authenticate", "Bearer")], head)
+        parts = [p for p in urlsplit(target).path.split("/") if p]
+
+        if parts == ["jobs"] and method == "POST":
+            status, data, extra = self.submit(body)
+            return json_response(status, data, extra)
+        if method not in ("GET", "HEAD"):
+            return http_response(405, b"Method not allowed\n", headers=[("Allow", "GET, HEAD, POST")])
+        if parts == ["metrics"]:
+            return json_response(200, self.metrics.as_dict(self.queue.qsize(), self.running, self.workers),
+                                 [("Cache-Control", "no-store")], head)
+        if parts == ["jobs"]:
+            recent = [job.as_dict() for job in list(self.jobs.values())[-50:]]
+            return json_response(200, {"jobs": recent}, [("Cache-Control", "no-store")], head)
+        if len(parts) not in (2, 3) or parts[0] != "jobs" or parts[1] not in self.jobs:
+            return json_response(404, {"error": "No such job"}, head=head)
+
+        job = self.jobs[parts[1]]
+        if len(parts) == 2:
+            return json_response(200, job.as_dict(), [("Cache-Control", "no-store")], head)
+        if parts[2] != "download":
+            return json_response(404, {"error": "No such resource"}, head=head)
+        if job.status != "done":
+            return json_response(409, {"error": f"Job is {job.status}", "job": job.as_dict()}, head=head)
+        deck = cache_get("builds", job.key, ".pptx")
+        if deck is None:
+            return json_response(404, {"error": "Build was evicted from the cache; submit the job again"},
+                                 head=head)
+        extra = [("ETag", f'"{job.key[:32]}"'),
+                 ("Content-Disposition", f"attachment; filename*=UTF-8''{quote(job.filename)}")]
+        return http_response(200, deck, CONTENT_TYPES[".pptx"], extra, head)
+
+    async def handle(self, reader, writer):
+        """Serve one connection"""
+        await serve_connection(reader, writer, self.respond)
+
+    async def serve(self, host, port):
+        """Start the dispatchers and serve until cancelled"""
+        if host not in LOOPBACK_HOSTS and not self.token:
+            raise ValueError(f"Refusing to serve on {host} without EPS_DECK_SERVICE_TOKEN")
+        self.queue = asyncio.Queue(self.queue_size)
+        dispatchers = [asyncio.create_task(self.dispatch()) for _ in range(self.workers)]
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER_BYTES)
+        print(f"✓ Deck service on http://{host}:{port}/ ({self.workers} worker(s), queue of {self.queue_size})")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for task in dispatchers:
+                task.cancel()
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Serve deck generation jobs over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Generator processes")
+    parser.add_argument("--queue", type=int, default=QUEUE_SIZE, help="Jobs allowed to wait before 429")
+    args = parser.parse_args()
+    if args.workers < 1 or args.queue < 1:
+        print("Error: --workers and --queue must be at least 1")
+        sys.exit(1)
+
+    service = DeckService(args.workers, args.queue)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        counts = service.metrics.counts
+        print(f"✓ Stopped after {counts['completed']} job(s), {counts['failed']} failed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+EPS Backend Web - Audience Slices
+Cuts subset decks ("Day 1 only", "Day 2 only", "labs only", ...) out of one
+full build instead of maintaining separate scripts:
+- Slices are declared in the deck spec as lists of tags and sections
+- Each subset keeps the selected slide parts of the full .pptx unchanged;
+  only presentation.xml (slide list and sections), its rels, the content
+  types and docProps/app.xml are rewritten, plus agenda slides, whose
+  entries are renumbered for the subset (entries for sections left out
+  lose their link and number)
+- Nothing is re-rendered, so ten subsets cost a fraction of one build
+
+Usage:
+    python deck_slice.py decks/tot_2day.yaml                      # build, then cut every slice
+    python deck_slice.py decks/tot_2day.yaml --deck full.pptx --slice day1 labs [-o out/]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from deck_delta import write_manifest
+from deck_package import open_package, slide_part_names
+from deck_patch import DeckPatcher
+from deck_spec import SpecError, load_deck_spec
+
+def slice_path(spec, slice_name, out_dir):
+    """Return the output path of one slice"""
+    return os.path.join(out_dir, f"{spec.deck}_{slice_name}.pptx")
+
+def slice_deck(deck_path, indexes, out_path):
+    """Write a copy of deck_path that keeps only the given 1-based slides"""
+    patcher = DeckPatcher(deck_path)
+    patcher.keep_slides(indexes)
+    return patcher.save(out_path)
+
+def slice_spec_deck(spec, deck_path, slice_names, out_dir):
+    """Cut the named slices of a spec out of its full build; return [(name, path, slides)]"""
+    os.makedirs(out_dir, exist_ok=True)
+    with open_package(deck_path) as zf:
+        count = len(slide_part_names(zf))
+    if count != len(spec):
+        raise ValueError(f"{deck_path} has {count} slides but {spec.path} describes {len(spec)}")
+    results = []
+    for name in slice_names:
+        indexes = spec.select(name)
+        results.append((name, slice_deck(deck_path, indexes, slice_path(spec, name, out_dir)), len(indexes)))
+    return results
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Cut audience subsets out of a full deck build")
+    parser.add_argument("spec", help="Deck spec that declares the slices")
+    parser.add_argument("--deck", help="Full build of the spec (default: build it first)")
+    parser.add_argument("--slice", nargs="+", dest="slices", help="Slices to cut (default: all)")
+    parser.add_argument("-o", "--output-dir", help="Output folder (default: next to the spec)")
+    args = parser.parse_args()
+
+    try:
+        spec = load_deck_spec(args.spec)
+    except SpecError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    names = args.slices or list(spec.slices)
+    unknown = [name for name in names if name not in spec.slices]
+    if unknown or not names:
+        print(f"Error: unknown slice(s) {', '.join(unknown) or '-'}; "
+              f"{spec.deck} defines: {', '.join(spec.slices) or 'none'}")
+        sys.exit(1)
+    out_dir = args.output_dir or spec.base_dir
+    os.makedirs(out_dir, exist_ok=True)
+
+    deck_path = args.deck
+    if deck_path is None:
+        from deck_spec import build_presentation
+
+        started = time.perf_counter()
+        deck_path = os.path.join(out_dir, spec.deck + ".pptx")
+        build_presentation(spec).save(deck_path)
+        print(f"✓ Full deck built: {deck_path} ({time.perf_counter() - started:.2f}s)")
+
+    started = time.perf_counter()
+    results = slice_spec_deck(spec, deck_path, names, out_dir)
+    elapsed = time.perf_counter() - started
+    for name, path, count in results:
+        print(f"✓ {name}: {path} ({count} slides)")
+        print(f"✓ Manifest: {write_manifest(path)}")
+    print(f"✓ {len(results)} slice(s) cut in {elapsed:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,738 @@
+#!/usr/bin/env python3
+"""
+EPS Backend Web - Declarative Deck Specs
+A deck spec describes a presentation as data instead of imperative
+add_*_slide calls:
+
+    deck: eps_tot_training
+    style: tot                 # which generator helpers render the slides
+    theme: eps                 # colour theme (optional, see deck_themes.py)
+    slide_width: 9144000       # EMU (optional, default 10in x 7.5in)
+    slide_height: 6858000
+    slides:
+      - kind: title            # add_title_slide(prs, title, subtitle)
+        section: Introduction  # optional marker: applies until the next one
+        tags: [common]         # optional audience tags used by slices
+        notes: ../TOT_PLANNING_2DAY_COURSE.md#course-overview   # optional speaker notes source
+        title: EPS Backend Web Training
+        subtitle: Transfer of Training (TOT)
+      - kind: content          # add_content_slide(prs, title, content_list)
+        title: Course Overview
+        content_list: ["• 16 hours total", "• 8 hands-on labs"]
+      - kind: two_column       # add_two_column_slide(prs, title, left_title, left_items, right_title, right_items)
+      - kind: code             # add_code_slide(prs, title, code_snippet, language)
+      - kind: agenda           # contents slide built from the section markers, with slide links
+        title: Presentation Overview
+        sections: [Day 1, Day 2]   # optional (default: every section starting after this slide)
+        depth: 2               # optional: also list the slides of each section
+      - kind: raw              # slide XML passed through unchanged
+        xml: "<p:sld ...>"
+        rels: {rId2: {type: image, target: deck.media/1a2b3c.png}}
+    slices:                    # optional audience subsets (see deck_slice.py)
+      day1: [common, Day 1]    # each entry names a tag or a section
+
+Specs are stored as JSON (.json) or YAML (.yaml/.yml, requires PyYAML).
+load_deck_spec() validates a spec against the slide schema and returns
+compact DeckSpec / SlideRecord objects. The validated form is cached in
+binary (marshal, keyed by the file's SHA-256, never shared through the
+remote build cache store), so tools can read large specs in milliseconds without python-pptx or the generator scripts.
+Sections become PowerPoint sections in the built deck. Agenda slides are
+resolved into content slides when the spec is compiled; their entries
+become slide-jump hyperlinks once the rest of the deck is rendered, in the
+same pass. A slide's notes
+reference (a guide path relative to the spec, plus a heading anchor) is
+written into its speaker notes; every guide is parsed once per build.
+
+Usage:
+    python deck_spec.py check decks/tot_2day.yaml
+    python deck_spec.py build deck.json -o deck.pptx
+"""
+
+import argparse
+import functools
+import importlib
+import json
+import marshal
+import os
+import re
+import sys
+import time
+from html import escape
+
+from deck_cache import cache_get, cache_key, cache_put, digest
+from deck_package import EXT_SECTION_LIST, NS_A, NS_P, NS_P14
+from deck_themes import DEFAULT_THEME, THEMES, apply_theme, deck_theme
+from guide_sections import GuideIndex
+
+SPEC_VERSION = 1
+SPEC_CACHE_FORMAT = 5
+
+# Generator scripts whose SLIDE_HELPERS render spec slides
+STYLES = {
+    "tot": "create_tot_presentation",
+    "troubleshooting": "create_troubleshooting_architecture_presentation",
+}
+SLIDE_KINDS = ("title", "content", "two_column", "code")
+
+DEFAULT_SLIDE_WIDTH = 9144000    # 10 inches
+DEFAULT_SLIDE_HEIGHT = 6858000   # 7.5 inches
+
+# ============ SCHEMA ============
+
+TEXT = "string"
+TEXT_LIST = "list of strings"
+SIZE = "positive integer"
+RELS = "mapping of rId -> {type: image|hyperlink, target}"
+SLICES = "mapping of slice name -> list of tags/sections"
+
+DECK_FIELDS = {
+    "version": (SIZE, False),
+    "deck": (TEXT, True),
+    "style": (TEXT, False),
+    "theme": (TEXT, False),
+    "source": (TEXT, False),
+    "slide_width": (SIZE, False),
+    "slide_height": (SIZE, False),
+    "slices": (SLICES, False),
+}
+
+# Spec fields of each slide kind: name -> (type, required)
+SLIDE_FIELDS = {
+    "title": {"title": (TEXT, True), "subtitle": (TEXT, True)},
+    "content": {"title": (TEXT, True), "content_list": (TEXT_LIST, True)},
+    "two_column": {
+        "title": (TEXT, True),
+        "left_title": (TEXT, True), "left_items": (TEXT_LIST, True),
+        "right_title": (TEXT, True), "right_items": (TEXT_LIST, True),
+    },
+    "code": {"title": (TEXT, True), "code_snippet": (TEXT, True), "language": (TEXT, False)},
+    "agenda": {"title": (TEXT, True), "sections": (TEXT_LIST, False), "depth": (SIZE, False)},
+    "raw": {"xml": (TEXT, True), "rels": (RELS, False)},
+}
+
+# Styles whose helpers take other fields (None: the style has no such slides)
+STYLE_FIELDS = {
+    "troubleshooting": {
+        "two_column": {"title": (TEXT, True), "left_items": (TEXT_LIST, True), "right_items": (TEXT_LIST, True)},
+        "code": None,
+    },
+}
+
+# Slide keys that describe a slide rather than being passed to its helper
+META_FIELDS = {"kind": (TEXT, True), "section": (TEXT, False), "tags": (TEXT_LIST, False), "notes": (TEXT, False)}
+
+# Characters XML 1.0 cannot carry (dropped from speaker notes)
+XML_INVALID = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# PowerPoint puts slides before the first section marker here
+DEFAULT_SECTION = "Default Section"
+
+# Agenda entries: one line per section (depth 1) plus one per slide (depth 2)
+AGENDA_ITEM = "• {label} — slide {index}"
+AGENDA_SUBITEM = "   • {label} — slide {index}"
+AGENDA_NUMBER = re.compile(r" — slide (\d+)$")     # the slide number ending an agenda entry
+AGENDA_DEPTHS = (1, 2)
+SLIDE_JUMP = "ppaction://hlinksldjump"
+
+class SpecError(ValueError):
+    """A deck spec that does not match the schema"""
+
+    def __init__(self, path, errors):
+        self.path = path
+        self.errors = errors
+        lines = "\n".join(f"  {e}" for e in errors)
+        super().__init__(f"{len(errors)} problem(s) in {path or 'deck spec'}:\n{lines}")
+
+def _type_error(value, expected):
+    """Return why value is not of the expected schema type, or None"""
+    if expected == TEXT:
+        return None if isinstance(value, str) else f"expected {TEXT}, got {type(value).__name__}"
+    if expected == SIZE:
+        if isinstance(value, int) and not isinstance(value, bool) and value > 0:
+            return None
+        return f"expected {SIZE}, got {value!r}"
+    if expected == TEXT_LIST:
+        if not isinstance(value, list):
+            return f"expected {TEXT_LIST}, got {type(value).__name__}"
+        for i, item in enumerate(value):
+            if not isinstance(item, str):
+                return f"[{i}]: expected {TEXT}, got {type(item).__name__}"
+        return None
+    if expected == RELS:
+        if not isinstance(value, dict):
+            return f"expected {RELS}"
+        for rid, rel in value.items():
+            if (not isinstance(rel, dict) or rel.get("type") not in ("image", "hyperlink")
+                    or not isinstance(rel.get("target"), str)):
+                return f".{rid}: expected {{type: image|hyperlink, target: string}}"
+        return None
+    if expected == SLICES:
+        if not isinstance(value, dict):
+            return f"expected {SLICES}"
+        for name, selectors in value.items():
+            problem = _type_error(selectors, TEXT_LIST)
+            if problem:
+                sep = "" if problem.startswith("[") else ": "
+                return f".{name}{sep}{problem}"
+        return None
+    raise ValueError(f"Unknown schema type: {expected}")
+
+def _check_fields(data, schema, where, errors):
+    """Validate the keys of one mapping against a schema"""
+    for name, (expected, required) in schema.items():
+        if name not in data:
+            if required:
+                errors.append(f"{where}: missing required field {name!r}")
+            continue
+        problem = _type_error(data[name], expected)
+        if problem:
+            sep = "" if problem.startswith((".", "[")) else ": "
+            errors.append(f"{where}.{name}{sep}{problem}")
+
+def slide_fields(style, kind):
+    """Return the field schema of a slide kind in a style, or None if unsupported"""
+    overrides = STYLE_FIELDS.get(style, {})
+    return overrides[kind] if kind in overrides else SLIDE_FIELDS.get(kind)
+
+def validate_spec(data):
+    """Return a list of schema violations ('slides[3].content_list: ...')"""
+    if not isinstance(data, dict):
+        return ["spec: expected a mapping at the top level"]
+    errors = []
+    _check_fields(data, DECK_FIELDS, "spec", errors)
+    for key in data:
+        if key not in DECK_FIELDS and key != "slides":
+            errors.append(f"spec: unknown field {key!r}")
+    if data.get("version", SPEC_VERSION) != SPEC_VERSION:
+        errors.append(f"spec.version: unsupported version {data['version']!r} (expected {SPEC_VERSION})")
+    style = data.get("style", "tot")
+    if style not in STYLES:
+        errors.append(f"spec.style: unknown style {style!r} (expected one of {', '.join(sorted(STYLES))})")
+    theme = data.get("theme", DEFAULT_THEME)
+    if isinstance(theme, str) and theme not in THEMES:
+        errors.append(f"spec.theme: unknown theme {theme!r} (expected one of {', '.join(sorted(THEMES))})")
+
+    slides = data.get("slides")
+    if not isinstance(slides, list):
+        errors.append("spec: 'slides' must be a list")
+        return errors
+    for i, slide in enumerate(slides):
+        where = f"slides[{i}]"
+        if not isinstance(slide, dict):
+            errors.append(f"{where}: expected a mapping")
+            continue
+        _check_fields(slide, META_FIELDS, where, errors)
+        if isinstance(slide.get("notes"), str) and "#" not in slide["notes"]:
+            errors.append(f"{where}.notes: expected GUIDE.md#anchor, got {slide['notes']!r}")
+        kind = slide.get("kind")
+        if not isinstance(kind, str):
+            continue
+        if kind not in SLIDE_FIELDS:
+            errors.append(f"{where}.kind: unknown slide kind {kind!r}")
+            continue
+        schema = slide_fields(style, kind)
+        if schema is None:
+            errors.append(f"{where}.kind: style {style!r} has no {kind} slides")
+            continue
+        _check_fields(slide, schema, where, errors)
+        for key in slide:
+            if key not in schema and key not in META_FIELDS:
+                errors.append(f"{where}: unknown field {key!r} for {kind} slides")
+
+    if not _type_error(data.get("slices", {}), SLICES):
+        known = set()
+        for slide in slides:
+            if isinstance(slide, dict):
+                known.add(slide.get("section"))
+                tags = slide.get("tags", [])
+                known.update(tags if isinstance(tags, list) else [])
+        for name, selectors in data.get("slices", {}).items():
+            for selector in selectors:
+                if selector not in known:
+                    errors.append(f"spec.slices.{name}: {selector!r} is neither a tag nor a section")
+
+    sections = {slide.get("section") for slide in slides if isinstance(slide, dict)}
+    for i, slide in enumerate(slides):
+        if not isinstance(slide, dict) or slide.get("kind") != "agenda":
+            continue
+        wanted = slide.get("sections")
+        for name in wanted if isinstance(wanted, list) else []:
+            if name not in sections:
+                errors.append(f"slides[{i}].sections: no section marker named {name!r}")
+        if slide.get("depth", 1) not in AGENDA_DEPTHS:
+            errors.append(f"slides[{i}].depth: expected 1 or 2, got {slide['depth']!r}")
+    return errors
+
+# ============ RECORDS ============
+
+class SlideRecord:
+    """One validated slide: its helper kind, helper arguments, section, tags and notes source"""
+
+    __slots__ = ("index", "kind", "fields", "section", "tags", "digest", "notes", "links", "agenda")
+
+    def __init__(self, index, kind, fields, section=None, tags=(), digest=None, notes=None, links=(), agenda=None):
+        self.index = index          # 1-based position in the deck
+        self.kind = kind
+        self.fields = fields        # keyword arguments of add_<kind>_slide
+        self.section = section      # inherited from the last section marker
+        self.tags = tuple(tags)
+        self.digest = digest or cache_key(kind, fields)
+        self.notes = notes          # GUIDE.md#anchor written into the speaker notes
+        self.links = tuple(tuple(link) for link in links)   # (content_list index, target slide index)
+        self.agenda = agenda        # agenda declaration this content slide was resolved from
+
+    def matches(self, selectors):
+        """Return True if the slide's section or one of its tags is selected"""
+        return self.section in selectors or any(tag in selectors for tag in self.tags)
+
+    @property
+    def title(self):
+        """Return the slide title (empty for raw slides)"""
+        return self.fields.get("title", "")
+
+    def __repr__(self):
+        return f"<SlideRecord {self.index} {self.kind}: {self.title[:40]!r}>"
+
+class DeckSpec:
+    """A validated deck spec"""
+
+    __slots__ = ("path", "digest", "deck", "style", "theme", "source", "slide_width", "slide_height",
+                 "slices", "slides")
+
+    def __init__(self, deck, style="tot", slides=(), slide_width=DEFAULT_SLIDE_WIDTH,
+                 slide_height=DEFAULT_SLIDE_HEIGHT, source=None, path=None, digest=None,
+                 theme=DEFAULT_THEME, slices=None):
+        self.path = path
+        self.digest = digest        # SHA-256 of the spec file
+        self.deck = deck
+        self.style = style
+        self.theme = theme
+        self.source = source
+        self.slide_width = slide_width
+        self.slide_height = slide_height
+        self.slices = slices or {}  # slice name -> [tag or section]
+        self.slides = list(slides)
+
+    @property
+    def base_dir(self):
+        """Return the directory that raw slide media paths are relative to"""
+        return os.path.dirname(os.path.abspath(self.path)) if self.path else "."
+
+    def sections(self):
+        """Return [(section, [slides])] in deck order"""
+        return section_groups(self.slides)
+
+    def select(self, slice_name):
+        """Return the 1-based indexes of the slides in a named slice"""
+        if slice_name not in self.slices:
+            raise KeyError(f"Deck {self.deck!r} has no slice {slice_name!r}")
+        selectors = set(self.slices[slice_name])
+        return [slide.index for slide in self.slides if slide.matches(selectors)]
+
+    def as_dict(self):
+        """Return the plain spec mapping (section markers only where they change)"""
+        data = {"version": SPEC_VERSION, "deck": self.deck, "style": self.style}
+        if self.theme != DEFAULT_THEME:
+            data["theme"] = self.theme
+        if self.source:
+            data["source"] = self.source
+        data["slide_width"] = self.slide_width
+        data["slide_height"] = self.slide_height
+        if self.slices:
+            data["slices"] = self.slices
+        slides = []
+        section = None
+        for slide in self.slides:
+            item = {"kind": "agenda" if slide.agenda else slide.kind}
+            if slide.section != section:
+                item["section"] = section = slide.section
+            if slide.tags:
+                item["tags"] = list(slide.tags)
+            if slide.notes:
+                item["notes"] = slide.notes
+            item.update(slide.agenda or slide.fields)
+            slides.append(item)
+        data["slides"] = slides
+        return data
+
+    def __len__(self):
+        return len(self.slides)
+
+def section_groups(slides):
+    """Return [(section, [slides])] for consecutive runs of slides in one section"""
+    groups = []
+    for slide in slides:
+        if not groups or groups[-1][0] != slide.section:
+            groups.append((slide.section, []))
+        groups[-1][1].append(slide)
+    return groups
+
+def agenda_entries(slides, agenda):
+    """Return [(line, target slide index)] of an agenda: its sections, and at depth 2 their slides"""
+    groups = {}
+    for section, members in section_groups(slides):
+        if section is not None:
+            groups.setdefault(section, members)
+    names = agenda.fields.get("sections")
+    if names is None:
+        names = [section for section, members in groups.items() if members[0].index > agenda.index]
+    entries = []
+    for name in names:
+        members = groups[name]
+        entries.append((AGENDA_ITEM.format(label=name, index=members[0].index), members[0].index))
+        if agenda.fields.get("depth", 1) > 1:
+            for slide in members:
+                label = slide.title or f"Slide {slide.index}"
+                if slide is not agenda and label != name:
+                    entries.append((AGENDA_SUBITEM.format(label=label, index=slide.index), slide.index))
+    return entries
+
+def resolve_agendas(slides):
+    """Replace agenda declarations in place with content slides listing their entries"""
+    for i, slide in enumerate(slides):
+        if slide.kind != "agenda":
+            continue
+        entries = agenda_entries(slides, slide)
+        fields = {"title": slide.fields["title"], "content_list": [line for line, _ in entries]}
+        slides[i] = SlideRecord(slide.index, "content", fields, slide.section, slide.tags, notes=slide.notes,
+                                links=[(n, target) for n, (_, target) in enumerate(entries)], agenda=slide.fields)
+
+def compile_spec(data, path=None, file_digest=None):
+    """Validate a spec mapping and return a DeckSpec"""
+    errors = validate_spec(data)
+    if errors:
+        raise SpecError(path, errors)
+    slides = []
+    section = None
+    for i, slide in enumerate(data["slides"], start=1):
+        section = slide.get("section", section)
+        fields = {k: v for k, v in slide.items() if k not in META_FIELDS}
+        slides.append(SlideRecord(i, slide["kind"], fields, section, slide.get("tags", ()),
+                                  notes=slide.get("notes")))
+    resolve_agendas(slides)
+    return DeckSpec(
+        data["deck"], data.get("style", "tot"), slides,
+        data.get("slide_width", DEFAULT_SLIDE_WIDTH), data.get("slide_height", DEFAULT_SLIDE_HEIGHT),
+        data.get("source"), path, file_digest, data.get("theme", DEFAULT_THEME), data.get("slices"),
+    )
+
+# ============ LOADING ============
+
+def is_yaml(path):
+    """Return True if a spec path uses the YAML format"""
+    return path.lower().endswith((".yaml", ".yml"))
+
+def parse_spec(data, path):
+    """Parse spec file bytes as JSON or YAML"""
+    if is_yaml(path):
+        import yaml
+
+        return yaml.load(data, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+    return json.loads(data)
+
+def load_spec(path):
+    """Read a deck spec from JSON or YAML as a plain mapping"""
+    with open(path, "rb") as f:
+        return parse_spec(f.read(), path)
+
+def dump_spec(spec, path):
+    """Write a deck spec (mapping or DeckSpec) as JSON or YAML"""
+    if isinstance(spec, DeckSpec):
+        spec = spec.as_dict()
+    with open(path, "w", encoding="utf-8") as f:
+        if is_yaml(path):
+            import yaml
+
+            yaml.safe_dump(spec, f, allow_unicode=True, sort_keys=False, width=120)
+        else:
+            json.dump(spec, f, indent=1, ensure_ascii=False)
+            f.write("\n")
+
+def _pack(spec):
+    """Serialise a DeckSpec for the binary cache"""
+    slides = [(s.kind, s.fields, s.section, s.tags, s.digest, s.notes, s.links, s.agenda) for s in spec.slides]
+    return marshal.dumps((spec.deck, spec.style, spec.theme, spec.source, spec.slide_width, spec.slide_height,
+                          spec.slices, slides))
+
+def _unpack(blob, path, file_digest):
+    """Rebuild a DeckSpec from the binary cache"""
+    deck, style, theme, source, width, height, slices, slides = marshal.loads(blob)
+    records = [SlideRecord(i, kind, fields, section, tags, slide_digest, notes, links, agenda)
+               for i, (kind, fields, section, tags, slide_digest, notes, links, agenda) in enumerate(slides, start=1)]
+    return DeckSpec(deck, style, records, width, height, source, path, file_digest, theme, slices)
+
+def load_deck_spec(path, use_cache=True):
+    """Load, validate and return a DeckSpec, using the binary cache when possible"""
+    with open(path, "rb") as f:
+        return spec_from_bytes(f.read(), path, use_cache)
+
+def spec_from_bytes(data, path, use_cache=True):
+    """Validate spec file bytes (JSON or YAML by path) and return a DeckSpec"""
+    file_digest = digest(data)
+    key = cache_key("spec", SPEC_CACHE_FORMAT, SPEC_VERSION, sys.version_info[:2], file_digest)
+    if use_cache:
+        blob = cache_get("specs", key, ".marshal")
+        if blob is not None:
+            try:
+                return _unpack(blob, path, file_digest)
+            except (EOFError, ValueError, TypeError):
+                pass
+    spec = compile_spec(parse_spec(data, path), path, file_digest)
+    if use_cache:
+        cache_put("specs", key, _pack(spec), ".marshal")
+    return spec
+
+# ============ RENDERING ============
+
+def style_helpers(style):
+    """Return the {kind: add_<kind>_slide} helpers of a generator script"""
+    return importlib.import_module(STYLES[style]).SLIDE_HELPERS
+
+def slide_helper(style, kind):
+    """Return the add_<kind>_slide helper of a generator script"""
+    if kind not in SLIDE_KINDS:
+        raise ValueError(f"Unknown slide kind: {kind}")
+    helper = style_helpers(style).get(kind)
+    if helper is None:
+        raise ValueError(f"Style {style!r} has no {kind} slides")
+    return helper
+
+def add_raw_slide(prs, xml, rels=None, base_dir="."):
+    """Add a slide whose XML is passed through, re-linking its images and hyperlinks"""
+    from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+    from pptx.oxml import parse_xml
+    from pptx.oxml.ns import qn
+
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    rid_map = {}
+    for rid, rel in (rels or {}).items():
+        if rel["type"] == "image":
+            _, rid_map[rid] = slide.part.get_or_add_image_part(os.path.join(base_dir, rel["target"]))
+        elif rel["type"] == "hyperlink":
+            rid_map[rid] = slide.part.relate_to(rel["target"], RT.HYPERLINK, is_external=True)
+
+    source = parse_xml(xml.encode("utf-8") if isinstance(xml, str) else xml)
+    r_ns = qn("r:id")[:-2]
+    for elem in source.iter():
+        for key, value in elem.attrib.items():
+            if key.startswith(r_ns) and value in rid_map:
+                elem.set(key, rid_map[value])
+
+    sld = slide._element
+    for child in list(sld):
+        sld.remove(child)
+    for child in list(source):
+        sld.append(child)
+    return slide
+
+@functools.lru_cache(maxsize=None)
+def notes_paragraphs(text):
+    """Return notes text as serialised a:p paragraphs, built once per distinct text"""
+    paragraphs = []
+    for line in XML_INVALID.sub("", text).split("\n"):
+        paragraphs.append(f'<a:p><a:r><a:rPr lang="en-US" dirty="0"/><a:t>{escape(line, quote=False)}</a:t></a:r></a:p>'
+                          if line else "<a:p/>")
+    return f'<a:txBody xmlns:a="{NS_A}">{"".join(paragraphs)}</a:txBody>'.encode("utf-8")
+
+class NotesWriter:
+    """Writes the guide sections slides refer to into one presentation's speaker notes"""
+
+    def __init__(self, prs, guides):
+        self.prs = prs
+        self.guides = guides        # GuideIndex shared by every deck of a build
+        self.template = None        # empty notes slide with the notes master's placeholders
+        self.number = 0             # last notes slide part number in the package
+
+    def _notes_slide(self, pptx_slide):
+        """Return a slide's notes slide, cloning the template instead of python-pptx's per-slide setup"""
+        import copy
+
+        from pptx.opc.constants import CONTENT_TYPE as CT, RELATIONSHIP_TYPE as RT
+        from pptx.opc.packuri import PackURI
+        from pptx.parts.slide import NotesSlidePart
+
+        if self.template is None or pptx_slide.has_notes_slide:
+            notes_slide = pptx_slide.notes_slide
+            if self.template is None:
+                self.template = copy.deepcopy(notes_slide._element)
+                self.number = max(int(re.sub(r"\D", "", part.partname.filename) or 0)
+                                  for part in self.prs.part.package.iter_parts()
+                                  if part.partname.startswith("/ppt/notesSlides/"))
+            return notes_slide
+        self.number += 1
+        slide_part = pptx_slide.part
+        part = NotesSlidePart(PackURI(f"/ppt/notesSlides/notesSlide{self.number}.xml"), CT.PML_NOTES_SLIDE,
+                              slide_part.package, copy.deepcopy(self.template))
+        part.relate_to(self.prs.part.notes_master_part, RT.NOTES_MASTER)
+        part.relate_to(slide_part, RT.SLIDE)
+        slide_part.relate_to(part, RT.NOTES_SLIDE)
+        return part.notes_slide
+
+    def write(self, pptx_slide, slide):
+        """Stream the guide section of a SlideRecord into a slide's notes placeholder"""
+        if not slide.notes:
+            return
+        from lxml import etree
+
+        body = self._notes_slide(pptx_slide).notes_placeholder.text_frame._txBody
+        for paragraph in body.findall(f"{{{NS_A}}}p"):
+            body.remove(paragraph)
+        body.extend(etree.fromstring(notes_paragraphs(self.guides.notes(slide.notes))))
+
+def add_spec_slide(prs, slide, helpers, base_dir=".", theme=None, notes=None):
+    """Render one SlideRecord (and its speaker notes, given a NotesWriter) onto a presentation"""
+    if slide.kind == "raw":
+        add_raw_slide(prs, slide.fields["xml"], slide.fields.get("rels"), base_dir)
+    elif theme is None:
+        helpers[slide.kind](prs, **slide.fields)
+    else:
+        helpers[slide.kind](prs, theme=theme, **slide.fields)
+    if notes is not None:
+        notes.write(prs.slides[-1], slide)
+    return prs.slides[-1]
+
+def add_sections(prs, spec, first=0):
+    """Record the spec's sections as PowerPoint sections (p14:sectionLst)"""
+    import uuid
+
+    from lxml import etree
+
+    groups = spec.sections()
+    if len(groups) == 1 and groups[0][0] is None:
+        return
+    presentation = prs.part._element
+    ext_list = presentation.find(f"{{{NS_P}}}extLst")
+    if ext_list is None:
+        ext_list = etree.SubElement(presentation, f"{{{NS_P}}}extLst")
+    for ext in ext_list.findall(f"{{{NS_P}}}ext[@uri='{EXT_SECTION_LIST}']"):
+        ext_list.remove(ext)
+    ext = etree.SubElement(ext_list, f"{{{NS_P}}}ext", uri=EXT_SECTION_LIST)
+    section_list = etree.SubElement(ext, f"{{{NS_P14}}}sectionLst", nsmap={"p14": NS_P14})
+    for name, slides in groups:
+        name = name or DEFAULT_SECTION
+        guid = uuid.uuid5(uuid.NAMESPACE_URL, f"eps-deck:{spec.deck}:{name}:{slides[0].index}")
+        section = etree.SubElement(section_list, f"{{{NS_P14}}}section", name=name, id=f"{{{str(guid).upper()}}}")
+        ids = etree.SubElement(section, f"{{{NS_P14}}}sldIdLst")
+        for slide in slides:
+            etree.SubElement(ids, f"{{{NS_P14}}}sldId", id=str(prs.slides[first + slide.index - 1].slide_id))
+
+def check_notes(spec, guides=None):
+    """Return the notes references of a DeckSpec that do not resolve to a guide section"""
+    guides = guides or GuideIndex(spec.base_dir)
+    problems = []
+    for slide in spec.slides:
+        if slide.notes:
+            try:
+                guides.section(slide.notes)
+            except ValueError as e:
+                problems.append(f"slides[{slide.index - 1}].notes: {e}")
+    return problems
+
+def link_slides(prs, pending, first=0):
+    """Turn agenda entries into slide-jump hyperlinks once every target slide exists"""
+    if not pending:
+        return
+    from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+
+    for pptx_slide, slide in pending:
+        # Walk the XML: slide.shapes may be stale on slides cloned element by element
+        items = slide.fields["content_list"]
+        paragraphs = None
+        for body in pptx_slide._element.iter(f"{{{NS_P}}}txBody"):
+            found = body.findall(f"{{{NS_A}}}p")
+            if ["".join(t.text or "" for t in p.iter(f"{{{NS_A}}}t")) for p in found] == items:
+                paragraphs = found
+                break
+        if paragraphs is None:
+            continue
+        for item, target in slide.links:
+            rid = pptx_slide.part.relate_to(prs.slides[first + target - 1].part, RT.SLIDE)
+            for run in paragraphs[item].findall(f"{{{NS_A}}}r"):
+                run.get_or_add_rPr().add_hlinkClick(rid).set("action", SLIDE_JUMP)
+
+def render_slides(prs, spec, helpers=None, theme=None, emitters=()):
+    """Render every slide of a DeckSpec onto an existing presentation in a theme
+
+    Emitters (e.g. deck_html.HtmlDeck) receive each SlideRecord in the same
+    pass, so other output formats reuse the loaded spec.
+    """
+    helpers = helpers or style_helpers(spec.style)
+    theme = deck_theme(spec, theme)
+    notes = NotesWriter(prs, GuideIndex(spec.base_dir))
+    first = len(prs.slides)
+    pending = []        # agenda slides whose links wait for later slides
+    for slide in spec.slides:
+        pptx_slide = add_spec_slide(prs, slide, helpers, spec.base_dir, theme, notes)
+        if slide.links:
+            pending.append((pptx_slide, slide))
+        for emitter in emitters:
+            emitter.add(slide)
+    link_slides(prs, pending, first)
+    add_sections(prs, spec, first)
+    apply_theme(prs, theme)
+    return prs
+
+def build_presentation(spec, helpers=None, theme=None, emitters=()):
+    """Render a DeckSpec into a new python-pptx Presentation"""
+    from pptx import Presentation
+
+    prs = Presentation()
+    prs.slide_width = spec.slide_width
+    prs.slide_height = spec.slide_height
+    return render_slides(prs, spec, helpers, theme, emitters)
+
+def main():
+    """Main execution"""
+    from deck_delta import write_manifest
+
+    parser = argparse.ArgumentParser(description="Validate and build decks from declarative specs")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("check", help="Validate specs and report their slides")
+    p.add_argument("specs", nargs="+")
+    p.add_argument("--no-cache", action="store_true", help="Always re-parse and re-validate")
+    p = sub.add_parser("build", help="Render a spec to .pptx")
+    p.add_argument("spec")
+    p.add_argument("-o", "--output", help="Output .pptx (default: <deck>.pptx next to the spec)")
+    args = parser.parse_args()
+
+    if args.command == "check":
+        failed = False
+        for path in args.specs:
+            started = time.perf_counter()
+            try:
+                spec = load_deck_spec(path, use_cache=not args.no_cache)
+            except SpecError as e:
+                failed = True
+                print(f"✗ {e}")
+                continue
+            elapsed = (time.perf_counter() - started) * 1000
+            kinds = {}
+            for slide in spec.slides:
+                kinds[slide.kind] = kinds.get(slide.kind, 0) + 1
+            summary = ", ".join(f"{n} {kind}" for kind, n in sorted(kinds.items()))
+            broken = check_notes(spec)
+            if broken:
+                failed = True
+                print(f"✗ {path}: {len(broken)} unresolved notes reference(s):")
+                for problem in broken:
+                    print(f"  {problem}")
+                continue
+            notes = sum(1 for slide in spec.slides if slide.notes)
+            print(f"✓ {path}: {len(spec)} slides ({summary}), "
+                  f"{len(spec.sections())} section(s), {notes} with notes, loaded in {elapsed:.1f} ms")
+        sys.exit(1 if failed else 0)
+
+    try:
+        spec = load_deck_spec(args.spec)
+    except SpecError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    output = args.output or os.path.join(spec.base_dir, spec.deck + ".pptx")
+    prs = build_presentation(spec)
+    prs.save(output)
+    print(f"✓ Presentation created: {output}")
+    print(f"✓ Total slides: {len(prs.slides)}")
+    print(f"✓ Manifest: {write_manifest(output)}")
+
+if __name__ == "__main__":
+    main()
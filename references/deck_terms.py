@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+EPS Backend Web - Terminology Consistency Checker
+Flags wording that contradicts the glossary (glossary.yaml), such as
+"Laravel 10" in a deck when the app requires Laravel 12:
+- Every preferred and forbidden variant is compiled into one Aho-Corasick
+  automaton, so each guide and each slide string is scanned once no
+  matter how many terms the glossary holds
+- Deck specs are checked slide by slide (the add_*_slide arguments);
+  markdown files are scanned whole and findings reported by line
+- Findings are cached per file (size/mtime, then content digest) and per
+  glossary version; later runs only re-scan changed inputs
+
+Usage:
+    python deck_terms.py [specs or guides ...] [--glossary glossary.yaml] [--json]
+"""
+
+import argparse
+import bisect
+import glob
+import hashlib
+import json
+import marshal
+import os
+import sys
+import time
+import zlib
+from collections import deque
+
+from deck_cache import CACHE_DIR, digest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GLOSSARY_PATH = os.path.join(HERE, "glossary.yaml")
+SCAN_CACHE_PATH = os.path.join(CACHE_DIR, "terms_scan.bin")
+SCAN_FORMAT = 1
+
+PREFERRED, FORBIDDEN = "preferred", "forbidden"
+
+def default_sources():
+    """Return the deck specs, guides and project README"""
+    readme = os.path.join(os.path.dirname(HERE), "README.md")
+    paths = glob.glob(os.path.join(HERE, "decks", "*.yaml")) + glob.glob(os.path.join(HERE, "*.md"))
+    return sorted(paths + ([readme] if os.path.exists(readme) else []))
+
+# ============ GLOSSARY ============
+
+class Term:
+    """One concept with its preferred and forbidden wordings"""
+
+    __slots__ = ("name", "preferred", "forbidden", "case_sensitive", "reason")
+
+    def __init__(self, name, preferred, forbidden, case_sensitive=False, reason=""):
+        self.name = name
+        self.preferred = preferred
+        self.forbidden = forbidden
+        self.case_sensitive = case_sensitive
+        self.reason = reason
+
+def load_glossary(path=GLOSSARY_PATH):
+    """Return ([Term], glossary digest) from a YAML glossary"""
+    import yaml
+
+    with open(path, "rb") as f:
+        data = f.read()
+    entries = (yaml.safe_load(data) or {}).get("terms") or []
+    terms = []
+    for n, entry in enumerate(entries, start=1):
+        name = entry.get("name") or f"term {n}"
+        preferred = [str(v) for v in entry.get("preferred") or []]
+        forbidden = [str(v) for v in entry.get("forbidden") or []]
+        if not forbidden:
+            raise ValueError(f"{path}: {name} lists no forbidden variants")
+        if not all(v.strip() for v in preferred + forbidden):
+            raise ValueError(f"{path}: {name} has an empty variant")
+        terms.append(Term(name, preferred, forbidden, bool(entry.get("case_sensitive")), entry.get("reason", "")))
+    return terms, digest(data)
+
+class TermMatcher:
+    """Aho-Corasick automaton over every variant of every term"""
+
+    def __init__(self, terms):
+        self.terms = terms
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]      # state -> [(length, term index, kind, variant)]
+        for t, term in enumerate(terms):
+            for kind in (PREFERRED, FORBIDDEN):
+                for variant in getattr(term, kind):
+                    self._add(variant.lower(), (len(variant), t, kind, variant))
+        self._link()
+
+    def _add(self, pattern, payload):
+        """Add one pattern to the trie"""
+        state = 0
+        for char in pattern:
+            nxt = self.goto[state].get(char)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][char] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+            state = nxt
+        self.out[state].append(payload)
+
+    def _link(self):
+        """Compute failure links breadth-first and merge outputs along them"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self.goto[state].items():
+                queue.append(nxt)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[nxt] = self.goto[fallback].get(char, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def scan(self, text):
+        """Yield (start, term index, kind, variant) for whole-word matches in one pass"""
+        goto, fail, out, terms = self.goto, self.fail, self.out, self.terms
+        lowered = text.lower()
+        state = 0
+        for end, char in enumerate(lowered, start=1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, t, kind, variant in out[state]:
+                start = end - length
+                if start and _is_word(text[start - 1]) and _is_word(variant[0]):
+                    continue
+                if end < len(text) and _is_word(text[end]) and _is_word(variant[-1]):
+                    continue
+                if terms[t].case_sensitive and text[start:end] != variant:
+                    continue
+                yield start, t, kind, variant
+
+def _is_word(char):
+    """Return True for characters that continue a word"""
+    return char.isalnum() or char == "_"
+
+# ============ SCANNING ============
+
+def scan_guide(matcher, text):
+    """Return [(locator, term, kind, variant, line text)] for a markdown file scanned as one string"""
+    starts = [0]
+    starts.extend(i + 1 for i, char in enumerate(text) if char == "\n")
+    findings = []
+    for start, t, kind, variant in matcher.scan(text):
+        line = bisect.bisect_right(starts, start)
+        end = starts[line] - 1 if line < len(starts) else len(text)
+        findings.append((f"line {line}", t, kind, variant, text[starts[line - 1]:end].strip()))
+    return findings
+
+def scan_spec(matcher, path):
+    """Return [(locator, term, kind, variant, text)] for every slide string of a deck spec"""
+    from deck_dupes import slide_words
+    from deck_spec import load_deck_spec
+
+    findings = []
+    for slide in load_deck_spec(path).slides:
+        for line in slide_words(slide).splitlines():
+            for _, t, kind, variant in matcher.scan(line):
+                findings.append((f"slide {slide.index}", t, kind, variant, line.strip()))
+    return findings
+
+def scan_file(matcher, path):
+    """Return the findings of one input file"""
+    if path.lower().endswith((".yaml", ".yml", ".json")):
+        return scan_spec(matcher, path)
+    with open(path, encoding="utf-8") as f:
+        return scan_guide(matcher, f.read())
+
+def _file_sha(path):
+    """Return the SHA-256 digest of a file"""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def load_scan_cache(glossary_digest, path=SCAN_CACHE_PATH):
+    """Return the cached {path: [size, mtime_ns, sha, findings]} for this glossary"""
+    try:
+        with open(path, "rb") as f:
+            version, cached_glossary, files = marshal.loads(zlib.decompress(f.read()))
+    except (OSError, ValueError, EOFError, zlib.error):
+        return {}
+    return files if (version, cached_glossary) == (SCAN_FORMAT, glossary_digest) else {}
+
+def save_scan_cache(glossary_digest, files, path=SCAN_CACHE_PATH):
+    """Write the per-file findings atomically"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(zlib.compress(marshal.dumps((SCAN_FORMAT, glossary_digest, files)), 1))
+    os.replace(tmp, path)
+
+def check_terms(paths, glossary_path=GLOSSARY_PATH, cache_path=SCAN_CACHE_PATH):
+    """Return ([Term], {path: findings}, re-scanned paths), scanning only changed inputs"""
+    terms, glossary_digest = load_glossary(glossary_path)
+    matcher = None
+    cached = load_scan_cache(glossary_digest, cache_path)
+    files = {}
+    scanned = []
+    for path in (os.path.abspath(p) for p in paths):
+        stat = os.stat(path)
+        entry = cached.get(path)
+        if entry and entry[:2] == [stat.st_size, stat.st_mtime_ns]:
+            files[path] = entry
+            continue
+        sha = _file_sha(path)
+        if entry and entry[2] == sha:
+            files[path] = [stat.st_size, stat.st_mtime_ns, sha, entry[3]]
+            continue
+        matcher = matcher or TermMatcher(terms)
+        files[path] = [stat.st_size, stat.st_mtime_ns, sha, scan_file(matcher, path)]
+        scanned.append(path)
+    if scanned or files.keys() != cached.keys():
+        save_scan_cache(glossary_digest, files, cache_path)
+    return terms, {path: entry[3] for path, entry in files.items()}, scanned
+
+def conflicts(terms, findings):
+    """Return [(term, preferred uses, [(path, locator, variant, text)])] for terms used inconsistently"""
+    report = []
+    for t, term in enumerate(terms):
+        preferred = 0
+        bad = []
+        for path, entries in findings.items():
+            for locator, term_index, kind, variant, text in entries:
+                if term_index != t:
+                    continue
+                if kind == PREFERRED:
+                    preferred += 1
+                else:
+                    bad.append((path, locator, variant, text))
+        if bad:
+            report.append((term, preferred, bad))
+    return report
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Check slides and guides against the terminology glossary")
+    parser.add_argument("paths", nargs="*", help="Deck specs and markdown files (default: decks/*.yaml, *.md, README)")
+    parser.add_argument("--glossary", default=GLOSSARY_PATH)
+    parser.add_argument("--json", action="store_true", help="Print the conflicts as JSON")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    try:
+        terms, findings, scanned = check_terms(args.paths or default_sources(), args.glossary)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    report = conflicts(terms, findings)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    if args.json:
+        print(json.dumps([{"term": term.name, "preferred": term.preferred, "reason": term.reason,
+                           "preferred_uses": uses,
+                           "findings": [{"file": os.path.relpath(path), "location": locator, "found": variant,
+                                         "text": text} for path, locator, variant, text in bad]}
+                          for term, uses, bad in report], indent=1, ensure_ascii=False))
+    else:
+        for term, uses, bad in report:
+            wanted = " / ".join(f'"{p}"' for p in term.preferred) or "another wording"
+            reason = f" ({term.reason})" if term.reason else ""
+            print(f"✗ {term.name}: {len(bad)} use(s) contradict {wanted}{reason}; preferred form used {uses} time(s)")
+            for path, locator, variant, text in bad:
+                print(f"   {os.path.relpath(path)} {locator}: {variant!r} in {text[:90]}")
+        total = sum(len(bad) for _, _, bad in report)
+        print(f"{'✗' if report else '✓'} {total} conflict(s) across {len(findings)} file(s) "
+              f"({len(scanned)} re-scanned, {elapsed:.0f} ms)")
+    sys.exit(1 if report else 0)
+
+if __name__ == "__main__":
+    main()
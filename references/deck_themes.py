@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+EPS Backend Web - Deck Themes
+Colour themes consumed by the add_*_slide helpers:
+- eps: EPS red title slides on white (EPS_RED / WHITE / DARK_GRAY / LIGHT_GRAY)
+- light: print-friendly, white backgrounds and red headings, little ink
+- dark: projector theme, light text on charcoal
+A generator style can adjust a theme's colours (STYLE_PALETTES): with the
+eps theme the TOT deck keeps its black body text and grey subtitles. The
+eps theme also leaves the template's colour scheme alone, so default builds
+match the decks built before themes existed.
+
+Variant builds render a deck spec once with placeholder colours, then emit
+one .pptx per theme by rewriting only the colour references in the slide
+XML and the master's theme part, so three variants cost little more than
+one build.
+
+Usage:
+    python deck_themes.py list
+    python deck_themes.py build decks/tot_2day.yaml --themes eps light dark [-o out/]
+"""
+
+import argparse
+import io
+import os
+import re
+import sys
+import time
+
+# Colour roles the helpers paint with
+ROLES = (
+    "title_background",  # title slide background
+    "title_text",        # title slide heading
+    "title_muted",       # title slide subtitle / date
+    "background",        # content slide background (theme lt1)
+    "heading",           # slide titles, column titles, rules (theme accent1)
+    "text",              # body text (theme dk1)
+    "code_background",
+    "code_border",
+    "code_text",
+)
+
+class Theme:
+    """A named set of RGB hex colours, one per role"""
+
+    __slots__ = ("name", "label", "scheme") + ROLES
+
+    def __init__(self, name, label, scheme=True, **colours):
+        self.name = name
+        self.label = label
+        self.scheme = scheme        # rewrite the template's colour scheme (SCHEME_SLOTS)
+        missing = [role for role in ROLES if role not in colours]
+        if missing:
+            raise ValueError(f"Theme {name!r} is missing colours: {', '.join(missing)}")
+        for role in ROLES:
+            setattr(self, role, colours[role].upper())
+
+    def rgb(self, role):
+        """Return a role colour as a python-pptx RGBColor"""
+        from pptx.dml.color import RGBColor
+
+        return RGBColor.from_string(getattr(self, role))
+
+    def colours(self):
+        """Return {role: hex} for every role"""
+        return {role: getattr(self, role) for role in ROLES}
+
+    def for_style(self, style):
+        """Return this theme with a generator style's palette applied"""
+        palette = STYLE_PALETTES.get((self.name, style))
+        if not palette:
+            return self
+        return Theme(self.name, self.label, self.scheme, **{**self.colours(), **palette})
+
+    def __repr__(self):
+        return f"<Theme {self.name}>"
+
+EPS_THEME = Theme(
+    "eps", "EPS Red (204, 0, 0) and White", scheme=False,
+    title_background="CC0000", title_text="FFFFFF", title_muted="F2F2F2",
+    background="FFFFFF", heading="CC0000", text="333333",
+    code_background="282828", code_border="646464", code_text="C8DC64",
+)
+
+LIGHT_THEME = Theme(
+    "light", "Print-friendly light",
+    title_background="FFFFFF", title_text="CC0000", title_muted="595959",
+    background="FFFFFF", heading="CC0000", text="000000",
+    code_background="F2F2F2", code_border="BFBFBF", code_text="1F1F1F",
+)
+
+DARK_THEME = Theme(
+    "dark", "Dark projector",
+    title_background="1A1A1A", title_text="FF4D4D", title_muted="BFBFBF",
+    background="262626", heading="FF6666", text="E6E6E6",
+    code_background="0D0D0D", code_border="595959", code_text="C8DC64",
+)
+
+THEMES = {theme.name: theme for theme in (EPS_THEME, LIGHT_THEME, DARK_THEME)}
+DEFAULT_THEME = "eps"
+
+# Per-style colours that differ from a theme's: (theme, style) -> {role: hex}
+STYLE_PALETTES = {
+    ("eps", "tot"): {"text": "000000", "title_muted": "C8C8C8"},
+}
+
+# Placeholder colours for variant builds: one unlikely value per role
+SENTINEL_THEME = Theme("sentinel", "Variant placeholders", scheme=False,
+                       **{role: f"0DEC{i:02X}" for i, role in enumerate(ROLES, start=1)})
+SENTINEL_VALUE = re.compile(rb'val="(0DEC[0-9A-F]{2})"')
+
+# Theme scheme slots driven by a theme (dk1/lt1 are what un-coloured text and
+# the master background resolve to)
+SCHEME_SLOTS = {"dk1": "text", "lt1": "background", "accent1": "heading", "hlink": "heading"}
+
+def get_theme(name):
+    """Return a built-in theme by name"""
+    try:
+        return THEMES[name]
+    except KeyError:
+        raise ValueError(f"Unknown theme {name!r} (expected one of {', '.join(sorted(THEMES))})") from None
+
+def deck_theme(spec, theme=None):
+    """Return the theme a DeckSpec renders in (its own unless one is given), with its style's palette"""
+    return (theme or get_theme(spec.theme)).for_style(spec.style)
+
+def theme_xml(xml, theme):
+    """Return a theme part with its colour scheme set from a Theme"""
+    for slot, role in SCHEME_SLOTS.items():
+        xml = re.sub(
+            rb"<a:%s>.*?</a:%s>" % (slot.encode(), slot.encode()),
+            b'<a:%s><a:srgbClr val="%s"/></a:%s>' % (slot.encode(), getattr(theme, role).encode(), slot.encode()),
+            xml, count=1, flags=re.DOTALL,
+        )
+    return re.sub(rb'<a:clrScheme name="[^"]*"', b'<a:clrScheme name="EPS %s"' % theme.name.encode(), xml, count=1)
+
+def _is_theme_part(name):
+    """Return True for the theme parts of a package (slide and notes masters)"""
+    return name.startswith("ppt/theme/") and name.endswith(".xml")
+
+def apply_theme(prs, theme):
+    """Set the colour scheme of every theme part; call once all slides and notes exist"""
+    from pptx.oxml import parse_xml
+
+    if not theme.scheme:
+        return
+    for part in prs.part.package.iter_parts():
+        if _is_theme_part(part.partname.lstrip("/")):
+            xml = theme_xml(part.blob, theme)
+            if hasattr(part, "_element"):
+                part._element = parse_xml(xml)
+            else:
+                part._blob = xml
+
+def recolor(xml, theme):
+    """Replace sentinel colour references with a theme's colours"""
+    lookup = {SENTINEL_THEME.colours()[role].encode(): getattr(theme, role).encode() for role in ROLES}
+    return SENTINEL_VALUE.sub(lambda m: b'val="%s"' % lookup[m.group(1)], xml)
+
+# ============ VARIANT BUILDS ============
+
+def _themed_part(name):
+    """Return 'theme', 'xml' or None for how a package part is rewritten per theme"""
+    if _is_theme_part(name):
+        return "theme"
+    if name.endswith(".xml") and name.startswith(
+            ("ppt/slides/", "ppt/slideLayouts/", "ppt/slideMasters/", "ppt/notesSlides/")):
+        return "xml"
+    return None
+
+def write_variant(entries, theme, out_path):
+    """Write one themed copy of a rendered package"""
+    import zipfile
+
+    tmp = out_path + ".tmp"
+    with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as zf:
+        for info, data in entries:
+            kind = _themed_part(info.filename)
+            if kind == "theme" and theme.scheme:
+                data = theme_xml(data, theme)
+            elif kind == "xml":
+                data = recolor(data, theme)
+            zf.writestr(info, data)
+    os.replace(tmp, out_path)
+    return out_path
+
+def build_variants(spec, themes, out_dir, helpers=None):
+    """Render a DeckSpec once and write one .pptx per theme; return the paths"""
+    import zipfile
+
+    from deck_spec import build_presentation
+
+    prs = build_presentation(spec, helpers, SENTINEL_THEME)
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    with zipfile.ZipFile(buffer) as zf:
+        entries = [(info, zf.read(info)) for info in zf.infolist()]
+
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for theme in themes:
+        theme = deck_theme(spec, theme)
+        paths.append(write_variant(entries, theme, os.path.join(out_dir, f"{spec.deck}_{theme.name}.pptx")))
+    return paths
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Build themed variants of a deck spec")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="List the built-in themes")
+    p = sub.add_parser("build", help="Render a spec once and write one deck per theme")
+    p.add_argument("spec")
+    p.add_argument("--themes", nargs="+", default=sorted(THEMES), choices=sorted(THEMES))
+    p.add_argument("-o", "--output-dir", help="Output folder (default: next to the spec)")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for theme in THEMES.values():
+            print(f"{theme.name:6} {theme.label}")
+            print("       " + ", ".join(f"{role}={value}" for role, value in theme.colours().items()))
+        return
+
+    from deck_delta import write_manifest
+    from deck_spec import SpecError, load_deck_spec
+
+    try:
+        spec = load_deck_spec(args.spec)
+    except SpecError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    started = time.perf_counter()
+    paths = build_variants(spec, [get_theme(name) for name in args.themes], args.output_dir or spec.base_dir)
+    elapsed = time.perf_counter() - started
+    for path in paths:
+        print(f"✓ {path}")
+        print(f"✓ Manifest: {write_manifest(path)}")
+    print(f"✓ {len(paths)} variant(s) of {len(spec)} slides in {elapsed:.2f}s")
+
+if __name__ == "__main__":
+    main()
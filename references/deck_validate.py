@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+EPS Backend Web - OOXML Package Validator
+Catches the files PowerPoint would offer to "repair" before they reach a class:
+- Content types: every part has one, every override names an existing part
+- Relationships: unique ids, internal targets that exist, r:id/r:embed
+  attributes that resolve in the part's own .rels
+- Ids: unique slide, master and layout ids in their allowed ranges, unique
+  shape ids on each slide
+- Text: runs with their a:t, text bodies that open with a:bodyPr and hold a paragraph
+- XSD conformance of every XML part whose namespace the schema set covers,
+  against the ECMA-376 transitional schemas. Install them once into the
+  build cache with --install-schemas (the ECMA-376 Part 1 or Part 4 download,
+  or the transitional schema zip inside it, as a file or URL), or point
+  --schemas / EPS_OOXML_SCHEMAS at a folder of XSDs. Without them the
+  validator warns on every run that XSD conformance was not checked
+Package checks run once per deck; part checks run across processes for
+large decks (each worker compiles the schema set once) and are cached by
+part digest and schema set, so validating a rebuilt deck only re-checks the
+parts that changed.
+
+Usage:
+    python deck_validate.py --install-schemas ECMA-376-Part1.zip
+    python deck_validate.py deck.pptx [...] [--schemas ooxml-schemas/] [--jobs 4] [--json]
+"""
+
+import argparse
+import glob
+import hashlib
+import io
+import json
+import marshal
+import os
+import posixpath
+import shutil
+import sys
+import time
+import zlib
+
+from deck_cache import CACHE_DIR, cache_key
+from deck_package import (CONTENT_TYPES_PART, NS_A, NS_CT, NS_P, NS_R, NS_REL, PRESENTATION_PART, open_package,
+                          rels_part_name, resolve_target)
+
+VALIDATE_CACHE_PATH = os.path.join(CACHE_DIR, "validate_results.bin")
+VALIDATE_FORMAT = 1
+MAX_CACHED_PARTS = 50000
+PARALLEL_THRESHOLD = 32
+INSTALLED_SCHEMA_DIR = os.path.join(CACHE_DIR, "ooxml-schemas")
+SCHEMA_DIR = os.environ.get("EPS_OOXML_SCHEMAS") or (
+    INSTALLED_SCHEMA_DIR if os.path.isdir(INSTALLED_SCHEMA_DIR) else "")
+MAX_SCHEMA_ERRORS = 5
+
+RT_OFFICE_DOCUMENT = NS_R + "/officeDocument"
+XSD_NS = "http://www.w3.org/2001/XMLSchema"
+# Ranges from ECMA-376 Part 1, 19.2.1.33 (sldId) and 19.2.1.34 (sldMasterId / sldLayoutId)
+SLIDE_ID_RANGE = (256, 2147483647)
+MASTER_ID_RANGE = (2147483648, 4294967295)
+# Content type each relationship type's target must carry
+TARGET_TYPES = {
+    NS_R + "/slide": "application/vnd.openxmlformats-officedocument.presentationml.slide+xml",
+    NS_R + "/slideLayout": "application/vnd.openxmlformats-officedocument.presentationml.slideLayout+xml",
+    NS_R + "/slideMaster": "application/vnd.openxmlformats-officedocument.presentationml.slideMaster+xml",
+    NS_R + "/notesSlide": "application/vnd.openxmlformats-officedocument.presentationml.notesSlide+xml",
+    NS_R + "/notesMaster": "application/vnd.openxmlformats-officedocument.presentationml.notesMaster+xml",
+    NS_R + "/theme": "application/vnd.openxmlformats-officedocument.theme+xml",
+}
+# Parts whose shapes share one id space
+SHAPE_ROOTS = {f"{{{NS_P}}}{name}" for name in ("sld", "sldLayout", "sldMaster", "notes", "notesMaster")}
+
+# ============ SCHEMAS ============
+
+_schemas = {}
+
+def schema_digest(schema_dir):
+    """Return a digest of the schema set (empty when there is none)"""
+    if not schema_dir:
+        return ""
+    h = hashlib.sha256()
+    for path in sorted(glob.glob(os.path.join(schema_dir, "*.xsd"))):
+        h.update(os.path.basename(path).encode("utf-8"))
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+def load_schema(schema_dir):
+    """Return (compiled XMLSchema, {covered namespaces}) for a folder of XSDs, compiled once per process"""
+    if not schema_dir:
+        return None, set()
+    if schema_dir not in _schemas:
+        import xml.etree.ElementTree as ET
+        from pathlib import Path
+
+        from lxml import etree
+
+        imports = {}
+        for path in sorted(glob.glob(os.path.join(schema_dir, "*.xsd"))):
+            _, root = next(ET.iterparse(path, events=("start",)))
+            namespace = root.get("targetNamespace")
+            if namespace:
+                imports.setdefault(namespace, Path(os.path.abspath(path)).as_uri())
+        if not imports:
+            raise ValueError(f"No target-namespace schemas in {schema_dir}")
+        wrapper = "".join(f'<xsd:import namespace="{ns}" schemaLocation="{uri}"/>' for ns, uri in imports.items())
+        _schemas[schema_dir] = (etree.XMLSchema(etree.fromstring(f'<xsd:schema xmlns:xsd="{XSD_NS}">{wrapper}'
+                                                                  f'</xsd:schema>')), set(imports))
+    return _schemas[schema_dir]
+
+def _schema_members(zf):
+    """Yield (file name, bytes) of the XSDs in an archive, looking inside nested transitional zips"""
+    import zipfile
+
+    for name in zf.namelist():
+        base = posixpath.basename(name)
+        if base.lower().endswith(".xsd"):
+            yield base, zf.read(name)
+        elif base.lower().endswith(".zip") and "strict" not in base.lower():
+            with zipfile.ZipFile(io.BytesIO(zf.read(name))) as inner:
+                yield from _schema_members(inner)
+
+def install_schemas(source, schema_dir=INSTALLED_SCHEMA_DIR):
+    """Unpack the ECMA-376 transitional XSDs from an archive file or URL; return how many were installed"""
+    import zipfile
+
+    if source.startswith(("http://", "https://")):
+        import urllib.request
+
+        with urllib.request.urlopen(source, timeout=60) as response:
+            archive = io.BytesIO(response.read())
+    else:
+        archive = source
+    try:
+        with zipfile.ZipFile(archive) as zf:
+            members = dict(_schema_members(zf))
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"{source}: not a zip archive ({e})") from None
+    if not members:
+        raise ValueError(f"{source}: no .xsd files found")
+    tmp = schema_dir + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    for name, data in members.items():
+        with open(os.path.join(tmp, name), "wb") as f:
+            f.write(data)
+    load_schema(tmp)        # refuse a set that does not compile
+    _schemas.pop(tmp, None)
+    shutil.rmtree(schema_dir, ignore_errors=True)
+    os.replace(tmp, schema_dir)
+    return len(members)
+
+def schema_warning(schema_dir):
+    """Return the warning printed when XSD conformance cannot be checked, or None"""
+    if schema_dir:
+        return None
+    return ("Warning: XSD conformance NOT checked - no ECMA-376 schemas installed "
+            "(python deck_validate.py --install-schemas <archive or URL>, or set EPS_OOXML_SCHEMAS)")
+
+# ============ PART CHECKS ============
+
+def _text_problems(root):
+    """Yield messages for runs and text bodies PowerPoint cannot open"""
+    for run in root.iter(f"{{{NS_A}}}r"):
+        children = [child.tag for child in run]
+        if f"{{{NS_A}}}t" not in children:
+            yield f"line {run.sourceline}: a:r without a:t"
+        elif children[-1] != f"{{{NS_A}}}t" or children.count(f"{{{NS_A}}}t") > 1:
+            yield f"line {run.sourceline}: a:r content out of order ({', '.join(c.split('}')[-1] for c in children)})"
+    for body in root.iter(f"{{{NS_P}}}txBody", f"{{{NS_A}}}txBody"):
+        children = [child.tag for child in body]
+        if not children or children[0] != f"{{{NS_A}}}bodyPr":
+            yield f"line {body.sourceline}: txBody does not start with a:bodyPr"
+        if f"{{{NS_A}}}p" not in children:
+            yield f"line {body.sourceline}: txBody without a paragraph"
+
+def _shape_id_problems(root):
+    """Yield messages for shape ids used twice on one slide"""
+    seen = {}
+    for nv in root.iter(f"{{{NS_P}}}cNvPr"):
+        shape_id = nv.get("id")
+        if shape_id in seen:
+            yield f"line {nv.sourceline}: shape id {shape_id} already used on line {seen[shape_id]}"
+        else:
+            seen[shape_id] = nv.sourceline
+
+def validate_part(job):
+    """Return the problems of one XML part: (part name, data, rel ids, schema dir) -> [messages]"""
+    from lxml import etree
+
+    name, data, rel_ids, schema_dir = job
+    try:
+        root = etree.fromstring(data, etree.XMLParser(resolve_entities=False, huge_tree=True))
+    except etree.XMLSyntaxError as e:
+        return [f"not well-formed XML: {e}"]
+
+    problems = []
+    for elem in root.iter():
+        for key, value in elem.attrib.items():
+            if key.startswith(f"{{{NS_R}}}") and value and value not in rel_ids:
+                problems.append(f"line {elem.sourceline}: r:{key.split('}')[1]}={value!r} has no relationship")
+    problems.extend(_text_problems(root))
+    if root.tag in SHAPE_ROOTS:
+        problems.extend(_shape_id_problems(root))
+
+    schema, namespaces = load_schema(schema_dir)
+    if schema is not None and etree.QName(root).namespace in namespaces and not schema.validate(root):
+        for error in list(schema.error_log)[:MAX_SCHEMA_ERRORS]:
+            problems.append(f"line {error.line}: {error.message}")
+        if len(schema.error_log) > MAX_SCHEMA_ERRORS:
+            problems.append(f"... {len(schema.error_log) - MAX_SCHEMA_ERRORS} more schema error(s)")
+    return problems
+
+# ============ PACKAGE CHECKS ============
+
+def read_content_types(zf):
+    """Return ({extension: type}, {part name: type}, [problems]) from [Content_Types].xml"""
+    import xml.etree.ElementTree as ET
+
+    defaults, overrides, problems = {}, {}, []
+    for elem in ET.fromstring(zf.read(CONTENT_TYPES_PART)):
+        if elem.tag == f"{{{NS_CT}}}Default":
+            key, table = elem.get("Extension", "").lower(), defaults
+        elif elem.tag == f"{{{NS_CT}}}Override":
+            key, table = elem.get("PartName", "").lstrip("/"), overrides
+        else:
+            continue
+        if key in table:
+            problems.append(f"duplicate content type entry for {key!r}")
+        table[key] = elem.get("ContentType")
+    return defaults, overrides, problems
+
+def read_rel_table(zf, rels_name, source):
+    """Return ({rId: (type, target, mode)}, [problems]) for one .rels part, keeping duplicates visible"""
+    import xml.etree.ElementTree as ET
+
+    rels, problems = {}, []
+    for rel in ET.fromstring(zf.read(rels_name)).iter(f"{{{NS_REL}}}Relationship"):
+        rid, rel_type, target = rel.get("Id"), rel.get("Type"), rel.get("Target")
+        if not rid or not rel_type or target is None:
+            problems.append(f"relationship {rid!r} is missing Id, Type or Target")
+            continue
+        if rid in rels:
+            problems.append(f"duplicate relationship id {rid}")
+        mode = rel.get("TargetMode", "Internal")
+        if mode != "External":
+            target = resolve_target(source, target) if source else target.lstrip("/")
+        rels[rid] = (rel_type, target, mode)
+    return rels, problems
+
+def _id_problems(zf, rels):
+    """Yield (part, message) for slide, master and layout ids that repeat or fall out of range"""
+    import xml.etree.ElementTree as ET
+
+    def check(part, tag, id_range, seen):
+        """Check one id list against its range and the ids seen so far"""
+        for elem in ET.fromstring(zf.read(part)).iter(f"{{{NS_P}}}{tag}"):
+            value = elem.get("id", "")
+            if not value.isdigit() or not id_range[0] <= int(value) <= id_range[1]:
+                yield part, f"{tag} id {value!r} outside {id_range[0]}..{id_range[1]}"
+            elif value in seen:
+                yield part, f"{tag} id {value} already used in {seen[value]}"
+            else:
+                seen[value] = part
+
+    yield from check(PRESENTATION_PART, "sldId", SLIDE_ID_RANGE, {})
+    master_ids = {}
+    yield from check(PRESENTATION_PART, "sldMasterId", MASTER_ID_RANGE, master_ids)
+    for rel_type, target, mode in rels.get(PRESENTATION_PART, {}).values():
+        if rel_type.endswith("/slideMaster") and target in zf.NameToInfo:
+            yield from check(target, "sldLayoutId", MASTER_ID_RANGE, master_ids)
+
+def package_problems(zf):
+    """Return ([(part, message)], {part: {rIds}}) for content types and relationships"""
+    names = [name for name in zf.namelist() if not name.endswith("/")]
+    present = set(names)
+    problems = []
+    if CONTENT_TYPES_PART not in present:
+        return [(CONTENT_TYPES_PART, "missing")], {}
+
+    defaults, overrides, ct_problems = read_content_types(zf)
+    problems.extend((CONTENT_TYPES_PART, message) for message in ct_problems)
+    for part in overrides:
+        if part not in present:
+            problems.append((CONTENT_TYPES_PART, f"override for missing part /{part}"))
+    content_types = {}
+    for name in names:
+        if name == CONTENT_TYPES_PART:
+            continue
+        content_types[name] = overrides.get(name) or defaults.get(posixpath.basename(name).rpartition(".")[2].lower())
+        if content_types[name] is None:
+            problems.append((name, "no content type"))
+
+    rels = {}
+    mistyped = set()
+    for name in names:
+        if not name.endswith(".rels"):
+            continue
+        directory, filename = posixpath.split(name)
+        source = posixpath.join(posixpath.dirname(directory), filename[:-len(".rels")]).lstrip("/")
+        if source and source not in present:
+            problems.append((name, f"relationships for missing part /{source}"))
+        rels[source], rel_problems = read_rel_table(zf, name, source)
+        problems.extend((name, message) for message in rel_problems)
+        for rid, (rel_type, target, mode) in rels[source].items():
+            if mode == "External":
+                continue
+            if target not in present:
+                problems.append((name, f"{rid} targets missing part /{target}"))
+            elif (rel_type in TARGET_TYPES and content_types[target] != TARGET_TYPES[rel_type]
+                  and target not in mistyped):
+                mistyped.add(target)
+                problems.append((target, f"content type {content_types[target]} where {rel_type.split('/')[-1]} "
+                                         f"is expected"))
+
+    if not any(rel_type == RT_OFFICE_DOCUMENT for rel_type, _, _ in rels.get("", {}).values()):
+        problems.append((rels_part_name(""), "no officeDocument relationship"))
+    elif PRESENTATION_PART in present:
+        problems.extend(_id_problems(zf, rels))
+    return problems, {source: set(table) for source, table in rels.items()}
+
+# ============ VALIDATION ============
+
+def load_validate_cache(path=VALIDATE_CACHE_PATH):
+    """Return the cached {part key: [messages]}"""
+    try:
+        with open(path, "rb") as f:
+            version, parts = marshal.loads(zlib.decompress(f.read()))
+    except (OSError, ValueError, EOFError, zlib.error):
+        return {}
+    return parts if version == VALIDATE_FORMAT else {}
+
+def save_validate_cache(parts, path=VALIDATE_CACHE_PATH):
+    """Write per-part results atomically"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(zlib.compress(marshal.dumps((VALIDATE_FORMAT, parts)), 1))
+    os.replace(tmp, path)
+
+def _is_xml(name):
+    """Return True for the XML parts checked one by one (.rels are checked with the package)"""
+    return name.endswith((".xml", ".vml"))
+
+def validate_package(path, schema_dir=SCHEMA_DIR, pool=None, cache=None, used=None):
+    """Return ([(part, message)], parts checked, parts total) for one .pptx, adding its part keys to used
+
+    Large batches of unchecked parts go to pool (a process pool) when one is given.
+    """
+    import zipfile
+
+    try:
+        zf = open_package(path)
+    except zipfile.BadZipFile as e:
+        return [("", f"not a zip package: {e}")], 0, 0
+    with zf:
+        problems, rel_ids = package_problems(zf)
+        schema_key = schema_digest(schema_dir)
+        cache = {} if cache is None else cache
+        parts = [name for name in zf.namelist() if _is_xml(name)]
+        missing = []
+        keys = {}
+        for name in parts:
+            data = zf.read(name)
+            ids = sorted(rel_ids.get(name, ()))
+            keys[name] = cache_key("validate", VALIDATE_FORMAT, schema_key, hashlib.sha256(data).hexdigest(), ids)
+            if keys[name] not in cache:
+                missing.append((name, data, set(ids), schema_dir))
+
+    if pool is not None and len(missing) >= PARALLEL_THRESHOLD:
+        results = list(pool.map(validate_part, missing, chunksize=8))
+    else:
+        results = [validate_part(job) for job in missing]
+    for (name, _, _, _), messages in zip(missing, results):
+        cache[keys[name]] = messages
+    for name in parts:
+        problems.extend((name, message) for message in cache[keys[name]])
+    if used is not None:
+        used.update(keys.values())
+    return problems, len(missing), len(parts)
+
+def validate_decks(paths, schema_dir=SCHEMA_DIR, jobs=1, cache_path=VALIDATE_CACHE_PATH):
+    """Return ({path: [(part, message)]}, parts checked, parts total) for several decks"""
+    from concurrent.futures import ProcessPoolExecutor
+
+    cache = load_validate_cache(cache_path)
+    report = {}
+    used = set()
+    checked = total = 0
+    # Workers start on first use and compile the schema set once for every deck
+    pool = ProcessPoolExecutor(max_workers=jobs, initializer=load_schema, initargs=(schema_dir,)) if jobs > 1 else None
+    try:
+        for path in paths:
+            report[path], count, parts = validate_package(path, schema_dir, pool, cache, used)
+            checked += count
+            total += parts
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    if checked:
+        if len(cache) > MAX_CACHED_PARTS:
+            cache = {key: cache[key] for key in used}
+        save_validate_cache(cache, cache_path)
+    return report, checked, total
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Validate .pptx packages before PowerPoint has to repair them")
+    parser.add_argument("decks", nargs="*", help=".pptx files")
+    parser.add_argument("--schemas", default=SCHEMA_DIR,
+                        help="Folder with the ECMA-376 transitional XSDs "
+                             "(default: $EPS_OOXML_SCHEMAS, else the installed set)")
+    parser.add_argument("--install-schemas", metavar="ARCHIVE",
+                        help=f"Unpack the ECMA-376 transitional XSDs from a zip file or URL into {INSTALLED_SCHEMA_DIR}")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Parallel validation processes")
+    parser.add_argument("--json", action="store_true", help="Print the problems as JSON")
+    args = parser.parse_args()
+
+    if args.install_schemas:
+        try:
+            count = install_schemas(args.install_schemas)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print(f"✓ Installed {count} schema(s) into {INSTALLED_SCHEMA_DIR}")
+        if not args.decks:
+            return
+        args.schemas = INSTALLED_SCHEMA_DIR
+    if not args.decks:
+        parser.error("give .pptx files to validate")
+    warning = schema_warning(args.schemas)
+    if warning:
+        print(warning, file=sys.stderr)
+
+    started = time.perf_counter()
+    try:
+        report, checked, total = validate_decks(args.decks, args.schemas, args.jobs)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - started
+    count = sum(len(problems) for problems in report.values())
+
+    if args.json:
+        print(json.dumps([{"deck": path, "part": part, "message": message}
+                          for path, problems in report.items() for part, message in problems],
+                         indent=1, ensure_ascii=False))
+    else:
+        for path, problems in report.items():
+            print(f"{'✗' if problems else '✓'} {path}: {len(problems)} problem(s)")
+            for part, message in problems:
+                print(f"   /{part}: {message}")
+        schemas = "with XSDs" if args.schemas else "XSDs NOT checked"
+        print(f"{'✗' if count else '✓'} {count} problem(s) in {len(report)} deck(s) "
+              f"({checked} of {total} part(s) checked, {schemas}, {elapsed:.2f}s)")
+    sys.exit(1 if count else 0)
+
+if __name__ == "__main__":
+    main()
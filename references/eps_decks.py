@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+EPS Backend Web - eps-decks Command Line
+One entry point for the presentation toolkit:
+- build:   render deck specs to .pptx (loads python-pptx)
+- list:    the decks with their slides, sections and slices
+- stats:   slide, section, tag and word counts per deck
+- check:   validate specs and their speaker notes references (deck_spec check)
+- lint:    structural content rules on the slide model (deck_lint)
+- index:   build or query the search index (deck_index)
+- diff:    structural diff of two .pptx decks (deck_diff)
+- links:   check the URLs in specs, decks and guides (deck_links)
+- validate: OOXML package checks on built decks (deck_validate)
+- docs:    refresh the deck blocks of the companion markdown files (deck_docs)
+- imports: import-time report that fails when a metadata command gets slow
+Tool modules are imported only by the subcommand that needs them, so
+list/stats/check/lint/index/diff/links/validate/docs never load python-pptx, lxml, Pillow or numpy
+and start in well under IMPORT_BUDGET_MS. PyYAML is only needed when a spec
+misses the spec cache, so the report measures every command twice: on a
+cold cache (yaml allowed, its import time counted against the budget) and
+on the warm cache it leaves behind (yaml not loaded at all).
+
+Usage:
+    python eps_decks.py list
+    python eps_decks.py build [specs ...] [-o out/] [--theme dark] [--validate]
+    python eps_decks.py imports [--budget 50]
+"""
+
+import argparse
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+IMPORT_BUDGET_MS = 50
+
+# Subcommands handed to an existing tool's main(): name -> (module, argv prefix, help)
+DELEGATED = {
+    "check": ("deck_spec", ["check"], "Validate specs and their notes references"),
+    "lint": ("deck_lint", [], "Lint slide content before rendering"),
+    "index": ("deck_index", [], "Build or query the search index"),
+    "diff": ("deck_diff", [], "Structural diff of two .pptx decks"),
+    "links": ("deck_links", [], "Check the URLs in specs, decks and guides"),
+    "validate": ("deck_validate", [], "Check .pptx packages for problems PowerPoint would repair"),
+    "docs": ("deck_docs", [], "Refresh the deck blocks of the companion documents"),
+}
+
+# Commands the import report runs, and packages none of them may load
+IMPORT_PROBES = {
+    "list": ["list"],
+    "stats": ["stats"],
+    "check": ["check"],
+    "lint": ["lint"],
+    "index": ["index", "--help"],
+    "diff": ["diff", "--help"],
+    "links": ["links", "--help"],
+    "validate": ["validate", "--help"],
+    "docs": ["docs", "--check"],
+}
+HEAVY_PACKAGES = ("pptx", "lxml", "PIL", "numpy")
+# Packages only loaded when a cache misses (PyYAML parses specs not in the spec cache)
+CACHE_MISS_PACKAGES = ("yaml",)
+
+def default_specs():
+    """Return the deck specs shipped in references/decks"""
+    import glob
+
+    return sorted(glob.glob(os.path.join(HERE, "decks", "*.yaml")))
+
+def load_specs(paths):
+    """Return DeckSpecs (from the spec cache when unchanged), or exit on a bad spec"""
+    from deck_spec import SpecError, load_deck_spec
+
+    try:
+        return [load_deck_spec(path) for path in paths or default_specs()]
+    except (OSError, SpecError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+def delegate(name, argv):
+    """Run another tool's main() with the remaining arguments"""
+    import importlib
+
+    module, prefix, _ = DELEGATED[name]
+    if name == "check" and not [arg for arg in argv if not arg.startswith("-")]:
+        argv = argv + default_specs()
+    sys.argv = [f"eps-decks {name}"] + prefix + argv
+    importlib.import_module(module).main()
+
+# ============ COMMANDS ============
+
+def cmd_build(args):
+    """Render specs to .pptx with manifests and companion docs, optionally validating each package"""
+    from deck_delta import write_manifest
+    from deck_docs import update_companions
+    from deck_spec import build_presentation
+    from deck_themes import get_theme
+
+    theme = get_theme(args.theme) if args.theme else None
+    specs = load_specs(args.specs)
+    for spec in specs:
+        out_dir = args.output_dir or spec.base_dir
+        os.makedirs(out_dir, exist_ok=True)
+        output = os.path.join(out_dir, f"{spec.deck}.pptx")
+        prs = build_presentation(spec, theme=theme)
+        prs.save(output)
+        print(f"✓ Presentation created: {output} ({len(prs.slides)} slides)")
+        print(f"✓ Manifest: {write_manifest(output)}")
+        if args.validate:
+            from deck_validate import SCHEMA_DIR, schema_warning, validate_decks
+
+            warning = schema_warning(SCHEMA_DIR)
+            if warning:
+                print(warning, file=sys.stderr)
+            report, _, parts = validate_decks([output])
+            for part, message in report[output]:
+                print(f"   /{part}: {message}")
+            if report[output]:
+                print(f"✗ {len(report[output])} package problem(s) in {output}")
+                sys.exit(1)
+            print(f"✓ Package valid ({parts} parts)")
+    updated = [os.path.basename(path) for path, stale in update_companions(specs).items() if stale]
+    print(f"✓ Companion docs: {', '.join(updated) or 'up to date'}")
+
+def cmd_list(args):
+    """Print one line per deck"""
+    for spec in load_specs(args.specs):
+        slices = ", ".join(f"{name} ({len(spec.select(name))})" for name in spec.slices) or "none"
+        print(f"{spec.deck}: {len(spec)} slides, {len(spec.sections())} section(s), theme {spec.theme}, "
+              f"slices {slices}")
+        print(f"   {os.path.relpath(spec.path)}")
+
+def _words(fields):
+    """Return the number of words in a slide's text fields"""
+    count = 0
+    for value in fields.values():
+        for text in value if isinstance(value, list) else [value]:
+            if isinstance(text, str):
+                count += len(text.split())
+    return count
+
+def cmd_stats(args):
+    """Print slide, section, tag and word counts"""
+    from collections import Counter
+
+    totals = Counter()
+    for spec in load_specs(args.specs):
+        kinds = Counter(slide.kind for slide in spec.slides)
+        tags = Counter(tag for slide in spec.slides for tag in slide.tags)
+        words = sum(_words(slide.fields) for slide in spec.slides if slide.kind != "raw")
+        notes = sum(1 for slide in spec.slides if slide.notes)
+        totals.update(decks=1, slides=len(spec), words=words)
+        print(f"{spec.deck}: {len(spec)} slides, {words} words, {notes} with speaker notes")
+        print(f"   kinds:    {', '.join(f'{n} {kind}' for kind, n in kinds.most_common())}")
+        print(f"   tags:     {', '.join(f'{n} {tag}' for tag, n in tags.most_common()) or 'none'}")
+        for section, slides in spec.sections():
+            print(f"   {len(slides):>4}  {section or '(no section)'}")
+    print(f"✓ {totals['decks']} deck(s), {totals['slides']} slides, {totals['words']} words")
+
+# ============ IMPORT REPORT ============
+
+def import_times(argv, cache_dir):
+    """Run eps-decks under -X importtime with a cache folder; return ({top-level module: ms}, {every module}, wall ms)"""
+    import subprocess
+    import time
+
+    def parse(stderr):
+        """Return ({module: cumulative ms} of the imports made directly by the program, {every module})"""
+        times = {}
+        modules = set()
+        for line in stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, cumulative, name = line[len("import time:"):].split("|")
+            if not cumulative.strip().isdigit():
+                continue
+            modules.add(name.strip())
+            if not name.startswith("  "):
+                times[name.strip()] = int(cumulative) / 1000
+        return times, modules
+
+    env = dict(os.environ, PYTHONIOENCODING="utf-8", EPS_DECK_CACHE=cache_dir)
+    env.pop("EPS_DECK_CACHE_URL", None)
+    _, baseline = parse(subprocess.run([sys.executable, "-X", "importtime", "-c", "pass"], env=env,
+                                        capture_output=True, text=True).stderr)
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", os.path.abspath(__file__)] + argv, env=env,
+                            capture_output=True, text=True, cwd=HERE)
+    wall = (time.perf_counter() - started) * 1000
+    times, modules = parse(result.stderr)
+    return {name: ms for name, ms in times.items() if name not in baseline}, modules - baseline, wall
+
+def cmd_imports(args):
+    """Report what each metadata command imports and fail over the budget"""
+    import subprocess
+    import tempfile
+
+    # Stale bytecode is recompiled on every run when it cannot be written back
+    subprocess.run([sys.executable, "-m", "compileall", "-q", HERE], capture_output=True)
+    commands = args.commands or list(IMPORT_PROBES)
+    # One unmeasured cold run first, so the OS file cache does not penalise whichever command comes first
+    with tempfile.TemporaryDirectory(prefix="eps-decks-imports-") as cache_dir:
+        import_times(IMPORT_PROBES.get(commands[0], [commands[0]]), cache_dir)
+    failed = False
+    for name in commands:
+        with tempfile.TemporaryDirectory(prefix="eps-decks-imports-") as cache_dir:
+            for state, forbidden in (("cold", HEAVY_PACKAGES), ("warm", HEAVY_PACKAGES + CACHE_MISS_PACKAGES)):
+                times, modules, wall = import_times(IMPORT_PROBES.get(name, [name]), cache_dir)
+                total = sum(times.values())
+                heavy = sorted({module.split(".")[0] for module in modules} & set(forbidden))
+                over = total > args.budget or heavy
+                failed = failed or over
+                slowest = ", ".join(f"{module} {ms:.1f}"
+                                    for module, ms in sorted(times.items(), key=lambda kv: -kv[1])[:args.top])
+                print(f"{'✗' if over else '✓'} {name} ({state} cache): {total:.1f} ms of imports "
+                      f"(budget {args.budget} ms), {wall:.0f} ms wall")
+                print(f"   slowest: {slowest}")
+                if heavy:
+                    print(f"   loads {', '.join(heavy)}")
+    sys.exit(1 if failed else 0)
+
+def main():
+    """Main execution"""
+    argv = sys.argv[1:]
+    if argv and argv[0] in DELEGATED:
+        delegate(argv[0], argv[1:])
+        return
+
+    parser = argparse.ArgumentParser(prog="eps-decks", description="EPS presentation toolkit")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("build", help="Render deck specs to .pptx")
+    p.add_argument("specs", nargs="*", help="Deck specs (default: decks/*.yaml)")
+    p.add_argument("-o", "--output-dir", help="Output folder (default: next to each spec)")
+    p.add_argument("--theme", help="Colour theme (default: each spec's theme)")
+    p.add_argument("--validate", action="store_true", help="Validate each .pptx package after saving it")
+    p.set_defaults(run=cmd_build)
+    for name, run, description in (("list", cmd_list, "List decks with their sections and slices"),
+                                   ("stats", cmd_stats, "Slide, section, tag and word counts")):
+        p = sub.add_parser(name, help=description)
+        p.add_argument("specs", nargs="*", help="Deck specs (default: decks/*.yaml)")
+        p.set_defaults(run=run)
+    for name, (_, _, description) in DELEGATED.items():
+        sub.add_parser(name, help=description, add_help=False)
+    p = sub.add_parser("imports", help="Import-time report for the metadata commands")
+    p.add_argument("commands", nargs="*", help=f"Commands to measure (default: {', '.join(IMPORT_PROBES)})")
+    p.add_argument("--budget", type=float, default=IMPORT_BUDGET_MS, help="Allowed import time per command (ms)")
+    p.add_argument("--top", type=int, default=5, help="Slowest imports shown per command")
+    p.set_defaults(run=cmd_imports)
+    args = parser.parse_args(argv)
+    args.run(args)
+
+if __name__ == "__main__":
+    main()
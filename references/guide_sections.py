@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+EPS Backend Web - Markdown Guide Sections
+Splits the training guides (HANDS_ON_TRAINING_GUIDE.md, TROUBLESHOOTING_GUIDE.md, ...)
+into heading-delimited sections with GitHub-style anchors. Headings inside
+fenced code blocks (e.g. "# Check PHP version" in bash samples) are ignored.
+GuideIndex resolves "GUIDE.md#anchor" references (speaker notes in deck
+specs) against guides parsed once per build.
+"""
+
+import os
+import re
+
+HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+FENCE = re.compile(r"^\s*(```|~~~)")
+
+# Markdown markup dropped when a section becomes plain text
+LINK = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+EMPHASIS = re.compile(r"(\*\*|__)(.+?)\1")
+INLINE_CODE = re.compile(r"`([^`]*)`")
+TABLE_RULE = re.compile(r"^\s*\|?[\s:|-]+\|[\s:|-]*$")
+HORIZONTAL_RULE = re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$")
+
+class GuideSection:
+    """One heading and the lines that belong to it"""
+
+    __slots__ = ("path", "anchor", "level", "title", "line", "end", "subtree_end", "lines")
+
+    def __init__(self, path, anchor, level, title, line, lines):
+        self.path = path
+        self.anchor = anchor
+        self.level = level
+        self.title = title
+        self.line = line            # 1-based line of the heading
+        self.end = line             # last line before the next heading
+        self.subtree_end = line     # last line before the next heading of the same or higher level
+        self.lines = lines          # shared list of every line in the file
+
+    @property
+    def body(self):
+        """Return the section text up to the next heading"""
+        return "\n".join(self.lines[self.line:self.end]).strip()
+
+    @property
+    def full_text(self):
+        """Return the section text including its subsections"""
+        return "\n".join(self.lines[self.line:self.subtree_end]).strip()
+
+    @property
+    def ref(self):
+        """Return the path#anchor reference for this section"""
+        return f"{self.path}#{self.anchor}"
+
+def slugify(title):
+    """Return the GitHub-style anchor for a heading"""
+    slug = re.sub(r"[^\w\- ]", "", title.strip().lower())
+    return slug.replace(" ", "-")
+
+def parse_sections(path, text=None):
+    """Parse a markdown file into a list of GuideSection objects"""
+    if text is None:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+    lines = text.splitlines()
+    sections = []
+    seen = {}
+    in_fence = False
+    for number, line in enumerate(lines, start=1):
+        if FENCE.match(line):
+            in_fence = not in_fence
+            continue
+        match = None if in_fence else HEADING.match(line)
+        if not match:
+            continue
+        title = match.group(2)
+        anchor = slugify(title)
+        if anchor in seen:
+            seen[anchor] += 1
+            anchor = f"{anchor}-{seen[anchor]}"
+        else:
+            seen[anchor] = 0
+        sections.append(GuideSection(path, anchor, len(match.group(1)), title, number, lines))
+
+    for i, section in enumerate(sections):
+        section.end = sections[i + 1].line - 1 if i + 1 < len(sections) else len(lines)
+        section.subtree_end = len(lines)
+        for later in sections[i + 1:]:
+            if later.level <= section.level:
+                section.subtree_end = later.line - 1
+                break
+    return sections
+
+def _inline(line):
+    """Strip links, emphasis and inline code markup from one line"""
+    return INLINE_CODE.sub(r"\1", EMPHASIS.sub(r"\2", LINK.sub(r"\1", line)))
+
+def plain_text(markdown):
+    """Return markdown as plain text lines (fences, rules and inline markup removed)"""
+    lines = []
+    in_fence = False
+    for line in markdown.splitlines():
+        if FENCE.match(line):
+            in_fence = not in_fence
+            continue
+        if not in_fence:
+            if TABLE_RULE.match(line) or HORIZONTAL_RULE.match(line) or line.lstrip().startswith("<!--"):
+                continue
+            match = HEADING.match(line)
+            if match:
+                line = match.group(2)
+            if line.lstrip().startswith("|"):
+                line = " | ".join(cell.strip() for cell in line.strip().strip("|").split("|"))
+            line = _inline(line)
+        line = line.rstrip()
+        if line or (lines and lines[-1]):
+            lines.append(line)
+    return "\n".join(lines).strip()
+
+class GuideIndex:
+    """Guide sections by path#anchor, each guide parsed on first use"""
+
+    def __init__(self, base_dir="."):
+        self.base_dir = base_dir    # guide paths in references are relative to this
+        self.guides = {}            # absolute path -> {anchor: GuideSection}
+        self.texts = {}             # ref -> notes text
+
+    def section(self, ref):
+        """Return the GuideSection a 'GUIDE.md#anchor' reference points to"""
+        path, _, anchor = ref.partition("#")
+        full = os.path.normpath(os.path.join(self.base_dir, path))
+        sections = self.guides.get(full)
+        if sections is None:
+            if not os.path.isfile(full):
+                raise ValueError(f"{ref}: guide {path} not found")
+            sections = self.guides[full] = {s.anchor: s for s in parse_sections(full)}
+        if not anchor:
+            raise ValueError(f"{ref}: missing #anchor")
+        if anchor not in sections:
+            raise ValueError(f"{ref}: no section #{anchor} in {os.path.basename(full)}")
+        return sections[anchor]
+
+    def notes(self, ref):
+        """Return the plain text of a section (heading, body and subsections)"""
+        text = self.texts.get(ref)
+        if text is None:
+            section = self.section(ref)
+            text = self.texts[ref] = f"{_inline(section.title)}\n\n{plain_text(section.full_text)}".strip()
+        return text
@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+EPS Backend Web - QR Code Generator
+Encodes links (e.g. https://bit.ly/eps-tot-be) as QR codes for the training decks:
+- Compact 1-bit PNG images for slide pictures or handouts
+- Native vector shapes drawn straight onto a slide (one freeform per code)
+
+Module matrices are computed with NumPy (byte mode, versions 1-40, EC levels
+L/M/Q/H). Rendered PNGs are cached by (payload, size, error-correction level).
+
+Usage: python qr_codes.py https://bit.ly/eps-tot-be -o qr_eps_tot_be.png --size 512
+"""
+
+import argparse
+import io
+from functools import lru_cache
+
+import numpy as np
+
+from deck_cache import cache_get, cache_key, cache_put
+
+QUIET_ZONE = 4
+
+# Format-info bits for each error-correction level
+EC_FORMAT_BITS = {"L": 1, "M": 0, "Q": 3, "H": 2}
+EC_LEVELS = ("L", "M", "Q", "H")
+
+# Error-correction codewords per block, indexed [level][version]
+ECC_CODEWORDS_PER_BLOCK = (
+    (-1, 7, 10, 15, 20, 26, 18, 20, 24, 30, 18, 20, 24, 26, 30, 22, 24, 28, 30, 28, 28, 28, 28, 30, 30, 26, 28, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30),
+    (-1, 10, 16, 26, 18, 24, 16, 18, 22, 22, 26, 30, 22, 22, 24, 24, 28, 28, 26, 26, 26, 26, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28, 28),
+    (-1, 13, 22, 18, 26, 18, 24, 18, 22, 20, 24, 28, 26, 24, 20, 30, 24, 28, 28, 26, 30, 28, 30, 30, 30, 30, 28, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30),
+    (-1, 17, 28, 22, 16, 22, 28, 26, 26, 24, 28, 24, 28, 22, 24, 24, 30, 28, 28, 26, 28, 30, 24, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30, 30),
+)
+
+# Number of error-correction blocks, indexed [level][version]
+NUM_ERROR_CORRECTION_BLOCKS = (
+    (-1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 4, 4, 4, 4, 4, 6, 6, 6, 6, 7, 8, 8, 9, 9, 10, 12, 12, 12, 13, 14, 15, 16, 17, 18, 19, 19, 20, 21, 22, 24, 25),
+    (-1, 1, 1, 1, 2, 2, 4, 4, 4, 5, 5, 5, 8, 9, 9, 10, 10, 11, 13, 14, 16, 17, 17, 18, 20, 21, 23, 25, 26, 28, 29, 31, 33, 35, 37, 38, 40, 43, 45, 47, 49),
+    (-1, 1, 1, 2, 2, 4, 4, 6, 6, 8, 8, 8, 10, 12, 16, 12, 17, 16, 18, 21, 20, 23, 23, 25, 27, 29, 34, 34, 35, 38, 40, 43, 45, 48, 51, 53, 56, 59, 62, 65, 68),
+    (-1, 1, 1, 2, 4, 4, 4, 5, 6, 8, 8, 11, 11, 16, 16, 18, 16, 19, 21, 25, 25, 25, 34, 30, 32, 35, 37, 40, 42, 45, 48, 51, 54, 57, 60, 63, 66, 70, 74, 77, 81),
+)
+
+# ============ GALOIS FIELD / REED-SOLOMON ============
+
+def _build_gf_tables():
+    """Build exp/log tables for GF(256) with polynomial 0x11D"""
+    exp = [0] * 512
+    log = [0] * 256
+    x = 1
+    for i in range(255):
+        exp[i] = x
+        log[x] = i
+        x <<= 1
+        if x & 0x100:
+            x ^= 0x11D
+    for i in range(255, 512):
+        exp[i] = exp[i - 255]
+    return exp, log
+
+GF_EXP, GF_LOG = _build_gf_tables()
+
+@lru_cache(maxsize=None)
+def rs_generator(degree):
+    """Return the Reed-Solomon generator polynomial (highest term omitted)"""
+    poly = [0] * (degree - 1) + [1]
+    root = 1
+    for _ in range(degree):
+        for j in range(degree):
+            poly[j] = GF_EXP[GF_LOG[poly[j]] + GF_LOG[root]] if poly[j] else 0
+            if j + 1 < degree:
+                poly[j] ^= poly[j + 1]
+        root = GF_EXP[GF_LOG[root] + 1]
+    return tuple(poly)
+
+def rs_remainder(data, degree):
+    """Return the error-correction codewords for a data block"""
+    divisor = rs_generator(degree)
+    result = [0] * degree
+    for b in data:
+        factor = b ^ result.pop(0)
+        result.append(0)
+        if factor:
+            lf = GF_LOG[factor]
+            for i, coef in enumerate(divisor):
+                if coef:
+                    result[i] ^= GF_EXP[GF_LOG[coef] + lf]
+    return result
+
+# ============ VERSION GEOMETRY ============
+
+def num_raw_data_modules(version):
+    """Count the modules available for data and EC codewords"""
+    result = (16 * version + 128) * version + 64
+    if version >= 2:
+        num_align = version // 7 + 2
+        result -= (25 * num_align - 10) * num_align - 55
+        if version >= 7:
+            result -= 36
+    return result
+
+def num_data_codewords(version, ec):
+    """Count the data codewords for a version and EC level"""
+    lvl = EC_LEVELS.index(ec)
+    return (num_raw_data_modules(version) // 8
+            - ECC_CODEWORDS_PER_BLOCK[lvl][version] * NUM_ERROR_CORRECTION_BLOCKS[lvl][version])
+
+def alignment_positions(version, size):
+    """Return the row/column centres of the alignment patterns"""
+    if version == 1:
+        return []
+    num_align = version // 7 + 2
+    step = (version * 8 + num_align * 3 + 5) // (num_align * 4 - 4) * 2
+    result = [size - 7 - i * step for i in range(num_align - 1)] + [6]
+    return sorted(result)
+
+def _format_bits(ec, mask):
+    """Return the 15-bit BCH-protected format word"""
+    data = EC_FORMAT_BITS[ec] << 3 | mask
+    rem = data
+    for _ in range(10):
+        rem = (rem << 1) ^ ((rem >> 9) * 0x537)
+    return (data << 10 | rem) ^ 0x5412
+
+def _version_bits(version):
+    """Return the 18-bit BCH-protected version word"""
+    rem = version
+    for _ in range(12):
+        rem = (rem << 1) ^ ((rem >> 11) * 0x1F25)
+    return version << 12 | rem
+
+@lru_cache(maxsize=None)
+def function_template(version):
+    """Return (modules, is_function) arrays with all function patterns drawn"""
+    size = version * 4 + 17
+    modules = np.zeros((size, size), dtype=bool)
+    is_function = np.zeros((size, size), dtype=bool)
+
+    # Timing patterns
+    modules[6, :] = np.arange(size) % 2 == 0
+    modules[:, 6] = np.arange(size) % 2 == 0
+    is_function[6, :] = True
+    is_function[:, 6] = True
+
+    # Finder patterns plus separators
+    ring = np.maximum(np.abs(np.arange(-4, 5))[:, None], np.abs(np.arange(-4, 5))[None, :])
+    finder = (ring != 2) & (ring != 4)
+    for cy, cx in ((3, 3), (3, size - 4), (size - 4, 3)):
+        y0, x0 = cy - 4, cx - 4
+        ys = slice(max(y0, 0), min(y0 + 9, size))
+        xs = slice(max(x0, 0), min(x0 + 9, size))
+        modules[ys, xs] = finder[ys.start - y0:ys.stop - y0, xs.start - x0:xs.stop - x0]
+        is_function[ys, xs] = True
+
+    # Alignment patterns
+    positions = alignment_positions(version, size)
+    small_ring = np.maximum(np.abs(np.arange(-2, 3))[:, None], np.abs(np.arange(-2, 3))[None, :])
+    align = small_ring != 1
+    last = len(positions) - 1
+    for i, cy in enumerate(positions):
+        for j, cx in enumerate(positions):
+            if (i, j) in ((0, 0), (0, last), (last, 0)):
+                continue
+            modules[cy - 2:cy + 3, cx - 2:cx + 3] = align
+            is_function[cy - 2:cy + 3, cx - 2:cx + 3] = True
+
+    # Reserve format areas (filled per mask) and the dark module
+    is_function[8, :9] = True
+    is_function[:9, 8] = True
+    is_function[8, size - 8:] = True
+    is_function[size - 8:, 8] = True
+    modules[size - 8, 8] = True
+
+    # Version information
+    if version >= 7:
+        bits = _version_bits(version)
+        for i in range(18):
+            bit = bool((bits >> i) & 1)
+            a, b = size - 11 + i % 3, i // 3
+            modules[b, a] = modules[a, b] = bit
+            is_function[b, a] = is_function[a, b] = True
+
+    modules.flags.writeable = False
+    is_function.flags.writeable = False
+    return modules, is_function
+
+@lru_cache(maxsize=None)
+def data_placement(version):
+    """Return (rows, cols) of data modules in zigzag placement order"""
+    _, is_function = function_template(version)
+    size = is_function.shape[0]
+    rows, cols = [], []
+    right = size - 1
+    while right >= 1:
+        if right == 6:
+            right = 5
+        upward = ((right + 1) & 2) == 0
+        for vert in range(size):
+            y = size - 1 - vert if upward else vert
+            for x in (right, right - 1):
+                if not is_function[y, x]:
+                    rows.append(y)
+                    cols.append(x)
+        right -= 2
+    return np.array(rows), np.array(cols)
+
+@lru_cache(maxsize=None)
+def mask_patterns(size):
+    """Return the eight mask patterns as a (8, size, size) boolean array"""
+    y, x = np.indices((size, size))
+    return np.stack([
+        (x + y) % 2 == 0,
+        y % 2 == 0,
+        x % 3 == 0,
+        (x + y) % 3 == 0,
+        (x // 3 + y // 2) % 2 == 0,
+        x * y % 2 + x * y % 3 == 0,
+        (x * y % 2 + x * y % 3) % 2 == 0,
+        ((x + y) % 2 + x * y % 3) % 2 == 0,
+    ])
+
+# ============ ENCODING ============
+
+def choose_version(payload, ec):
+    """Return the smallest version that holds the payload in byte mode"""
+    for version in range(1, 41):
+        count_bits = 8 if version < 10 else 16
+        if 4 + count_bits + len(payload) * 8 <= num_data_codewords(version, ec) * 8:
+            return version
+    raise ValueError(f"Payload too long for a QR code: {len(payload)} bytes")
+
+def encode_codewords(payload, version, ec):
+    """Return the interleaved data + EC codewords for a byte-mode payload"""
+    lvl = EC_LEVELS.index(ec)
+    capacity = num_data_codewords(version, ec)
+    count_bits = 8 if version < 10 else 16
+
+    bits = [0, 1, 0, 0] + [(len(payload) >> i) & 1 for i in reversed(range(count_bits))]
+    bits += np.unpackbits(np.frombuffer(payload, dtype=np.uint8)).tolist()
+    bits += [0] * min(4, capacity * 8 - len(bits))
+    bits += [0] * (-len(bits) % 8)
+    data = np.packbits(np.array(bits, dtype=np.uint8)).tolist()
+    pad = 0xEC
+    while len(data) < capacity:
+        data.append(pad)
+        pad ^= 0xEC ^ 0x11
+
+    num_blocks = NUM_ERROR_CORRECTION_BLOCKS[lvl][version]
+    block_ecc_len = ECC_CODEWORDS_PER_BLOCK[lvl][version]
+    raw_codewords = num_raw_data_modules(version) // 8
+    num_short_blocks = num_blocks - raw_codewords % num_blocks
+    short_block_len = raw_codewords // num_blocks
+
+    blocks = []
+    k = 0
+    for i in range(num_blocks):
+        length = short_block_len - block_ecc_len + (0 if i < num_short_blocks else 1)
+        dat = data[k:k + length]
+        k += length
+        ecc = rs_remainder(dat, block_ecc_len)
+        if i < num_short_blocks:
+            dat = dat + [0]
+        blocks.append(dat + ecc)
+
+    result = []
+    for i in range(len(blocks[0])):
+        for j, block in enumerate(blocks):
+            if i != short_block_len - block_ecc_len or j >= num_short_blocks:
+                result.append(block[i])
+    return bytes(result)
+
+def _draw_format(modules, ec, mask):
+    """Write both copies of the format word into the matrix"""
+    size = modules.shape[0]
+    bits = _format_bits(ec, mask)
+    bit = [bool((bits >> i) & 1) for i in range(15)]
+    for i in range(6):
+        modules[i, 8] = bit[i]
+    modules[7, 8] = bit[6]
+    modules[8, 8] = bit[7]
+    modules[8, 7] = bit[8]
+    for i in range(9, 15):
+        modules[8, 14 - i] = bit[i]
+    for i in range(8):
+        modules[8, size - 1 - i] = bit[i]
+    for i in range(8, 15):
+        modules[size - 15 + i, 8] = bit[i]
+    modules[size - 8, 8] = True
+
+def _runs_penalty(modules):
+    """Penalty for row runs of five or more same-coloured modules (rule 1)"""
+    # A separator column keeps runs from wrapping onto the next row
+    rows = np.pad(modules.astype(np.int8), ((0, 0), (0, 1)), constant_values=2).ravel()
+    edges = np.flatnonzero(np.diff(rows)) + 1
+    lengths = np.diff(np.concatenate(([0], edges, [rows.size])))
+    long_runs = lengths[lengths >= 5]
+    return int((long_runs - 2).sum())
+
+FINDER_LIKE = (
+    np.array([1, 0, 1, 1, 1, 0, 1, 0, 0, 0, 0], dtype=bool),
+    np.array([0, 0, 0, 0, 1, 0, 1, 1, 1, 0, 1], dtype=bool),
+)
+
+def penalty(modules):
+    """Score a masked matrix using the four standard penalty rules"""
+    score = _runs_penalty(modules) + _runs_penalty(modules.T)
+
+    blocks = modules[:-1, :-1]
+    same = (blocks == modules[1:, :-1]) & (blocks == modules[:-1, 1:]) & (blocks == modules[1:, 1:])
+    score += 3 * int(same.sum())
+
+    padded = np.pad(modules, 4, constant_values=False)
+    for grid in (padded, padded.T):
+        windows = np.lib.stride_tricks.sliding_window_view(grid, 11, axis=1)
+        for pattern in FINDER_LIKE:
+            score += 40 * int((windows == pattern).all(axis=2).sum())
+
+    total = modules.size
+    dark = int(modules.sum())
+    k = (abs(dark * 20 - total * 10) + total - 1) // total - 1
+    score += 10 * k
+    return score
+
+@lru_cache(maxsize=256)
+def qr_matrix(payload, ec="M"):
+    """Return the QR module matrix (True = dark) for a text or bytes payload"""
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+    ec = ec.upper()
+    if ec not in EC_FORMAT_BITS:
+        raise ValueError(f"Unknown error-correction level: {ec}")
+
+    version = choose_version(payload, ec)
+    base, is_function = function_template(version)
+    codewords = encode_codewords(payload, version, ec)
+    rows, cols = data_placement(version)
+
+    bits = np.unpackbits(np.frombuffer(codewords, dtype=np.uint8)).astype(bool)
+    unmasked = base.copy()
+    unmasked[rows[:bits.size], cols[:bits.size]] = bits
+
+    best, best_score = None, None
+    for mask, pattern in enumerate(mask_patterns(base.shape[0])):
+        candidate = unmasked ^ (pattern & ~is_function)
+        _draw_format(candidate, ec, mask)
+        score = penalty(candidate)
+        if best_score is None or score < best_score:
+            best, best_score = candidate, score
+
+    best.flags.writeable = False
+    return best
+
+# ============ RENDERING ============
+
+def render_png(payload, size=512, ec="M"):
+    """Render a QR code as 1-bit PNG bytes, size x size pixels (at least one pixel per module and quiet zone)"""
+    key = cache_key("qr-png", payload, size, ec.upper())
+    cached = cache_get("qr", key, ".png")
+    if cached is not None:
+        return cached
+
+    from PIL import Image
+
+    matrix = np.pad(qr_matrix(payload, ec), QUIET_ZONE, constant_values=False)
+    scale = max(1, size // matrix.shape[0])
+    pixels = np.kron(~matrix, np.ones((scale, scale), dtype=bool))
+    margin = max(0, size - pixels.shape[0])
+    pixels = np.pad(pixels, ((margin // 2, margin - margin // 2),) * 2, constant_values=True)
+
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).convert("1").save(buffer, format="PNG", optimize=True)
+    data = buffer.getvalue()
+    cache_put("qr", key, data, ".png")
+    return data
+
+def qr_rectangles(payload, ec="M"):
+    """Merge dark modules into (row, col, height, width) rectangles"""
+    matrix = qr_matrix(payload, ec)
+    rects = []
+    open_runs = {}
+    for y, row in enumerate(matrix):
+        padded = np.concatenate(([False], row, [False])).astype(np.int8)
+        edges = np.flatnonzero(np.diff(padded))
+        runs = set(zip(edges[::2].tolist(), edges[1::2].tolist()))
+        for span in list(open_runs):
+            if span not in runs:
+                start_y = open_runs.pop(span)
+                rects.append((start_y, span[0], y - start_y, span[1] - span[0]))
+        for span in runs:
+            open_runs.setdefault(span, y)
+    for span, start_y in open_runs.items():
+        rects.append((start_y, span[0], matrix.shape[0] - start_y, span[1] - span[0]))
+    return rects
+
+def add_qr_picture(slide, payload, left, top, size, ec="M", dpi=300):
+    """Add a QR code to a slide as a cached PNG picture"""
+    from pptx.util import Emu
+
+    pixels = max(64, int(Emu(size).inches * dpi))
+    image = io.BytesIO(render_png(payload, pixels, ec))
+    return slide.shapes.add_picture(image, left, top, size, size)
+
+def _qr_geometry_xml(payload, ec):
+    """Build a DrawingML custom geometry with one closed sub-path per rectangle"""
+    modules = qr_matrix(payload, ec).shape[0] + 2 * QUIET_ZONE
+    parts = []
+    for y, x, h, w in qr_rectangles(payload, ec):
+        x += QUIET_ZONE
+        y += QUIET_ZONE
+        parts.append(
+            f'<a:moveTo><a:pt x="{x}" y="{y}"/></a:moveTo>'
+            f'<a:lnTo><a:pt x="{x + w}" y="{y}"/></a:lnTo>'
+            f'<a:lnTo><a:pt x="{x + w}" y="{y + h}"/></a:lnTo>'
+            f'<a:lnTo><a:pt x="{x}" y="{y + h}"/></a:lnTo>'
+            '<a:close/>'
+        )
+    return (
+        '<a:custGeom xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main">'
+        '<a:avLst/><a:gdLst/><a:ahLst/><a:cxnLst/><a:rect l="0" t="0" r="r" b="b"/>'
+        f'<a:pathLst><a:path w="{modules}" h="{modules}">{"".join(parts)}</a:path></a:pathLst>'
+        '</a:custGeom>'
+    )
+
+def add_qr_shapes(slide, payload, left, top, size, ec="M", color=None):
+    """Add a QR code to a slide as one native vector shape (quiet zone included)"""
+    from pptx.dml.color import RGBColor
+    from pptx.enum.shapes import MSO_SHAPE
+    from pptx.oxml import parse_xml
+
+    shape = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, left, top, size, size)
+    sp_pr = shape._element.spPr
+    sp_pr.replace(sp_pr.prstGeom, parse_xml(_qr_geometry_xml(payload, ec.upper())))
+    shape.fill.solid()
+    shape.fill.fore_color.rgb = color or RGBColor(0, 0, 0)
+    shape.line.fill.background()
+    shape.shadow.inherit = False
+    shape.name = "QR Code"
+    return shape
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Generate a QR code PNG")
+    parser.add_argument("payload", help="Text or URL to encode")
+    parser.add_argument("-o", "--output", default="qr.png", help="Output PNG path")
+    parser.add_argument("--size", type=int, default=512, help="Image edge in pixels")
+    parser.add_argument("--ec", default="M", choices=EC_LEVELS, help="Error-correction level")
+    args = parser.parse_args()
+
+    with open(args.output, "wb") as f:
+        f.write(render_png(args.payload, args.size, args.ec))
+    matrix = qr_matrix(args.payload, args.ec)
+    print(f"✓ QR code created: {args.output}")
+    print(f"✓ Version {(matrix.shape[0] - 17) // 4}, {matrix.shape[0]}x{matrix.shape[0]} modules, EC level {args.ec}")
+
+if __name__ == "__main__":
+    main()
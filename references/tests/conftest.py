@@ -0,0 +1,37 @@
+"""
+Shared setup for the presentation toolkit tests:
+- references/ on sys.path so the tool modules import as they do from the CLI
+- a throwaway build cache, so tests never read or fill references/.deck_cache
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REFERENCES = os.path.dirname(HERE)
+DECKS = os.path.join(REFERENCES, "decks")
+
+sys.path.insert(0, REFERENCES)
+os.environ["EPS_DECK_CACHE"] = tempfile.mkdtemp(prefix="eps-deck-tests-")
+os.environ.pop("EPS_DECK_CACHE_URL", None)
+os.environ.pop("EPS_DECK_CACHE_TOKEN", None)
+
+def content(title, *items):
+    """Return a content slide declaration"""
+    return {"kind": "content", "title": title, "content_list": list(items)}
+
+@pytest.fixture
+def make_deck(tmp_path):
+    """Return a function that builds a .pptx from slide declarations and returns its path"""
+    from deck_spec import build_presentation, compile_spec
+
+    def make(slides, name="deck", **spec):
+        path = str(tmp_path / f"{name}.pptx")
+        data = {"version": 1, "deck": name, "style": "tot", "slides": slides, **spec}
+        build_presentation(compile_spec(data, str(tmp_path / f"{name}.yaml"))).save(path)
+        return path
+
+    return make
@@ -0,0 +1,67 @@
+"""Agenda slides: slide-jump links, and their numbers after slicing and patching"""
+
+import xml.etree.ElementTree as ET
+
+import pytest
+from conftest import content
+
+from deck_package import NS_A, NS_R, open_package, read_rels, slide_part_names
+from deck_patch import DeckPatcher
+from deck_slice import slice_spec_deck
+from deck_spec import SLIDE_JUMP, compile_spec
+
+SLIDES = [
+    {"kind": "agenda", "title": "Agenda", "section": "Intro", "tags": ["common"]},
+    dict(content("Welcome", "Two days"), section="Intro", tags=["common"]),
+    dict(content("Routing", "Routes"), section="Day 1"),
+    dict(content("Lab: routes", "Exercise"), section="Day 1"),
+    dict(content("Queues", "Jobs"), section="Day 2"),
+    dict(content("Caching", "Redis"), section="Day 2"),
+    dict(content("Wrap-up", "Questions"), section="Close", tags=["common"]),
+]
+SLICES = {"day2": ["common", "Day 2"]}
+
+def agenda_entries(path, index=1):
+    """Return [(entry text, 1-based position of the slide it jumps to, or None)] of an agenda slide"""
+    with open_package(path) as zf:
+        parts = slide_part_names(zf)
+        part = parts[index - 1]
+        rels = read_rels(zf, part)
+        root = ET.fromstring(zf.read(part))
+    entries = []
+    for paragraph in root.iter(f"{{{NS_A}}}p"):
+        text = "".join(t.text or "" for t in paragraph.iter(f"{{{NS_A}}}t"))
+        if not text.startswith("•"):
+            continue
+        links = [link for link in paragraph.iter(f"{{{NS_A}}}hlinkClick") if link.get("action") == SLIDE_JUMP]
+        target = parts.index(rels[links[0].get(f"{{{NS_R}}}id")][1]) + 1 if links else None
+        entries.append((text, target))
+    return entries
+
+@pytest.fixture
+def deck(make_deck):
+    return make_deck(SLIDES, "course", slices=SLICES)
+
+def test_entries_jump_to_their_sections(deck):
+    assert agenda_entries(deck) == [("• Day 1 — slide 3", 3), ("• Day 2 — slide 5", 5), ("• Close — slide 7", 7)]
+
+def test_sliced_agenda_is_renumbered(deck, tmp_path):
+    spec = compile_spec({"version": 1, "deck": "course", "style": "tot", "slices": SLICES, "slides": SLIDES},
+                        str(tmp_path / "course.yaml"))
+    [(_, path, count)] = slice_spec_deck(spec, deck, ["day2"], str(tmp_path / "out"))
+    assert count == 5
+    assert agenda_entries(path) == [("• Day 1", None), ("• Day 2 — slide 3", 3), ("• Close — slide 5", 5)]
+
+def test_patched_agenda_is_renumbered(deck):
+    patcher = DeckPatcher(deck)
+    patcher.insert_slide(2, "content", title="Housekeeping", content_list=["Breaks"])
+    patcher.delete_slide(5)
+    patcher.save()
+    assert agenda_entries(deck) == [("• Day 1 — slide 4", 4), ("• Day 2 — slide 5", 5), ("• Close — slide 7", 7)]
+
+def test_unpatched_deck_keeps_its_numbers(deck, tmp_path):
+    out = str(tmp_path / "copy.pptx")
+    patcher = DeckPatcher(deck)
+    patcher.replace_slide(3, "content", title="Routing", content_list=["Named routes"])
+    patcher.save(out)
+    assert agenda_entries(out) == agenda_entries(deck)
@@ -0,0 +1,132 @@
+"""Build cache: the shared remote store and its client"""
+
+import os
+import threading
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import deck_cache
+from deck_cache import DIGEST_HEADER, RemoteCache, cache_key, digest, make_store
+
+KEY = cache_key("test", 1)
+
+@pytest.fixture(autouse=True)
+def local_cache(tmp_path, monkeypatch):
+    """Give every test an empty local cache"""
+    monkeypatch.setattr(deck_cache, "CACHE_DIR", str(tmp_path / "local"))
+
+def serve(server):
+    """Run an HTTP server in a thread; return its base URL"""
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+@pytest.fixture
+def store(tmp_path):
+    """Start the stand-in store on loopback; yield (url, root)"""
+    root = str(tmp_path / "store")
+    server = make_store(root, "127.0.0.1", 0, token="s3cret")
+    yield serve(server), root
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def corrupting_store():
+    """Start a store that answers every GET with a body that does not match its digest header"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header(DIGEST_HEADER, digest(b"the real entry"))
+            self.send_header("Content-Length", "8")
+            self.end_headers()
+            self.wfile.write(b"tampered")
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    yield serve(server)
+    server.shutdown()
+    server.server_close()
+
+def test_upload_then_hit_on_another_machine(store):
+    url, _ = store
+    RemoteCache(url, "s3cret")._put("pages", KEY, b"png bytes", ".png")
+    client = RemoteCache(url)
+    assert client.fetch("pages", KEY, ".png") == b"png bytes"
+    assert client.fetched == 1
+    with open(deck_cache.cache_path("pages", KEY, ".png"), "rb") as f:
+        assert f.read() == b"png bytes"     # kept locally
+
+def test_miss(store):
+    url, _ = store
+    client = RemoteCache(url)
+    assert client.fetch("pages", KEY, ".png") is None
+    assert not client.down
+
+def test_digest_mismatch_is_discarded(corrupting_store, capsys):
+    client = RemoteCache(corrupting_store)
+    assert client.fetch("pages", KEY, ".png") is None
+    assert client.rejected == 1
+    assert not os.path.exists(deck_cache.cache_path("pages", KEY, ".png"))
+    assert "discarded corrupt" in capsys.readouterr().err
+
+def test_cache_get_falls_back_after_a_corrupt_fetch(corrupting_store, monkeypatch):
+    monkeypatch.setattr(deck_cache, "REMOTE_URL", corrupting_store)
+    monkeypatch.setattr(deck_cache, "_remote", RemoteCache(corrupting_store))
+    assert deck_cache.cache_get("pages", KEY, ".png") is None
+    deck_cache.cache_put("pages", KEY, b"rebuilt", ".png")
+    assert deck_cache.cache_get("pages", KEY, ".png") == b"rebuilt"
+
+def test_bit_rot_in_the_store_is_not_served(store):
+    url, root = store
+    RemoteCache(url, "s3cret")._put("pages", KEY, b"png bytes", ".png")
+    sha = digest(b"png bytes")
+    with open(os.path.join(root, "objects", sha[:2], sha), "wb") as f:
+        f.write(b"rotten")
+    assert RemoteCache(url).fetch("pages", KEY, ".png") is None
+
+def put(url, name, data, token=None):
+    """PUT one entry; return the HTTP status"""
+    headers = {DIGEST_HEADER: digest(data)}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    request = urllib.request.Request(f"{url}/{name}", data=data, method="PUT", headers=headers)
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+def test_put_needs_the_token(store):
+    url, _ = store
+    assert put(url, f"pages/{KEY}.png", b"x") == 403
+    assert put(url, f"pages/{KEY}.png", b"x", "wrong") == 403
+    assert put(url, f"pages/{KEY}.png", b"x", "s3cret") == 201
+
+def test_specs_never_leave_the_machine(store, monkeypatch):
+    url, _ = store
+    assert put(url, f"specs/{KEY}.marshal", b"x", "s3cret") == 400
+    client = RemoteCache(url, "s3cret")
+    monkeypatch.setattr(deck_cache, "REMOTE_URL", url)
+    monkeypatch.setattr(deck_cache, "_remote", client)
+    deck_cache.cache_put("specs", KEY, b"marshal blob", ".marshal")
+    deck_cache.flush_remote()
+    assert client.uploaded == 0
+    os.remove(deck_cache.cache_path("specs", KEY, ".marshal"))
+    assert deck_cache.cache_get("specs", KEY, ".marshal") is None
+    assert deck_cache.cache_prefetch("specs", [KEY], ".marshal") == 0
+
+def test_store_refuses_other_hosts_without_a_token(tmp_path):
+    with pytest.raises(ValueError, match="EPS_DECK_CACHE_TOKEN"):
+        make_store(str(tmp_path), "0.0.0.0", 0)
+
+def test_unreachable_store_disables_the_client(capsys):
+    client = RemoteCache("http://127.0.0.1:9")
+    assert client.fetch("pages", KEY, ".png") is None
+    assert client.down
+    assert "unreachable" in capsys.readouterr().err
@@ -0,0 +1,57 @@
+"""Deck delta patches: diff, apply and content-matched renames"""
+
+import os
+import zipfile
+
+import pytest
+from conftest import content
+
+from deck_delta import apply_patch, build_manifest, make_patch, write_manifest
+
+SLIDES = [content(f"Topic {n}", f"Point {n}.1", f"Point {n}.2") for n in range(1, 9)]
+
+def test_roundtrip_rebuilds_the_new_deck(make_deck, tmp_path):
+    old = make_deck(SLIDES, "old")
+    new = make_deck(SLIDES[:3] + [content("Topic 3b", "Changed")] + SLIDES[4:], "new")
+    patch = str(tmp_path / "update.pptxpatch")
+    index = make_patch(old, new, patch)
+    assert index["changed_slides"] == [4]
+
+    out = str(tmp_path / "out.pptx")
+    apply_patch(old, patch, out)
+    assert build_manifest(out)["digest"] == build_manifest(new)["digest"]
+
+def test_inserted_slide_copies_renumbered_parts(make_deck, tmp_path):
+    old = make_deck(SLIDES, "old")
+    new = make_deck(SLIDES[:2] + [content("Inserted", "New")] + SLIDES[2:], "new")
+    patch = str(tmp_path / "update.pptxpatch")
+    index = make_patch(old, new, patch)
+
+    # Slides 3-8 moved to slide4-9.xml with unchanged content: copied from the base, not shipped
+    for n in range(4, 10):
+        assert index["copied"][f"ppt/slides/slide{n}.xml"] == f"ppt/slides/slide{n - 1}.xml"
+    with zipfile.ZipFile(patch) as zf:
+        shipped = {name for name in zf.namelist() if name.startswith("parts/ppt/slides/")}
+    assert shipped == {"parts/ppt/slides/slide3.xml"}
+    assert os.path.getsize(patch) < os.path.getsize(new) / 2
+
+    out = str(tmp_path / "out.pptx")
+    apply_patch(old, patch, out)
+    assert build_manifest(out)["digest"] == build_manifest(new)["digest"]
+
+def test_diff_from_a_manifest(make_deck, tmp_path):
+    old = make_deck(SLIDES, "old")
+    new = make_deck(SLIDES[:-1], "new")
+    patch = str(tmp_path / "update.pptxpatch")
+    index = make_patch(write_manifest(old), new, patch)
+    assert "ppt/slides/slide8.xml" in index["removed"]
+    apply_patch(old, patch, str(tmp_path / "out.pptx"))
+
+def test_patch_refuses_another_base(make_deck, tmp_path):
+    old = make_deck(SLIDES, "old")
+    new = make_deck(SLIDES[1:], "new")
+    patch = str(tmp_path / "update.pptxpatch")
+    make_patch(old, new, patch)
+    with pytest.raises(ValueError, match="base digest mismatch"):
+        apply_patch(new, patch, str(tmp_path / "out.pptx"))
+    assert not os.path.exists(tmp_path / "out.pptx")
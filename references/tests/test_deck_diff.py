@@ -0,0 +1,64 @@
+"""Structural deck diff: what counts as a change, and what is save noise"""
+
+import zipfile
+
+import pytest
+from conftest import content
+
+from deck_diff import diff_decks
+
+SLIDES = [
+    {"kind": "agenda", "title": "Agenda"},
+    dict(content("Routing", "Routes"), section="Day 1"),
+    dict(content("Queues", "Jobs"), section="Day 2"),
+    dict(content("Caching", "Redis"), section="Day 2"),
+]
+CREATION_ID = ('<p:extLst><p:ext uri="{{BB962C8B-B14F-4D97-AF65-F5344CB8AC3E}}">'
+               '<p14:creationId xmlns:p14="http://schemas.microsoft.com/office/powerpoint/2010/main" val="{}"/>'
+               '</p:ext></p:extLst></p:sld>')
+
+def rewrite(path, member, edit):
+    """Replace one part of a package with edit(its text)"""
+    with zipfile.ZipFile(path) as zf:
+        parts = {name: zf.read(name) for name in zf.namelist()}
+    parts[member] = edit(parts[member].decode("utf-8")).encode("utf-8")
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in parts.items():
+            zf.writestr(name, data)
+
+@pytest.fixture
+def decks(make_deck):
+    return make_deck(SLIDES, "old"), make_deck(SLIDES, "new")
+
+def test_rebuilt_deck_is_unchanged(decks):
+    report = diff_decks(*decks)
+    assert report["summary"] == {"added": 0, "removed": 0, "modified": 0, "unchanged": 4}
+
+def test_text_change_and_added_slide(make_deck):
+    old = make_deck(SLIDES, "old")
+    new = make_deck(SLIDES[:2] + [dict(content("Queues", "Jobs", "Horizon"), section="Day 2"),
+                                  content("Testing", "Pest")] + SLIDES[3:], "new")
+    report = diff_decks(old, new)
+    assert report["summary"] == {"added": 1, "removed": 0, "modified": 1, "unchanged": 3}
+    queues = next(change for change in report["changes"] if change["title"] == "Queues")
+    assert "+Horizon" in queues["text_diff"]
+
+def test_retargeted_slide_link_is_a_change(decks):
+    old, new = decks
+    rewrite(new, "ppt/slides/_rels/slide1.xml.rels", lambda text: text.replace('"slide3.xml"', '"slide4.xml"'))
+    report = diff_decks(old, new)
+    assert report["summary"]["modified"] == 1
+    assert report["changes"][0]["new_index"] == 1
+
+def test_creation_ids_are_ignored(decks):
+    old, new = decks
+    rewrite(old, "ppt/slides/slide2.xml", lambda text: text.replace("</p:sld>", CREATION_ID.format(1)))
+    rewrite(new, "ppt/slides/slide2.xml", lambda text: text.replace("</p:sld>", CREATION_ID.format(2)))
+    assert diff_decks(old, new)["summary"]["unchanged"] == 4
+
+def test_other_extensions_are_compared(decks):
+    old, new = decks
+    extension = ('<p:extLst><p:ext uri="{00000000-0000-0000-0000-000000000000}"><p:custData r:id="rId9"/></p:ext>'
+                 '</p:extLst></p:sld>')
+    rewrite(new, "ppt/slides/slide2.xml", lambda text: text.replace("</p:sld>", extension))
+    assert diff_decks(old, new)["summary"]["modified"] == 1
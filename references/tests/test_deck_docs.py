@@ -0,0 +1,42 @@
+"""Companion documents: generated blocks stay in step with the slides"""
+
+import pytest
+from conftest import content
+
+import deck_docs
+from deck_docs import update_companions
+from deck_spec import compile_spec
+
+SLIDES = [dict(content("Routing", "Routes"), section="Day 1"), dict(content("Queues", "Jobs"), section="Day 2")]
+DOC = ("# Course\n\nHand-written intro.\n\n"
+       "<!-- eps-decks:slide-index course digest= -->\n<!-- /eps-decks:slide-index -->\n")
+
+@pytest.fixture
+def doc(tmp_path):
+    """Return a companion document freshly filled from a two-slide spec, and the spec"""
+    spec = compile_spec({"version": 1, "deck": "course", "style": "tot", "slides": SLIDES},
+                        str(tmp_path / "course.yaml"))
+    path = tmp_path / "README.md"
+    path.write_text(DOC, encoding="utf-8")
+    assert update_companions([spec], [str(path)]) == {str(path): ["slide-index course"]}
+    return path, spec
+
+def test_blocks_are_filled_and_then_up_to_date(doc):
+    path, spec = doc
+    text = path.read_text(encoding="utf-8")
+    assert "1. **Routing**" in text and text.startswith("# Course\n\nHand-written intro.")
+    assert update_companions([spec], [str(path)], check=True) == {str(path): []}
+
+def test_hand_edit_inside_a_block_is_stale(doc):
+    path, spec = doc
+    original = path.read_text(encoding="utf-8")
+    path.write_text(original.replace("**Queues**", "**Queues (edited)**"), encoding="utf-8")
+    assert update_companions([spec], [str(path)], check=True) == {str(path): ["slide-index course"]}
+    update_companions([spec], [str(path)])
+    assert path.read_text(encoding="utf-8") == original
+
+def test_renderer_change_is_stale(doc, monkeypatch):
+    path, spec = doc
+    render = deck_docs.BLOCKS["slide-index"]
+    monkeypatch.setitem(deck_docs.BLOCKS, "slide-index", lambda spec, doc_dir: render(spec, doc_dir) + ["", "(end)"])
+    assert update_companions([spec], [str(path)], check=True) == {str(path): ["slide-index course"]}
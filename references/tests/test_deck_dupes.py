@@ -0,0 +1,30 @@
+"""Near-duplicate detection: which guide text takes part"""
+
+from deck_dupes import extract_documents
+
+GUIDE = """\
+# Queues
+
+Horizon supervises the queue workers and retries failed jobs.
+
+## Slide Index
+
+<!-- eps-decks:slide-index course digest=0123456789abcdef -->
+#### Day 2 (Slides 3-4)
+
+3. **Queues**
+<!-- /eps-decks:slide-index -->
+
+## Caching
+
+Cache tags let you flush one tenant at a time.
+"""
+
+def test_generated_blocks_are_left_out(tmp_path):
+    guide = tmp_path / "GUIDE.md"
+    guide.write_text(GUIDE, encoding="utf-8")
+    documents = {doc.locator: doc.text for doc in extract_documents(str(guide))}
+    assert "#day-2-slides-3-4" not in documents
+    assert "Slides 3-4" not in "".join(documents.values())
+    assert "Horizon supervises" in documents["#queues"]
+    assert "Cache tags" in documents["#caching"]
@@ -0,0 +1,136 @@
+"""Build farm: retries when a worker dies or misbehaves, and the shared-secret handshake"""
+
+import asyncio
+import os
+import socket
+
+import pytest
+
+import deck_cache
+from deck_farm import MAX_HEADER, Coordinator, DeckJob, HandshakeError, proof, read_message, send_message, work
+
+SECRET = "s3cret"
+SPEC = """\
+version: 1
+deck: farm
+style: tot
+slides:
+  - kind: content
+    title: Connection Pools
+    content_list: [Size the pool to the workers]
+  - kind: content
+    title: Timeouts
+    content_list: [Fail fast on a dead replica]
+"""
+
+@pytest.fixture(autouse=True)
+def local_cache(tmp_path, monkeypatch):
+    """Give every test an empty local cache so every page is rendered"""
+    monkeypatch.setattr(deck_cache, "CACHE_DIR", str(tmp_path / "cache"))
+
+@pytest.fixture
+def coordinator(tmp_path):
+    """Return a Coordinator for a two-slide deck, without the PDF export"""
+    path = tmp_path / "farm.yaml"
+    path.write_text(SPEC, encoding="utf-8")
+    return Coordinator([DeckJob(str(path), str(tmp_path / "out"), 320, 80)], pdf=False, timeout=60, secret=SECRET)
+
+def free_port():
+    """Return a loopback port nothing listens on"""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+async def take_task(port, secret=SECRET):
+    """Handshake like a worker and receive one task; return (task header, writer)"""
+    for _ in range(50):
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            break
+        except OSError:
+            await asyncio.sleep(0.1)
+    challenge, _ = await read_message(reader)
+    await send_message(writer, {"op": "hello", "node": "stub", "pid": 0, "nonce": "n",
+                                "proof": proof(secret, challenge["nonce"], "worker")})
+    await read_message(reader)
+    header, _ = await read_message(reader)
+    return header, writer
+
+async def build(coordinator, *workers):
+    """Run the coordinator while each worker coroutine (given the port) takes its turn"""
+    port = free_port()
+    server = asyncio.create_task(coordinator.run("127.0.0.1", port))
+    for worker in workers:
+        await worker(port)
+    await asyncio.wait_for(server, 120)
+
+def assert_built(coordinator, tmp_path):
+    """Check every task finished and the deck and thumbnails were written"""
+    assert all(task.status == "done" for task in coordinator.tasks)
+    assert os.path.isfile(tmp_path / "out" / "farm.pptx")
+    assert sorted(os.listdir(tmp_path / "out" / "farm_thumbs")) == ["slide-001.png", "slide-002.png"]
+
+def test_task_of_killed_worker_is_retried(coordinator, tmp_path):
+    async def killed(port):
+        header, writer = await take_task(port)
+        assert header["op"] == "task"
+        writer.transport.abort()
+
+    async def healthy(port):
+        assert await work("127.0.0.1", port, secret=SECRET) == len(coordinator.tasks)
+
+    asyncio.run(build(coordinator, killed, healthy))
+    assert coordinator.retried == 1
+    assert coordinator.tasks[0].attempts == 2
+    assert_built(coordinator, tmp_path)
+
+def test_bad_output_names_are_never_written(coordinator, tmp_path):
+    async def malicious(port):
+        header, writer = await take_task(port)
+        await send_message(writer, {"op": "done", "id": header["id"]}, {"../../escaped.pptx": b"PK\x03\x04"})
+        writer.close()
+
+    async def healthy(port):
+        await work("127.0.0.1", port, secret=SECRET)
+
+    asyncio.run(build(coordinator, malicious, healthy))
+    assert coordinator.retried == 1
+    assert not (tmp_path.parent / "escaped.pptx").exists()
+    assert_built(coordinator, tmp_path)
+
+def test_malformed_reply_is_retried(coordinator, tmp_path):
+    async def garbled(port):
+        _, writer = await take_task(port)
+        writer.write((MAX_HEADER + 1).to_bytes(4, "big") + b"{")
+        await writer.drain()
+        writer.close()
+
+    async def healthy(port):
+        await work("127.0.0.1", port, secret=SECRET)
+
+    asyncio.run(build(coordinator, garbled, healthy))
+    assert coordinator.retried == 1
+    assert_built(coordinator, tmp_path)
+
+def test_unwritable_output_fails_the_task(coordinator, tmp_path):
+    (tmp_path / "out").write_text("not a folder", encoding="utf-8")
+
+    async def healthy(port):
+        await work("127.0.0.1", port, secret=SECRET)
+
+    asyncio.run(build(coordinator, healthy))
+    assert coordinator.jobs[0].failed
+    assert not coordinator.remaining()
+    assert all(task.status == "failed" for task in coordinator.tasks)
+
+def test_worker_without_the_secret_is_rejected(coordinator, tmp_path):
+    async def impostor(port):
+        with pytest.raises(HandshakeError):
+            await work("127.0.0.1", port, secret="wrong")
+
+    async def healthy(port):
+        await work("127.0.0.1", port, secret=SECRET)
+
+    asyncio.run(build(coordinator, impostor, healthy))
+    assert all(task.attempts == 1 for task in coordinator.tasks)
+    assert_built(coordinator, tmp_path)
@@ -0,0 +1,41 @@
+"""Bilingual builds: what goes into the translation memory"""
+
+import pytest
+from conftest import content
+
+from deck_i18n import TranslationMemory, string_key, translate_slide
+from deck_spec import AGENDA_NUMBER, compile_spec
+
+SLIDES = [
+    {"kind": "agenda", "title": "Agenda", "depth": 2},
+    dict(content("Routing", "Routes"), section="Day 1"),
+    dict(content("Queues", "Jobs"), section="Day 2"),
+]
+
+@pytest.fixture
+def memory(tmp_path):
+    memory = TranslationMemory("ms", str(tmp_path / "ms.json"))
+    for source, target in (("Agenda", "Agenda Kursus"), ("Day 1", "Hari 1"), ("Routing", "Penghalaan")):
+        memory.entries[string_key(source)] = {"source": source, "target": target}
+    return memory
+
+def agenda(slides, tmp_path):
+    """Return the resolved agenda slide of a deck"""
+    return compile_spec({"version": 1, "deck": "course", "style": "tot", "slides": slides},
+                        str(tmp_path / "course.yaml")).slides[0]
+
+def test_agenda_labels_are_translated_and_numbers_kept(memory, tmp_path):
+    record = translate_slide(agenda(SLIDES, tmp_path), memory, "course")
+    assert record.fields["title"] == "Agenda Kursus"
+    assert record.fields["content_list"] == ["• Hari 1 — slide 2", "   • Penghalaan — slide 2",
+                                             "• Day 2 — slide 3", "   • Queues — slide 3"]
+    assert all(AGENDA_NUMBER.search(line) for line in record.fields["content_list"])
+    assert record.links == agenda(SLIDES, tmp_path).links
+
+def test_slide_moves_add_no_strings(memory, tmp_path):
+    translate_slide(agenda(SLIDES, tmp_path), memory, "course")
+    before = dict(memory.entries)
+    moved = SLIDES[:1] + [content("Welcome", "Hello")] + SLIDES[1:]
+    translate_slide(agenda(moved, tmp_path), memory, "course")
+    assert memory.entries == before
+    assert not any(" — slide " in entry["source"] for entry in memory.entries.values())
@@ -0,0 +1,93 @@
+"""Link checker: results against a stub web server, and the result cache"""
+
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from deck_links import MAX_REDIRECTS, check_links, collect_links, describe, is_broken
+
+class Handler(BaseHTTPRequestHandler):
+    """Answers each path the way some real site in the guides does"""
+
+    requests = []
+
+    def answer(self):
+        self.requests.append((self.command, self.path))
+        if self.path == "/ok":
+            self.send_response(200)
+        elif self.path == "/moved":
+            self.send_response(301)
+            self.send_header("Location", "/ok")
+        elif self.path == "/loop":
+            self.send_response(302)
+            self.send_header("Location", "/loop")
+        elif self.path == "/no-head" and self.command == "HEAD":
+            self.send_response(405)
+        elif self.path == "/no-head":
+            self.send_response(200)
+        else:
+            self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    do_HEAD = do_GET = answer
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def site():
+    """Start the stub site on loopback; yield its base URL"""
+    Handler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def check(tmp_path):
+    """Return a check_links bound to a throwaway result cache"""
+    def run(urls, **options):
+        return check_links(urls, cache_path=str(tmp_path / "links.bin"), timeout=5, **options)
+    return run
+
+def test_results(site, check):
+    urls = [f"{site}/{path}" for path in ("ok", "moved", "missing", "loop", "no-head")]
+    results, fetched = check(urls)
+    assert fetched == 5
+    ok, moved, missing, loop, no_head = (results[url] for url in urls)
+    assert not is_broken(ok) and ok[1:3] == (200, f"{site}/ok")
+    assert not is_broken(moved) and moved[1:3] == (200, f"{site}/ok")
+    assert is_broken(missing) and describe(missing) == "HTTP 404"
+    assert is_broken(loop) and loop[3] == f"more than {MAX_REDIRECTS} redirects"
+    assert not is_broken(no_head) and no_head[1] == 200
+    assert Handler.requests.count(("GET", "/no-head")) == 1
+
+def test_refused_connection(check):
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        url = f"http://127.0.0.1:{s.getsockname()[1]}/"
+    result = check([url])[0][url]
+    assert is_broken(result) and result[1] == 0 and result[3]
+
+def test_cached_results_are_reused(site, check):
+    urls = [f"{site}/ok", f"{site}/missing"]
+    check(urls)
+    Handler.requests.clear()
+    results, fetched = check(urls)
+    assert fetched == 0 and Handler.requests == []
+    assert is_broken(results[f"{site}/missing"])
+    _, fetched = check(urls, refresh=True)
+    assert fetched == 2
+
+def test_collect_skips_local_hosts(tmp_path):
+    guide = tmp_path / "guide.md"
+    guide.write_text("See https://laravel.com/docs/queues, http://localhost:8000/ and https://laravel.com/docs/queues.\n",
+                     encoding="utf-8")
+    links, skipped = collect_links([str(guide)])
+    assert list(links) == ["https://laravel.com/docs/queues"]
+    assert len(links["https://laravel.com/docs/queues"]) == 2
+    assert skipped == 1
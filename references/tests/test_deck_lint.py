@@ -0,0 +1,32 @@
+"""Deck linter: default limits and the shipped decks"""
+
+from conftest import content
+
+from deck_lint import MAX_BULLETS, MAX_CODE_LINES, MAX_CODE_WIDTH, default_specs, lint_specs
+from deck_spec import compile_spec, load_deck_spec
+
+LIMITS = {"max_bullets": MAX_BULLETS, "max_code_lines": MAX_CODE_LINES, "max_code_width": MAX_CODE_WIDTH}
+
+def rules(slides, tmp_path):
+    """Return the rules a deck of slides breaks"""
+    spec = compile_spec({"version": 1, "deck": "lint", "style": "tot", "slides": slides}, str(tmp_path / "lint.yaml"))
+    report, _ = lint_specs([spec], LIMITS, cache_path=str(tmp_path / "lint.bin"))
+    return [rule for _, rule, _ in report[spec]]
+
+def test_limits_fill_the_layout_boxes():
+    # 9pt Courier in the 9 x 5.4in code box; 14pt bullets in the troubleshooting body box
+    assert (MAX_CODE_LINES, MAX_CODE_WIDTH, MAX_BULLETS) == (35, 117, 13)
+
+def test_shipped_decks_are_clean(tmp_path):
+    report, _ = lint_specs([load_deck_spec(path) for path in default_specs()], LIMITS,
+                           cache_path=str(tmp_path / "lint.bin"))
+    assert {spec.deck: findings for spec, findings in report.items() if findings} == {}
+
+def test_overflowing_code(tmp_path):
+    code = {"kind": "code", "title": "Long", "code_snippet": "\n".join(["$x = 1;"] * (MAX_CODE_LINES + 1))}
+    wide = {"kind": "code", "title": "Wide", "code_snippet": "$x = '" + "x" * MAX_CODE_WIDTH + "';"}
+    assert rules([code, wide], tmp_path) == ["long-code", "wide-code"]
+
+def test_too_many_bullets(tmp_path):
+    items = [f"• Point {n}" for n in range(MAX_BULLETS + 1)]
+    assert rules([content("Fits", *items[:-1]), content("Overflows", *items)], tmp_path) == ["too-many-bullets"]
@@ -0,0 +1,71 @@
+"""In-place slide patching: insert, delete and replace without re-saving through python-pptx"""
+
+import zipfile
+
+import pytest
+from conftest import content
+
+from deck_package import open_package, slide_part_names, slide_text
+from deck_patch import DeckPatcher, patch_deck
+from deck_validate import validate_package
+
+SLIDES = [dict(content(f"Topic {n}", f"Point {n}"), section="Day 1" if n <= 3 else "Day 2") for n in range(1, 6)]
+
+def titles(path):
+    """Return the first text line of every slide"""
+    with open_package(path) as zf:
+        return [slide_text(zf, part)[0][0] for part in slide_part_names(zf)]
+
+def assert_valid(path):
+    """Fail on any package problem deck_validate finds"""
+    problems, _, _ = validate_package(path, schema_dir="")
+    assert problems == []
+
+def test_insert_slide(make_deck):
+    deck = make_deck(SLIDES)
+    patcher = DeckPatcher(deck)
+    patcher.insert_slide(2, "content", title="Inserted", content_list=["New"])
+    patcher.save()
+    assert titles(deck) == ["Topic 1", "Inserted", "Topic 2", "Topic 3", "Topic 4", "Topic 5"]
+    assert_valid(deck)
+
+def test_insert_at_the_end_and_delete(make_deck):
+    deck = make_deck(SLIDES)
+    patch_deck(deck, [{"op": "insert", "index": 6, "kind": "code", "args": {"title": "Last", "code_snippet": "<?php"}},
+                      {"op": "delete", "index": 1},
+                      {"op": "delete", "index": 3}])
+    assert titles(deck) == ["Topic 2", "Topic 3", "Topic 5", "Last"]
+    assert_valid(deck)
+    with zipfile.ZipFile(deck) as zf:
+        assert b"<Slides>4</Slides>" in zf.read("docProps/app.xml")
+
+def test_delete_drops_slide_notes_and_empty_sections(make_deck, tmp_path):
+    deck = make_deck(SLIDES)
+    with zipfile.ZipFile(deck) as zf:
+        assert 'name="Day 1"' in zf.read("ppt/presentation.xml").decode("utf-8")
+    out = str(tmp_path / "patched.pptx")
+    patcher = DeckPatcher(deck)
+    patcher.delete_slides([1, 2, 3])
+    patcher.save(out)
+    assert titles(out) == ["Topic 4", "Topic 5"]
+    with zipfile.ZipFile(out) as zf:
+        presentation = zf.read("ppt/presentation.xml").decode("utf-8")
+        slides = [name for name in zf.namelist() if name.startswith("ppt/slides/slide")]
+    assert 'name="Day 1"' not in presentation and 'name="Day 2"' in presentation
+    assert len(slides) == 2
+    assert titles(deck) == [f"Topic {n}" for n in range(1, 6)]     # the source deck is untouched
+    assert_valid(out)
+
+def test_replace_keeps_the_slide_position(make_deck):
+    deck = make_deck(SLIDES)
+    patch_deck(deck, [{"op": "replace", "index": 3, "kind": "content",
+                       "args": {"title": "Replaced", "content_list": ["Fixed"]}}])
+    assert titles(deck)[2] == "Replaced"
+    assert_valid(deck)
+
+def test_out_of_range_indexes(make_deck):
+    patcher = DeckPatcher(make_deck(SLIDES))
+    with pytest.raises(IndexError):
+        patcher.delete_slide(6)
+    with pytest.raises(IndexError):
+        patcher.insert_slide(7, "content", title="x", content_list=[])
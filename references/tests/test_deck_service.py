@@ -0,0 +1,47 @@
+"""Deck service: what inline specs may read, and the service token"""
+
+import asyncio
+import json
+
+import pytest
+from conftest import content
+
+from deck_service import DeckService, RequestError
+
+@pytest.fixture
+def service():
+    service = DeckService(workers=1, queue_size=1, token="")
+    yield service
+    service.pool.shutdown(wait=False)
+
+def inline(*slides):
+    """Return a job request body for an inline spec"""
+    return json.dumps({"spec_data": {"version": 1, "deck": "inline", "style": "tot", "slides": list(slides)}})
+
+def test_inline_spec_is_accepted(service):
+    _, _, _, deck, _, _ = service.parse_request(inline(content("Queues", "Jobs")))
+    assert deck == "inline"
+
+def test_inline_notes_cannot_read_host_files(service, tmp_path):
+    secret = tmp_path / "notes.md"
+    secret.write_text("# Secrets\n\nDB_PASSWORD=hunter2\n", encoding="utf-8")
+    for ref in (f"{secret}#secrets", "../../../../../../../etc/passwd#root"):
+        with pytest.raises(RequestError, match="speaker notes or raw slides"):
+            service.parse_request(inline(dict(content("Queues", "Jobs"), notes=ref)))
+
+def test_inline_raw_slides_cannot_read_host_files(service):
+    raw = {"kind": "raw", "xml": "<p:sld/>", "rels": {"rId2": {"type": "image", "target": "/etc/passwd"}}}
+    with pytest.raises(RequestError, match=r"slide 2\)"):
+        service.parse_request(inline(content("Queues", "Jobs"), raw))
+
+def test_token_is_required_when_set(service):
+    service.token = "s3cret"
+    body = inline(content("Queues", "Jobs")).encode("utf-8")
+    response = asyncio.run(service.respond("POST", "/jobs", {}, body))
+    assert response.startswith(b"HTTP/1.1 401")
+    response = asyncio.run(service.respond("GET", "/jobs", {"authorization": "Bearer s3cret"}))
+    assert response.startswith(b"HTTP/1.1 200")
+
+def test_no_public_address_without_token(service):
+    with pytest.raises(ValueError, match="EPS_DECK_SERVICE_TOKEN"):
+        asyncio.run(service.serve("0.0.0.0", 0))
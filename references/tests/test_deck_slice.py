@@ -0,0 +1,55 @@
+"""Audience slices: subset decks cut out of one full build"""
+
+import os
+
+import pytest
+from conftest import content
+
+from deck_package import open_package, slide_part_names, slide_text
+from deck_slice import slice_spec_deck
+from deck_spec import SpecError, compile_spec
+
+SLIDES = [
+    dict(content("Welcome", "Two days"), section="Intro", tags=["common"]),
+    dict(content("Routing", "Routes"), section="Day 1"),
+    dict(content("Lab: routes", "Exercise"), section="Day 1", tags=["lab"]),
+    dict(content("Queues", "Jobs"), section="Day 2"),
+    dict(content("Lab: queues", "Exercise"), section="Day 2", tags=["lab"]),
+    dict(content("Caching", "Redis"), section="Day 2"),
+    dict(content("Wrap-up", "Questions"), section="Close", tags=["common"]),
+]
+SLICES = {"day1": ["common", "Day 1"], "day2": ["common", "Day 2"], "labs": ["lab"]}
+
+def slide_titles(path):
+    """Return the first text line of every slide"""
+    with open_package(path) as zf:
+        return [slide_text(zf, part)[0][0] for part in slide_part_names(zf)]
+
+@pytest.fixture
+def spec(tmp_path):
+    return compile_spec({"version": 1, "deck": "course", "style": "tot", "slices": SLICES, "slides": SLIDES},
+                        str(tmp_path / "course.yaml"))
+
+def test_select_counts(spec):
+    assert {name: len(spec.select(name)) for name in SLICES} == {"day1": 4, "day2": 5, "labs": 2}
+    assert spec.select("labs") == [3, 5]
+
+def test_sliced_decks_have_the_selected_slides(spec, make_deck, tmp_path):
+    full = make_deck(SLIDES, "course", slices=SLICES)
+    results = slice_spec_deck(spec, full, list(SLICES), str(tmp_path / "out"))
+    assert [(name, count) for name, _, count in results] == [("day1", 4), ("day2", 5), ("labs", 2)]
+    paths = {name: path for name, path, _ in results}
+    assert slide_titles(paths["day1"]) == ["Welcome", "Routing", "Lab: routes", "Wrap-up"]
+    assert slide_titles(paths["labs"]) == ["Lab: routes", "Lab: queues"]
+    assert all(os.path.basename(path) == f"course_{name}.pptx" for name, path in paths.items())
+    assert len(slide_titles(full)) == len(SLIDES)
+
+def test_deck_must_match_the_spec(spec, make_deck, tmp_path):
+    other = make_deck(SLIDES[:-1], "other")
+    with pytest.raises(ValueError, match="has 6 slides"):
+        slice_spec_deck(spec, other, ["day1"], str(tmp_path / "out"))
+
+def test_unknown_slice_selector(tmp_path):
+    with pytest.raises(SpecError, match="neither a tag nor a section"):
+        compile_spec({"version": 1, "deck": "course", "slices": {"x": ["nope"]}, "slides": SLIDES},
+                     str(tmp_path / "course.yaml"))
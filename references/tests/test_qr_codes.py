@@ -0,0 +1,44 @@
+"""QR codes: rendered images decode back to their payload"""
+
+import io
+
+import numpy as np
+import pytest
+
+from qr_codes import QUIET_ZONE, qr_matrix, qr_rectangles, render_png
+
+cv2 = pytest.importorskip("cv2")
+
+def decode(png):
+    """Return the payload OpenCV reads from PNG bytes"""
+    from PIL import Image
+
+    pixels = np.array(Image.open(io.BytesIO(png)).convert("L"))
+    text, _, _ = cv2.QRCodeDetector().detectAndDecode(pixels)
+    return text
+
+@pytest.mark.parametrize("ec", ["L", "M", "Q", "H"])
+def test_png_roundtrip_each_level(ec):
+    assert decode(render_png("https://bit.ly/eps-tot-be", 256, ec)) == "https://bit.ly/eps-tot-be"
+
+@pytest.mark.parametrize("payload", ["A", "https://github.com/zahirhamzah94/eps-tot-be" * 3, "Latihan EPS — ms"])
+def test_png_roundtrip_payload_sizes(payload):
+    assert decode(render_png(payload, 400)) == payload
+
+def test_png_size_is_at_least_one_pixel_per_module():
+    from PIL import Image
+
+    modules = qr_matrix("https://bit.ly/eps-tot-be").shape[0] + 2 * QUIET_ZONE
+    assert Image.open(io.BytesIO(render_png("https://bit.ly/eps-tot-be", 512))).size == (512, 512)
+    assert Image.open(io.BytesIO(render_png("https://bit.ly/eps-tot-be", 10))).size == (modules, modules)
+
+def test_rectangles_cover_exactly_the_dark_modules():
+    matrix = qr_matrix("https://bit.ly/eps-tot-be")
+    painted = np.zeros(matrix.shape, dtype=int)
+    for row, col, height, width in qr_rectangles("https://bit.ly/eps-tot-be"):
+        painted[row:row + height, col:col + width] += 1
+    assert (painted == matrix).all()
+
+def test_unknown_error_correction_level():
+    with pytest.raises(ValueError):
+        qr_matrix("x", "Z")